@@ -0,0 +1 @@
+"""Offline benchmarks (no OpenAI, Presto or Slack access required)."""
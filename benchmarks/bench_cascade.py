@@ -0,0 +1,92 @@
+"""
+Compare classification with the large model only against the small -> large model cascade.
+
+The fake small model is faster and answers "Other" with low confidence, so
+those items escalate; --small-error-rate makes it confidently wrong on a
+share of items, which shows up in the sampled tier agreement.
+
+Usage:
+    python -m benchmarks.bench_cascade --items 1000 --large-latency 0.2 --small-latency 0.05
+"""
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from src.agents import create_classifier_agent
+from src.config.settings import settings
+from src.models import FEEDBACK_CATEGORIES
+from src.nodes import classify
+from src.utils import llm_run_metrics
+from benchmarks.fake_llm import FakeChatModel, default_respond
+from benchmarks.synthetic import generate_feedback_items
+
+
+def small_respond(error_rate: float, seed: int = 7):
+    """Fake small-model answers that are wrong, but confident, for `error_rate` of the items."""
+    rng = random.Random(seed)
+
+    def mistake(classification: dict) -> dict:
+        if rng.random() < error_rate:
+            wrong = [category for category in FEEDBACK_CATEGORIES if category != classification["category"]]
+            classification["category"] = rng.choice(wrong)
+        return classification
+
+    def respond(tool_name: str, text: str) -> dict:
+        args = default_respond(tool_name, text)
+        if "classifications" in args:
+            args["classifications"] = [mistake(entry) for entry in args["classifications"]]
+            return args
+        return mistake(args)
+
+    return respond
+
+
+def run(args, cascade: bool):
+    """Classify once, returning (seconds, stats, LLM metrics summary)."""
+    large = FakeChatModel(latency=args.large_latency)
+    small = FakeChatModel(latency=args.small_latency, respond=small_respond(args.small_error_rate))
+    # The fake model has no rate limits, keep the scheduler out of the measurement
+    settings.LLM_RATE_LIMIT_ENABLED = False
+    classify.agent_classifier.set(create_classifier_agent(model=large))
+    classify.batch_classifier.set(create_classifier_agent(model=large, batch=True))
+    classify.small_classifier.set(create_classifier_agent(model=small, tier="small"))
+    classify.small_batch_classifier.set(create_classifier_agent(model=small, batch=True, tier="small"))
+    classify.local_classifier.set(None)
+    settings.CASCADE_ENABLED = cascade
+    settings.CLASSIFICATION_CACHE_ENABLED = False
+    settings.CLASSIFICATION_CONCURRENCY = args.concurrency
+    settings.CLASSIFICATION_BATCH_SIZE = args.batch_size
+
+    items = generate_feedback_items(args.items, unique_share=1.0)
+    llm_run_metrics.reset()
+    start = time.perf_counter()
+    stats = classify.classify_items(items)
+    elapsed = time.perf_counter() - start
+    return elapsed, stats, llm_run_metrics.summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--large-latency", type=float, default=0.2, help="Seconds per fake large-model call")
+    parser.add_argument("--small-latency", type=float, default=0.05, help="Seconds per fake small-model call")
+    parser.add_argument("--small-error-rate", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"\n{'mode':>8} {'seconds':>8} {'items/s':>8} {'on small':>9} {'escalated':>10} "
+          f"{'agreement':>10} {'cost $':>8}")
+    for name, cascade in [("large", False), ("cascade", True)]:
+        elapsed, stats, metrics = run(args, cascade)
+        escalated = stats["escalated_low_confidence"] + stats["escalated_failed"]
+        agreement = f"{stats['agreed'] / stats['sampled']:.0%}" if stats["sampled"] else "-"
+        print(f"{name:>8} {elapsed:>8.2f} {args.items / elapsed:>8.0f} {stats['small_final']:>9} "
+              f"{escalated:>10} {agreement:>10} {metrics['total']['cost_usd']:>8.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark the classification node with a fake chat model.
+
+Usage:
+    python -m benchmarks.bench_classify --items 200 --latency 0.05 --concurrency 1 8 16
+    python -m benchmarks.bench_classify --items 200 --concurrency 8 --batch-size 1 10 --drop-rate 0.05
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from src.agents import create_classifier_agent
+from src.config.settings import settings
+from src.nodes import classify
+from benchmarks.fake_llm import FakeChatModel
+from benchmarks.synthetic import generate_feedback_items
+
+
+def run(items: int, latency: float, concurrency: int, batch_size: int,
+        failure_rate: float, drop_rate: float) -> float:
+    """Run classify_comments once and return the wall-clock seconds."""
+    model = FakeChatModel(latency=latency, failure_rate=failure_rate, drop_rate=drop_rate)
+    # The fake model has no rate limits, keep the scheduler out of the measurement
+    settings.LLM_RATE_LIMIT_ENABLED = False
+    classify.agent_classifier.set(create_classifier_agent(model=model))
+    classify.batch_classifier.set(create_classifier_agent(model=model, batch=True))
+    classify.local_classifier.set(None)
+    settings.CLASSIFICATION_LIMIT = None
+    settings.CLASSIFICATION_CONCURRENCY = concurrency
+    settings.CLASSIFICATION_BATCH_SIZE = batch_size
+    settings.CLASSIFICATION_CACHE_ENABLED = False
+
+    state = {"feedback_items": generate_feedback_items(items), "node_calls": 0}
+    start = time.perf_counter()
+    classify.classify_comments(state)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds per fake LLM call")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Fraction of batch entries dropped")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 16])
+    parser.add_argument("--batch-size", type=int, nargs="+", default=[1])
+    args = parser.parse_args()
+
+    results = []
+    for batch_size in args.batch_size:
+        for concurrency in args.concurrency:
+            elapsed = run(args.items, args.latency, concurrency, batch_size,
+                          args.failure_rate, args.drop_rate)
+            results.append((batch_size, concurrency, elapsed))
+
+    baseline = results[0][2]
+    print(f"\n{'batch':>6} {'concurrency':>12} {'seconds':>10} {'items/s':>10} {'speedup':>8}")
+    for batch_size, concurrency, elapsed in results:
+        print(f"{batch_size:>6} {concurrency:>12} {elapsed:>10.2f} "
+              f"{args.items / elapsed:>10.1f} {baseline / elapsed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
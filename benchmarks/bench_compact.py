@@ -0,0 +1,93 @@
+"""
+Compare full classifications (category + rationale) with label-only compact mode.
+
+The fake model sleeps per output token, so shorter answers finish sooner as
+they would with a real model. In compact mode the report step writes the
+rationales of its candidates afterwards; both steps are timed.
+
+Usage:
+    python -m benchmarks.bench_compact --items 1000 --latency 0.05 --output-token-latency 0.01
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from src.agents import create_classifier_agent, create_rationale_agent, create_reporter_agent
+from src.config.settings import settings
+from src.nodes import classify, report
+from src.utils import llm_run_metrics
+from benchmarks.fake_llm import FakeChatModel, default_respond
+from benchmarks.synthetic import generate_feedback_items
+
+
+# A rationale of one or two sentences, about as long as the real classifier writes
+RATIONALE = (
+    "The user reports that the call to action of this Insight does not work as expected, "
+    "which is a malfunction of the card itself rather than of the product feature it describes."
+)
+
+
+def verbose_respond(tool_name: str, text: str) -> dict:
+    """Fake answers with rationales of realistic length."""
+    args = default_respond(tool_name, text)
+    for entry in args.get("classifications", [args]):
+        if "rationale" in entry:
+            entry["rationale"] = RATIONALE
+    return args
+
+
+def run(args, compact: bool):
+    """Classify and report once, returning (classify seconds, report seconds, LLM metrics summary)."""
+    model = FakeChatModel(
+        latency=args.latency, output_token_latency=args.output_token_latency, respond=verbose_respond
+    )
+    # The fake model has no rate limits, keep the scheduler out of the measurement
+    settings.LLM_RATE_LIMIT_ENABLED = False
+    classify.agent_classifier.set(create_classifier_agent(model=model, compact=compact))
+    classify.batch_classifier.set(create_classifier_agent(model=model, batch=True, compact=compact))
+    classify.local_classifier.set(None)
+    report.reporter_agent.set(create_reporter_agent(model=FakeChatModel(latency=args.latency)))
+    report.report_summarizer.set(create_reporter_agent(model=FakeChatModel(latency=args.latency), chunk=True))
+    report.rationale_writer.set(create_rationale_agent(model=model))
+    settings.CLASSIFIER_COMPACT = compact
+    settings.CLASSIFICATION_CACHE_ENABLED = False
+    settings.CASCADE_ENABLED = False
+    settings.CLASSIFICATION_CONCURRENCY = args.concurrency
+    settings.CLASSIFICATION_BATCH_SIZE = args.batch_size
+
+    items = generate_feedback_items(args.items, unique_share=1.0)
+    llm_run_metrics.reset()
+    start = time.perf_counter()
+    classify.classify_items(items)
+    classified = time.perf_counter()
+    report.create_report({"classified_results": items, "current_date": "2025-09-01"})
+    return classified - start, time.perf_counter() - classified, llm_run_metrics.summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds per fake LLM call")
+    parser.add_argument("--output-token-latency", type=float, default=0.01, help="Seconds per output token")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"\n{'mode':>8} {'classify s':>11} {'report s':>9} {'output tokens':>14} "
+          f"{'rationales':>11} {'cost $':>8}")
+    for name, compact in [("full", False), ("compact", True)]:
+        classify_seconds, report_seconds, metrics = run(args, compact)
+        classifier_tokens = sum(
+            stats["completion_tokens"] for agent, stats in metrics["agents"].items() if agent.startswith("classifier")
+        )
+        rationale = metrics["agents"].get("rationale", {})
+        rationales = f"{rationale.get('requests', 0)} req" if compact else "inline"
+        print(f"{name:>8} {classify_seconds:>11.2f} {report_seconds:>9.2f} "
+              f"{classifier_tokens + rationale.get('completion_tokens', 0):>14,} "
+              f"{rationales:>11} {metrics['total']['cost_usd']:>8.4f}")
+
+
+if __name__ == "__main__":
+    main()
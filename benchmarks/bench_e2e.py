@@ -0,0 +1,247 @@
+"""
+End-to-end throughput of the feedback workflow, fully offline.
+
+Runs create_feedback_workflow against a SQLite stand-in for Presto, the fake
+chat model and a stub Slack client, one fresh process per size so peak RSS is
+measured per run. Reports items/sec, per-item classification latency, peak
+RSS and per-node wall time, and writes a JSON result file that a later run can
+be compared against to catch regressions.
+
+Usage:
+    python -m benchmarks.bench_e2e --items 1000 10000 100000 --latency 0.05 --json e2e.json
+    python -m benchmarks.bench_e2e --items 1000 10000 --compare e2e.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.fake_llm import FakeChatModel
+
+
+CLASSIFICATION_TOOLS = (
+    "FeedbackCategory", "FeedbackCategoryBatch", "ScoredFeedbackCategory", "ScoredFeedbackCategoryBatch",
+    "FeedbackLabel", "FeedbackLabelBatch", "ScoredFeedbackLabel", "ScoredFeedbackLabelBatch",
+)
+
+# (seconds, items) per classification request of the current run
+CLASSIFICATION_REQUESTS = []
+
+
+class TimedFakeChatModel(FakeChatModel):
+    """Fake chat model that also records the latency and item count of classification requests."""
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        start = time.perf_counter()
+        result = super()._generate(messages, stop, run_manager, **kwargs)
+        if self.tool_names and self.tool_names[0] in CLASSIFICATION_TOOLS:
+            args = result.generations[0].message.tool_calls[0]["args"]
+            items = len(args.get("classifications", [None]))
+            CLASSIFICATION_REQUESTS.append((time.perf_counter() - start, items))
+        return result
+
+
+class StubWebClient:
+    """Stand-in for slack_sdk.WebClient that keeps posted messages in memory."""
+
+    messages = []
+    _lock = threading.Lock()
+
+    def __init__(self, token: str = ""):
+        self.token = token
+
+    def chat_postMessage(self, channel: str, text: str):
+        with self._lock:
+            self.messages.append((channel, text))
+        return {"ok": True, "ts": f"{time.time():.6f}"}
+
+
+def item_latencies(requests) -> dict:
+    """p50/p95 latency in milliseconds of each LLM-classified item, from the request that carried it."""
+    if not requests:
+        return {"p50_ms": 0.0, "p95_ms": 0.0}
+    seconds = np.repeat([latency for latency, _ in requests], [items for _, items in requests])
+    p50, p95 = np.percentile(seconds, [50, 95]) * 1000
+    return {"p50_ms": float(p50), "p95_ms": float(p95)}
+
+
+def run_size(items: int, args: argparse.Namespace) -> dict:
+    """Run the workflow once over `items` synthetic rows; executed in a fresh process."""
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+    from src.agents import create_classifier_agent, create_reporter_agent
+    from src.config.settings import settings
+    from src.main import invoke_workflow
+    from src.nodes import classify, load_data_hive, report
+    from src.utils import (
+        format_slack_message,
+        llm_run_metrics,
+        node_timings,
+        open_checkpointer,
+        send_slack_message,
+    )
+    from src.utils import slack_client
+    from src.utils.node_timing import peak_rss_mb
+    from src.workflows import create_feedback_workflow
+    from benchmarks.synthetic import create_sqlite_warehouse
+
+    output_dir = Path(tempfile.mkdtemp(prefix="bench_e2e_"))
+    settings.OUTPUT_DIR = output_dir
+    settings.CLASSIFICATION_CACHE_PATH = output_dir / "classification_cache.sqlite"
+    settings.HIVE_QUERY_CACHE_DIR = output_dir / "query_cache"
+    settings.FEEDBACK_STORE_PATH = output_dir / "feedback_store.sqlite"
+    settings.CHECKPOINT_PATH = output_dir / "checkpoints.sqlite"
+    settings.PROFILE_DIR = output_dir / "profiles"
+    settings.HIVE_TABLE = "halley_feedback_qualtrics_comments"
+    settings.HIVE_ROW_LIMIT = None
+    settings.CLASSIFICATION_LIMIT = None
+    settings.HIVE_STREAMING = args.streaming
+    settings.CLASSIFICATION_CONCURRENCY = args.concurrency
+    settings.CLASSIFICATION_BATCH_SIZE = args.batch_size
+    settings.CLASSIFICATION_SHARDS = args.shards
+    settings.CHECKPOINT_ENABLED = not args.no_checkpoint
+    settings.SEND_TO_SLACK = True
+    # The fake model has no rate limits, keep the scheduler out of the measurement
+    settings.LLM_RATE_LIMIT_ENABLED = False
+
+    load_data_hive._engine = create_sqlite_warehouse(
+        str(output_dir / "warehouse.sqlite"), items, unique_share=args.unique_share
+    )
+    model = TimedFakeChatModel(latency=args.latency, failure_rate=args.failure_rate)
+    classify.agent_classifier.set(create_classifier_agent(model=model))
+    classify.batch_classifier.set(create_classifier_agent(model=model, batch=True))
+    report.reporter_agent.set(create_reporter_agent(model=model))
+    report.report_summarizer.set(create_reporter_agent(model=model, chunk=True))
+    slack_client.WebClient = StubWebClient
+
+    checkpointer = open_checkpointer() if settings.CHECKPOINT_ENABLED else None
+    workflow = create_feedback_workflow(checkpointer)
+    initial_state = {
+        "run_id": f"bench-{items}",
+        "current_date": "2025-10-01",
+        "analysis_month": "2025-09",
+        "feedback_items": [],
+        "classified_results": [],
+        "classified_shards": [],
+        "exported_files": [],
+        "insight_stats": {},
+        "final_report": "",
+        "node_calls": 0,
+    }
+
+    llm_run_metrics.reset()
+    node_timings.reset()
+    log = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with log:
+        start = time.perf_counter()
+        result = invoke_workflow(workflow, initial_state, checkpointer)
+        send_slack_message(format_slack_message(result["final_report"]))
+        seconds = time.perf_counter() - start
+
+    nodes = {}
+    for timing in node_timings.timings:
+        nodes[timing.node] = nodes.get(timing.node, 0.0) + timing.wall_seconds
+    llm = llm_run_metrics.summary()["total"]
+    return {
+        "items": items,
+        "classified": len(result["classified_results"]),
+        "seconds": seconds,
+        "items_per_sec": items / seconds,
+        **item_latencies(CLASSIFICATION_REQUESTS),
+        "peak_rss_mb": peak_rss_mb(),
+        "llm_requests": llm["requests"],
+        "llm_errors": llm["errors"],
+        "slack_messages": len(StubWebClient.messages),
+        "nodes": nodes,
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def compare(results, baseline_path: Path, tolerance: float) -> bool:
+    """Print throughput and peak RSS changes against a previous result file, returning True on a regression."""
+    baseline = {entry["items"]: entry for entry in json.loads(baseline_path.read_text())["results"]}
+    regressed = False
+    print(f"\n📏 Compared with {baseline_path} (tolerance {tolerance:.0%})")
+    for entry in results:
+        previous = baseline.get(entry["items"])
+        if previous is None:
+            continue
+        throughput = entry["items_per_sec"] / previous["items_per_sec"] - 1
+        rss = entry["peak_rss_mb"] / previous["peak_rss_mb"] - 1 if previous["peak_rss_mb"] else 0.0
+        slower = throughput < -tolerance or rss > tolerance
+        regressed |= slower
+        status = "❌ regression" if slower else "✅"
+        print(f"   {entry['items']:>7} items: items/sec {throughput:+.1%}, peak RSS {rss:+.1%} {status}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds per fake LLM call")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of fake LLM calls that time out")
+    parser.add_argument("--unique-share", type=float, default=0.5,
+                        help="Share of comments made unique, so they reach the classifier")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=10)
+    parser.add_argument("--shards", type=int, default=1, help="Parallel classify branches")
+    parser.add_argument("--streaming", action="store_true", help="Load and classify chunk by chunk")
+    parser.add_argument("--no-checkpoint", action="store_true", help="Run without the SQLite checkpointer")
+    parser.add_argument("--verbose", action="store_true", help="Show the workflow output")
+    parser.add_argument("--json", type=Path, help="Write the results to this JSON file")
+    parser.add_argument("--compare", type=Path, help="Previous JSON result file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Allowed slowdown before flagging a regression")
+    args = parser.parse_args()
+
+    results = []
+    # A fresh process per size, so imports, caches and peak RSS do not carry over
+    context = multiprocessing.get_context("spawn")
+    for items in args.items:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            results.append(executor.submit(run_size, items, args).result())
+
+    print(f"\n{'items':>7} {'seconds':>8} {'items/sec':>10} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'peak MB':>8} {'requests':>9}")
+    for entry in results:
+        print(f"{entry['items']:>7} {entry['seconds']:>8.2f} {entry['items_per_sec']:>10,.0f} "
+              f"{entry['p50_ms']:>8.1f} {entry['p95_ms']:>8.1f} {entry['peak_rss_mb']:>8.1f} "
+              f"{entry['llm_requests']:>9}")
+    for entry in results:
+        nodes = ", ".join(f"{node} {seconds:.2f}s" for node, seconds in entry["nodes"].items())
+        print(f"   {entry['items']:>7}: {nodes}")
+
+    if args.json:
+        args.json.write_text(json.dumps({
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "config": {key: str(value) if isinstance(value, Path) else value for key, value in vars(args).items()},
+            "results": results,
+        }, indent=2))
+        print(f"\n📄 Results written to {args.json}")
+
+    if args.compare and compare(results, args.compare, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
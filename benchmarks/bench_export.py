@@ -0,0 +1,88 @@
+"""
+Measure export throughput and peak memory per format, against the previous DataFrame + to_excel path.
+
+Usage:
+    python -m benchmarks.bench_export --rows 10000 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+import pandas as pd
+
+from src.models import FeedbackRecord
+from src.nodes.export import EXPORT_COLUMNS
+from src.utils.export_writers import EXPORT_WRITERS, export_rows
+from benchmarks.fake_llm import keyword_category
+from benchmarks.synthetic import generate_feedback_items
+
+
+def classified_records(rows: int):
+    """Classified FeedbackRecord rows as they reach the export node."""
+    template = generate_feedback_items(min(rows, 10000))
+    records = []
+    for i in range(rows):
+        item = template[i % len(template)]
+        records.append(FeedbackRecord(
+            user_id=f"USER{i:07d}",
+            feedback=item.feedback,
+            insight_sub_type=item.insight_sub_type,
+            insight_type=item.insight_type,
+            product_line_name=item.product_line_name,
+            dt="20250915",
+            category=keyword_category(item.feedback),
+            rationale="Synthetic rationale for the benchmark export.",
+        ))
+    return records
+
+
+def export_dataframe(records, stem: Path):
+    """Previous export path: build the whole DataFrame, then df.to_excel."""
+    df = pd.DataFrame({
+        header: [getattr(item, attribute) for item in records]
+        for header, attribute in EXPORT_COLUMNS.items()
+    })
+    df.to_excel(stem.with_suffix(".xlsx"), index=False)
+
+
+def export_streaming(records, stem: Path, fmt: str):
+    attributes = list(EXPORT_COLUMNS.values())
+    rows = (tuple(getattr(item, attribute) for attribute in attributes) for item in records)
+    export_rows(stem, [fmt], list(EXPORT_COLUMNS), rows)
+
+
+def measure(export, *args):
+    """Run one export, returning (seconds, peak MB allocated)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    export(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    print(f"\n{'rows':>9} {'format':>16} {'seconds':>9} {'rows/sec':>10} {'peak MB':>9}")
+    for rows in args.rows:
+        records = classified_records(rows)
+        with tempfile.TemporaryDirectory() as directory:
+            stem = Path(directory) / "classified_feedback"
+            runs = [("xlsx (pandas)", export_dataframe, (records, stem))]
+            runs += [(fmt, export_streaming, (records, stem, fmt)) for fmt in EXPORT_WRITERS]
+            for name, export, export_args in runs:
+                elapsed, megabytes = measure(export, *export_args)
+                print(f"{rows:>9} {name:>16} {elapsed:>9.2f} {rows / elapsed:>10,.0f} {megabytes:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Compare memory and build time of Pydantic FeedbackItem lists vs compact FeedbackBatch records.
+
+Usage:
+    python -m benchmarks.bench_feedback_models --rows 10000 100000 1000000
+"""
+import argparse
+import gc
+import os
+import time
+import tracemalloc
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+import pandas as pd
+
+from src.config.settings import settings
+from src.nodes.load_data_hive import to_feedback_items
+from benchmarks.synthetic import generate_feedback_items
+
+
+def synthetic_query_result(rows: int) -> pd.DataFrame:
+    """DataFrame shaped like the Hive query result."""
+    template = generate_feedback_items(min(rows, 10000))
+    repeats = -(-rows // len(template))
+    items = (template * repeats)[:rows]
+    return pd.DataFrame({
+        "dt": ["20250915"] * rows,
+        "user_id": [f"USER{i:07d}" for i in range(rows)],
+        "translated_comment": [item.feedback for item in items],
+        "insight": [item.insight_type for item in items],
+        "insight_sub_type": [item.insight_sub_type for item in items],
+        "product_line_name": [item.product_line_name for item in items],
+    })
+
+
+def measure(df: pd.DataFrame, compact: bool):
+    """Build the feedback rows once, returning (seconds, MB retained)."""
+    settings.COMPACT_FEEDBACK_RECORDS = compact
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    items = to_feedback_items(df)
+    elapsed = time.perf_counter() - start
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return elapsed, retained / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+
+    print(f"\n{'rows':>9} {'model':>10} {'seconds':>9} {'MB':>9}")
+    for rows in args.rows:
+        df = synthetic_query_result(rows)
+        for name, compact in [("pydantic", False), ("compact", True)]:
+            elapsed, megabytes = measure(df, compact)
+            print(f"{rows:>9} {name:>10} {elapsed:>9.2f} {megabytes:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
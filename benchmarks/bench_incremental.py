@@ -0,0 +1,121 @@
+"""
+Check that incremental loading drains a month whose rows share one dt partition.
+
+All rows are written to a single `dt`, with more rows than HIVE_ROW_LIMIT,
+and incremental runs are repeated until the feedback store holds every row.
+Classification is replaced by a fixed category, so only the load, skip and
+watermark logic is measured. Exits non-zero if the runs stop making progress.
+
+Usage:
+    python -m benchmarks.bench_incremental --rows 1200 --row-limit 500
+    python -m benchmarks.bench_incremental --rows 1200 --row-limit 500 --streaming
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+import pandas as pd
+from sqlalchemy import create_engine
+
+from src.config.settings import settings
+from src.models import FEEDBACK_CATEGORIES
+from src.nodes import load_data_hive
+from src.nodes.load_data_hive import load_data_from_hive
+from src.nodes.merge_store import merge_with_feedback_store
+from src.utils.feedback_store import open_feedback_store
+from benchmarks.synthetic import generate_feedback_items
+
+
+STATE = {"analysis_month": "2025-09"}
+DT = "20250915"
+
+
+def create_single_dt_warehouse(path: str, count: int):
+    """SQLite stand-in for the feedback table with every row in the DT partition."""
+    rows = [
+        {
+            "dt": DT,
+            "user_id": item.user_id,
+            "translated_comment": item.feedback,
+            "insight": item.insight_type,
+            "insight_sub_type": item.insight_sub_type,
+            "product_line_name": item.product_line_name,
+            "delivery_channel": "email",
+            "sentiment": "Negative",
+        }
+        for item in generate_feedback_items(count, unique_share=1.0)
+    ]
+    engine = create_engine(f"sqlite:///{path}")
+    pd.DataFrame(rows).to_sql("halley_feedback_qualtrics_comments", engine, if_exists="replace", index=False)
+    return engine
+
+
+def fake_classify(feedback_list):
+    for feedback in feedback_list:
+        feedback.category = FEEDBACK_CATEGORIES[0]
+        feedback.rationale = "benchmark"
+
+
+def run_once(streaming: bool) -> int:
+    """One incremental run: load new rows, classify them and merge with the store."""
+    if streaming:
+        # Same loader path as load_and_classify_from_hive, with the fake classification
+        params, known_rows = load_data_hive.get_query_params(STATE)
+        chunks = load_data_hive.limit_new_rows(
+            load_data_hive.stream_feedback_items(
+                load_data_hive.get_presto_engine(), load_data_hive.build_comments_query(),
+                settings.HIVE_CHUNK_SIZE, params,
+            ),
+            known_rows,
+        )
+        feedback_list = [feedback for chunk in chunks for feedback in chunk]
+    else:
+        feedback_list = load_data_from_hive(STATE)["feedback_items"]
+
+    fake_classify(feedback_list)
+    merge_with_feedback_store({**STATE, "feedback_items": feedback_list, "classified_results": feedback_list})
+    return len(feedback_list)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1200)
+    parser.add_argument("--row-limit", type=int, default=500)
+    parser.add_argument("--chunk-size", type=int, default=200)
+    parser.add_argument("--streaming", action="store_true", help="Load through the chunked loader")
+    args = parser.parse_args()
+
+    output_dir = Path(tempfile.mkdtemp(prefix="bench_incremental_"))
+    settings.FEEDBACK_STORE_PATH = output_dir / "feedback_store.sqlite"
+    settings.HIVE_TABLE = "halley_feedback_qualtrics_comments"
+    settings.HIVE_INCREMENTAL = True
+    settings.HIVE_ROW_LIMIT = args.row_limit
+    settings.HIVE_CHUNK_SIZE = args.chunk_size
+    settings.DEDUP_ENABLED = False
+    load_data_hive._engine = create_single_dt_warehouse(str(output_dir / "warehouse.sqlite"), args.rows)
+
+    max_runs = -(-args.rows // args.row_limit) + 1
+    start = time.perf_counter()
+    for run in range(1, max_runs + 1):
+        loaded = run_once(args.streaming)
+        store = open_feedback_store()
+        stored = len(store.load(STATE["analysis_month"]))
+        store.close()
+        print(f"Run {run}: loaded {loaded} new rows, {stored}/{args.rows} stored")
+        if stored == args.rows or loaded == 0:
+            break
+
+    seconds = time.perf_counter() - start
+    if stored != args.rows:
+        print(f"❌ Incremental loading stalled at {stored}/{args.rows} rows after {run} runs")
+        sys.exit(1)
+    print(f"✅ {args.rows} rows in one dt loaded in {run} runs of at most {args.row_limit} ({seconds:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
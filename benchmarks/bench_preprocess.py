@@ -0,0 +1,64 @@
+"""
+Measure text preprocessing throughput per worker count and the prompt tokens it saves.
+
+Usage:
+    python -m benchmarks.bench_preprocess --items 200000 1000000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import random
+import time
+
+from src.config.settings import settings
+from src.utils.text_preprocessing import preprocess_texts
+from benchmarks.synthetic import generate_feedback_items
+
+
+NOISE = [
+    " Contact me at jane.doe{i}@example.com",
+    " See https://help.example.com/articles/{i}?utm_source=email&utm_medium=insight",
+    " Call me on 555-01{i:02d}-4567",
+    "   ​  extra   spacing \t\n",
+    "!!!!!!!!!!",
+]
+
+
+def noisy_comments(count: int, seed: int = 42):
+    """Synthetic comments where some carry emails, URLs, odd whitespace or are very long."""
+    rng = random.Random(seed)
+    comments = []
+    for i, item in enumerate(generate_feedback_items(min(count, 10000), seed)):
+        comments.append(item.feedback)
+    comments = [comments[i % len(comments)] for i in range(count)]
+    for i in range(count):
+        if rng.random() < 0.3:
+            comments[i] += rng.choice(NOISE).format(i=i % 100)
+        if rng.random() < 0.01:
+            comments[i] += " It keeps happening." * 200
+    return comments
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, nargs="+", default=[200000, 1000000])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    # Measure the pool at every size
+    settings.PREPROCESS_PARALLEL_MIN_ITEMS = 0
+
+    print(f"\n{'items':>9} {'workers':>8} {'seconds':>8} {'items/sec':>10} {'speedup':>8} {'tokens saved':>13}")
+    for count in args.items:
+        comments = noisy_comments(count)
+        baseline = None
+        for workers in sorted(set(args.workers)):
+            start = time.perf_counter()
+            _, counts = preprocess_texts(comments, workers=workers)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{count:>9} {workers:>8} {elapsed:>8.2f} {count / elapsed:>10,.0f} "
+                  f"{baseline / elapsed:>7.1f}x {counts['tokens_saved']:>13,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Classify against a fake model that answers 429s, with and without the shared LLM scheduler.
+
+The fake server accepts --server-concurrency requests at a time and rejects
+the rest, plus a random share of --rate-limit-rate; the classifier sends up
+to --concurrency requests at a time. Without the scheduler every 429 is a
+failed item, with it requests are retried and the adaptive limit settles
+near the server's capacity.
+
+Usage:
+    python -m benchmarks.bench_rate_limit --items 500 --concurrency 32 --server-concurrency 8
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from src.agents import create_classifier_agent
+from src.config.settings import settings
+from src.nodes import classify
+from src.utils import llm_scheduler
+from benchmarks.fake_llm import FakeChatModel
+from benchmarks.synthetic import generate_feedback_items
+
+
+def run(args, scheduled: bool):
+    """Classify once, returning (seconds, stats, fake 429s, scheduler summary)."""
+    settings.LLM_RATE_LIMIT_ENABLED = scheduled
+    settings.LLM_REQUESTS_PER_MINUTE = args.rpm
+    settings.LLM_TOKENS_PER_MINUTE = args.tpm
+    settings.LLM_MAX_CONCURRENCY = args.concurrency
+    settings.LLM_RETRY_BASE_SECONDS = args.retry_base
+    settings.CLASSIFICATION_CONCURRENCY = args.concurrency
+    settings.CLASSIFICATION_BATCH_SIZE = 1
+    settings.CLASSIFICATION_CACHE_ENABLED = False
+    settings.CASCADE_ENABLED = False
+
+    model = FakeChatModel(
+        latency=args.latency, max_concurrent=args.server_concurrency, rate_limit_rate=args.rate_limit_rate
+    )
+    classify.agent_classifier.set(create_classifier_agent(model=model))
+    classify.local_classifier.set(None)
+
+    items = generate_feedback_items(args.items, unique_share=1.0)
+    llm_scheduler.reset()
+    start = time.perf_counter()
+    stats = classify.classify_items(items)
+    return time.perf_counter() - start, stats, model.rate_limited, llm_scheduler.summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds per fake LLM call")
+    parser.add_argument("--concurrency", type=int, default=32, help="Classifier threads and max scheduler limit")
+    parser.add_argument("--server-concurrency", type=int, default=8, help="Requests the fake server accepts at once")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.02, help="Share of random 429s")
+    parser.add_argument("--rpm", type=int, default=100_000, help="LLM_REQUESTS_PER_MINUTE")
+    parser.add_argument("--tpm", type=int, default=100_000_000, help="LLM_TOKENS_PER_MINUTE")
+    parser.add_argument("--retry-base", type=float, default=0.05, help="LLM_RETRY_BASE_SECONDS")
+    args = parser.parse_args()
+
+    print(f"\n{'mode':>10} {'seconds':>8} {'failed':>7} {'429s':>6} {'retries':>8} "
+          f"{'limit':>6} {'throttled s':>12} {'dead letters':>13}")
+    for name, scheduled in [("direct", False), ("scheduled", True)]:
+        elapsed, stats, rate_limited, summary = run(args, scheduled)
+        limit = summary["concurrency_limit"] if scheduled else "-"
+        throttled = f"{summary['throttled_seconds']:.1f}" if scheduled else "-"
+        print(f"{name:>10} {elapsed:>8.2f} {stats['failed']:>7} {rate_limited:>6} {summary['retried']:>8} "
+              f"{limit:>6} {throttled:>12} {summary['dead_letters']:>13}")
+
+
+if __name__ == "__main__":
+    main()
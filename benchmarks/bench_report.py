@@ -0,0 +1,70 @@
+"""
+Benchmark report generation with a fake chat model: single prompt vs map-reduce.
+
+Reports wall time, reporter requests and estimated prompt tokens, to show
+that map-reduce keeps the largest prompt bounded as the month grows.
+
+Usage:
+    python -m benchmarks.bench_report --items 500 5000 20000 --latency 0.2
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from src.agents import create_reporter_agent
+from src.config.settings import settings
+from src.nodes import report
+from benchmarks.fake_llm import FakeChatModel, default_respond, keyword_category
+from benchmarks.synthetic import generate_feedback_items
+
+
+def classified_items(count: int):
+    items = generate_feedback_items(count)
+    for item in items:
+        item.category = keyword_category(item.feedback)
+        item.rationale = f"Matched keywords for {item.category}."
+    return items
+
+
+def run(items, latency: float, map_reduce: bool):
+    """Run create_report once, returning (seconds, requests, max prompt tokens, total prompt tokens)."""
+    prompt_tokens = []
+
+    def respond(tool_name: str, text: str) -> dict:
+        prompt_tokens.append(report.estimate_tokens(text))
+        return default_respond(tool_name, text)
+
+    model = FakeChatModel(latency=latency, respond=respond)
+    # The fake model has no rate limits, keep the scheduler out of the measurement
+    settings.LLM_RATE_LIMIT_ENABLED = False
+    report.reporter_agent.set(create_reporter_agent(model=model))
+    report.report_summarizer.set(create_reporter_agent(model=model, chunk=True))
+    settings.REPORT_MAP_REDUCE = map_reduce
+
+    start = time.perf_counter()
+    report.create_report({"classified_results": items, "node_calls": 0})
+    elapsed = time.perf_counter() - start
+    return elapsed, len(prompt_tokens), max(prompt_tokens), sum(prompt_tokens)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, nargs="+", default=[500, 5000, 20000])
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds per fake LLM call")
+    args = parser.parse_args()
+
+    results = []
+    for count in args.items:
+        items = classified_items(count)
+        for name, map_reduce in [("single", False), ("map-reduce", True)]:
+            results.append((count, name, *run(items, args.latency, map_reduce)))
+
+    print(f"\n{'items':>7} {'mode':>11} {'seconds':>8} {'requests':>9} {'max prompt':>11} {'total prompt':>13}")
+    for count, name, elapsed, requests, max_tokens, total_tokens in results:
+        print(f"{count:>7} {name:>11} {elapsed:>8.2f} {requests:>9} {max_tokens:>11,} {total_tokens:>13,}")
+
+
+if __name__ == "__main__":
+    main()
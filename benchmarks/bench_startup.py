@@ -0,0 +1,82 @@
+"""
+Measure import time of the packages with `python -X importtime`.
+
+Each module is imported in a fresh interpreter, so nothing is cached between
+runs. Reports the median cumulative import time and the heaviest imports it
+pulled in, and can write the results as JSON to track startup over time.
+
+Usage:
+    python -m benchmarks.bench_startup --repeat 5 --top 5 --json startup.json
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+
+DEFAULT_MODULES = ["src", "src.models", "src.workflows", "src.nodes", "src.main"]
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def import_times(module: str) -> dict:
+    """Import `module` in a new interpreter, returning cumulative microseconds per imported module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports are indented, the first occurrence is the one that did the work
+        times.setdefault(name.strip(), int(cumulative))
+    return times
+
+
+def measure(module: str, repeat: int, top: int) -> dict:
+    runs = [import_times(module) for _ in range(repeat)]
+    total_us = statistics.median(run[module] for run in runs)
+    # Heaviest top-level packages pulled in, excluding the module itself
+    last = runs[-1]
+    heaviest = sorted(
+        ((name, us) for name, us in last.items() if "." not in name and not module.startswith(name)),
+        key=lambda item: item[1],
+        reverse=True,
+    )[:top]
+    return {
+        "module": module,
+        "median_ms": total_us / 1000,
+        "runs_ms": [run[module] / 1000 for run in runs],
+        "modules_imported": len(last),
+        "heaviest": [{"module": name, "ms": us / 1000} for name, us in heaviest],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES)
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per module")
+    parser.add_argument("--top", type=int, default=5, help="Heaviest imports to list per module")
+    parser.add_argument("--json", type=Path, help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = [measure(module, args.repeat, args.top) for module in args.modules]
+
+    print(f"\n{'module':>15} {'median ms':>10} {'modules':>8}  heaviest imports")
+    for result in results:
+        heaviest = ", ".join(f"{item['module']} {item['ms']:.0f}ms" for item in result["heaviest"])
+        print(f"{result['module']:>15} {result['median_ms']:>10.1f} {result['modules_imported']:>8}  {heaviest}")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"\n📄 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Compare materialized vs streaming Hive loading against a SQLite stand-in.
+
+Usage:
+    python -m benchmarks.bench_stream_load --rows 20000 --chunk-size 1000 --fetch-latency 0.05
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+import pandas as pd
+
+from src.agents import create_classifier_agent
+from src.config.settings import settings
+from src.nodes import classify
+from src.nodes.deduplicate import assign_clusters
+from src.nodes.load_data_hive import (
+    build_comments_query,
+    get_query_params,
+    stream_feedback_items,
+    to_feedback_items,
+)
+from src.nodes.stream_classify import classify_stream
+from benchmarks.fake_llm import FakeChatModel
+from benchmarks.synthetic import create_sqlite_warehouse
+
+
+STATE = {"analysis_month": "2025-09"}
+
+
+def slow_chunks(chunks, latency: float):
+    """Simulate the network time of fetching each chunk from Presto."""
+    for chunk in chunks:
+        time.sleep(latency)
+        yield chunk
+
+
+def run_materialized(engine, args) -> list:
+    params, _ = get_query_params(STATE)
+    df = pd.read_sql(build_comments_query(), engine, params=params)
+    time.sleep(args.fetch_latency * -(-len(df) // args.chunk_size))
+    feedback_list = to_feedback_items(df)
+    assign_clusters(feedback_list)
+    classify.classify_items(feedback_list)
+    return feedback_list
+
+
+def run_streaming(engine, args) -> list:
+    feedback_list = []
+    params, _ = get_query_params(STATE)
+    chunks = slow_chunks(
+        stream_feedback_items(engine, build_comments_query(), args.chunk_size, params), args.fetch_latency
+    )
+    classify_stream(chunks, feedback_list)
+    return feedback_list
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--fetch-latency", type=float, default=0.05, help="Seconds per fetched chunk")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds per fake LLM call")
+    args = parser.parse_args()
+
+    model = FakeChatModel(latency=args.llm_latency)
+    # The fake model has no rate limits, keep the scheduler out of the measurement
+    settings.LLM_RATE_LIMIT_ENABLED = False
+    classify.agent_classifier.set(create_classifier_agent(model=model))
+    classify.local_classifier.set(None)
+    settings.CLASSIFICATION_LIMIT = None
+    settings.HIVE_CHUNK_SIZE = args.chunk_size
+    settings.HIVE_TABLE = "halley_feedback_qualtrics_comments"
+    settings.HIVE_ROW_LIMIT = None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_sqlite_warehouse(os.path.join(tmp, "warehouse.sqlite"), args.rows)
+
+        results = []
+        for name, runner in [("materialized", run_materialized), ("streaming", run_streaming)]:
+            # Fresh cache per mode, it absorbs repeats across streamed chunks
+            settings.CLASSIFICATION_CACHE_PATH = Path(tmp) / f"cache_{name}.sqlite"
+            tracemalloc.start()
+            start = time.perf_counter()
+            items = runner(engine, args)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results.append((name, len(items), elapsed, peak))
+
+        engine.dispose()
+
+    print(f"\n{'mode':>14} {'items':>8} {'seconds':>9} {'peak MB':>9}")
+    for name, count, elapsed, peak in results:
+        print(f"{name:>14} {count:>8} {elapsed:>9.2f} {peak / 2**20:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
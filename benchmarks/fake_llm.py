@@ -0,0 +1,184 @@
+"""Deterministic fake chat model used by the offline benchmarks."""
+import json
+import random
+import re
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import PrivateAttr
+
+
+KEYWORD_CATEGORIES = [
+    ("Rude Feedback", ("fuck", "shit", "stupid", "useless", "crap")),
+    ("Technical Issues", ("404", "broken", "link", "video", "image", "error", "load")),
+    ("Content Issues", ("irrelevant", "not relevant", "wrong", "inaccurate", "outdated")),
+]
+
+
+def keyword_category(text: str) -> str:
+    """Cheap keyword rule standing in for the real classifier."""
+    lowered = text.lower()
+    for category, keywords in KEYWORD_CATEGORIES:
+        if any(keyword in lowered for keyword in keywords):
+            return category
+    return "Other"
+
+
+def keyword_confidence(category: str) -> float:
+    """Confidence of the fake small model: sure about keyword matches, unsure about the fallback."""
+    return 0.6 if category == "Other" else 0.95
+
+
+def default_respond(tool_name: str, text: str) -> dict:
+    """Build tool-call arguments for the structured output schema."""
+    if tool_name == "FeedbackReport":
+        return {
+            "technical_issues_top5": [],
+            "content_issues_top5": [],
+            "rude_feedback_summary": "Benchmark summary.",
+            "other_summary": "Benchmark summary.",
+            "intro_message": "Benchmark report.",
+            "team_message": "Benchmark team message.",
+            "slack_message": "*Benchmark report*",
+        }
+    if tool_name == "ReportChunkSummary":
+        numbers = [int(number) for number in re.findall(r"^(\d+)\. ", text, flags=re.MULTILINE)]
+        return {"selected": numbers[:5], "summary": "Benchmark chunk summary."}
+    if tool_name == "FeedbackRationaleBatch":
+        return {"rationales": [
+            {"index": int(index), "rationale": f"The user reports a problem that matches {category}."}
+            for index, category in re.findall(r"^\[(\d+)\] \((.*?)\) ", text, flags=re.MULTILINE)
+        ]}
+    scored = tool_name.startswith("Scored")
+    # Label-only (compact) formats have no rationale
+    label = "Label" in tool_name
+
+    def classify(message: str) -> dict:
+        category = keyword_category(message)
+        classification = {"category": category}
+        if not label:
+            classification["rationale"] = f"Matched keywords for {category}."
+        if scored:
+            classification["confidence"] = keyword_confidence(category)
+        return classification
+
+    if tool_name.endswith("Batch"):
+        return {"classifications": [
+            {"index": int(index), **classify(message)}
+            for index, message in re.findall(r"^\[(\d+)\] (.*)$", text, flags=re.MULTILINE)
+        ]}
+    return classify(text)
+
+
+class FakeRateLimitError(Exception):
+    """Stand-in for openai.RateLimitError (HTTP 429)."""
+    status_code = 429
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Chat model that answers every request with a structured-output tool call.
+
+    Adds a fixed latency per call plus an optional latency per output
+    token, fails a configurable fraction of calls and drops a fraction of
+    batch entries, so concurrency and failure handling can be measured
+    locally. Rate limits are simulated with random 429s (`rate_limit_rate`)
+    and a server-side cap on concurrent requests (`max_concurrent`), shared
+    by every agent built on the same model.
+    """
+    latency: float = 0.0
+    output_token_latency: float = 0.0
+    failure_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    max_concurrent: int = 0
+    drop_rate: float = 0.0
+    seed: int = 42
+    respond: Callable[[str, str], dict] = default_respond
+    tool_names: List[str] = []
+
+    _random: random.Random = PrivateAttr()
+    # Shared with the copies made by bind_tools: {"lock", "in_flight", "rate_limited"}
+    _server: dict = PrivateAttr()
+
+    def model_post_init(self, __context: Any) -> None:
+        self._random = random.Random(self.seed)
+        self._server = {"lock": threading.Lock(), "in_flight": 0, "rate_limited": 0}
+
+    @property
+    def rate_limited(self) -> int:
+        """Requests answered with a fake 429 so far."""
+        return self._server["rate_limited"]
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-feedback-chat-model"
+
+    def bind_tools(self, tools, **kwargs):
+        names = [convert_to_openai_tool(tool)["function"]["name"] for tool in tools]
+        return self.model_copy(update={"tool_names": names})
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        server = self._server
+        with server["lock"]:
+            server["in_flight"] += 1
+            overloaded = bool(self.max_concurrent) and server["in_flight"] > self.max_concurrent
+            rate_limited = overloaded or (self.rate_limit_rate and self._random.random() < self.rate_limit_rate)
+            server["rate_limited"] += bool(rate_limited)
+        try:
+            if rate_limited:
+                # Rejected quickly, like the real API does
+                time.sleep(self.latency / 10)
+                raise FakeRateLimitError("Fake rate limit exceeded")
+            return self._answer(messages)
+        finally:
+            with server["lock"]:
+                server["in_flight"] -= 1
+
+    def _answer(self, messages: List[BaseMessage]) -> ChatResult:
+        if self.latency:
+            time.sleep(self.latency)
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            raise TimeoutError("Fake model timeout")
+
+        text = next(
+            (str(m.content) for m in reversed(messages) if isinstance(m, HumanMessage)),
+            "",
+        )
+        tool_name = self.tool_names[0] if self.tool_names else "FeedbackCategory"
+        args = self.respond(tool_name, text)
+        if self.drop_rate and "classifications" in args:
+            args["classifications"] = [
+                entry for entry in args["classifications"]
+                if self._random.random() >= self.drop_rate
+            ]
+        # Rough token counts so the LLM metrics have something to aggregate
+        input_tokens = sum(len(str(m.content)) for m in messages) // 4
+        output_tokens = len(json.dumps(args)) // 4
+        if self.output_token_latency:
+            # Decoding time grows with the length of the answer
+            time.sleep(self.output_token_latency * output_tokens)
+        message = AIMessage(
+            content="",
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            },
+            tool_calls=[{
+                "name": tool_name,
+                "args": args,
+                "id": f"call_{self._random.getrandbits(32):08x}",
+            }],
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
@@ -0,0 +1,84 @@
+"""Synthetic feedback generator for the offline benchmarks."""
+import random
+from typing import List
+
+from src.models import FeedbackItem
+
+
+COMMENT_TEMPLATES = [
+    "The link is broken, I get a 404 error",
+    "Video does not play in the {product} insight",
+    "This is not relevant to my work in {product}",
+    "The information about {feature} is wrong",
+    "Image does not load",
+    "Stop showing me this stupid stuff",
+    "I already know how to use {feature}",
+    "Not useful",
+    "The recommendation about {feature} is outdated",
+    "Too many notifications",
+]
+PRODUCTS = ["AutoCAD", "Revit", "Inventor", "Fusion", "Civil 3D", "Maya"]
+FEATURES = ["layers", "xrefs", "sheet sets", "families", "constraints", "rendering"]
+INSIGHT_TYPES = ["Feature Discovery", "Learning", "Productivity"]
+DETAIL_WORDS = [
+    "drawing", "project", "template", "viewport", "toolbar", "plugin", "export",
+    "deadline", "client", "workflow", "update", "license", "monitor", "palette",
+]
+
+
+def generate_feedback_items(count: int, seed: int = 42, unique_share: float = 0.0) -> List[FeedbackItem]:
+    """
+    Generate `count` reproducible feedback items.
+
+    `unique_share` of the comments get random extra details, so they are not
+    collapsed by deduplication or the classification cache.
+    """
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        product = rng.choice(PRODUCTS)
+        feature = rng.choice(FEATURES)
+        comment = rng.choice(COMMENT_TEMPLATES).format(product=product, feature=feature)
+        if unique_share and rng.random() < unique_share:
+            details = " ".join(rng.sample(DETAIL_WORDS, 4))
+            comment += f". Happened {rng.randint(2, 99)} times with my {details} (case {i})"
+        items.append(FeedbackItem(
+            user_id=f"USER{i:07d}",
+            feedback=comment,
+            insight_sub_type=f"{feature.title()} tips",
+            insight_type=rng.choice(INSIGHT_TYPES),
+            product_line_name=product,
+        ))
+    return items
+
+
+def create_sqlite_warehouse(path: str, count: int, seed: int = 42, unique_share: float = 0.0):
+    """
+    Create a SQLite stand-in for the Presto feedback table and return its engine.
+
+    Rows mirror the columns of halley_feedback_qualtrics_comments that the
+    loader reads, with `dt` partition strings spread over one month.
+    """
+    import pandas as pd
+    from sqlalchemy import create_engine
+
+    rng = random.Random(seed)
+    rows = [
+        {
+            "dt": f"202509{rng.randint(1, 30):02d}",
+            "user_id": item.user_id,
+            "translated_comment": item.feedback,
+            "insight": item.insight_type,
+            "insight_sub_type": item.insight_sub_type,
+            "product_line_name": item.product_line_name,
+            "delivery_channel": rng.choice(["account_portal", "email"]),
+            "sentiment": rng.choice(["Negative", "Very Negative"]),
+        }
+        for item in generate_feedback_items(count, seed, unique_share)
+    ]
+
+    engine = create_engine(f"sqlite:///{path}")
+    pd.DataFrame(rows).to_sql(
+        "halley_feedback_qualtrics_comments", engine, if_exists="replace", index=False
+    )
+    return engine
@@ -1,7 +1,22 @@
 """Agent definitions."""
+from typing import TYPE_CHECKING
 
-from .classifier import create_classifier_agent
-from .reporter import create_reporter_agent
+from src.utils.lazy import lazy_exports
 
-__all__ = ["create_classifier_agent", "create_reporter_agent"]
+if TYPE_CHECKING:
+    from .classifier import create_classifier_agent, create_rationale_agent
+    from .reporter import create_reporter_agent
+    from .local_classifier import LocalClassifier, create_local_classifier
 
+# LangChain and pandas are only imported when an agent is created
+_EXPORTS = {
+    "create_classifier_agent": "classifier",
+    "create_rationale_agent": "classifier",
+    "create_reporter_agent": "reporter",
+    "LocalClassifier": "local_classifier",
+    "create_local_classifier": "local_classifier",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+__all__ = list(_EXPORTS)
@@ -1,24 +1,124 @@
 """Classifier agent setup."""
+from typing import Optional
+
 from langchain.agents import create_agent
 from langchain_openai import ChatOpenAI
 
 from src.config.settings import settings
-from src.prompts import CLASSIFIER_PROMPT
-from src.models import FeedbackCategory
+from src.prompts import (
+    CLASSIFIER_PROMPT,
+    CLASSIFIER_BATCH_PROMPT,
+    CLASSIFIER_SCORED_PROMPT,
+    CLASSIFIER_SCORED_BATCH_PROMPT,
+    CLASSIFIER_LABEL_BATCH_PROMPT,
+    CLASSIFIER_SCORED_LABEL_BATCH_PROMPT,
+    RATIONALE_PROMPT,
+)
+from src.models import (
+    FeedbackCategory,
+    FeedbackCategoryBatch,
+    ScoredFeedbackCategory,
+    ScoredFeedbackCategoryBatch,
+    FeedbackLabel,
+    FeedbackLabelBatch,
+    ScoredFeedbackLabel,
+    ScoredFeedbackLabelBatch,
+    FeedbackRationaleBatch,
+)
+from src.utils.llm_metrics import instrument_agent
+from src.utils.llm_rate_limits import schedule_agent
 
 
-def create_classifier_agent():
-    """Create and return the classifier agent."""
-    model = ChatOpenAI(
-        model=settings.MODEL_NAME,
-        temperature=settings.TEMPERATURE,
-        max_tokens=settings.CLASSIFIER_MAX_TOKENS,
-        timeout=settings.TIMEOUT
-    )
-    
-    return create_agent(
+# Cascade tiers: the small model answers first with a confidence, the large
+# model (MODEL_NAME) gets the items it is unsure about
+CLASSIFIER_TIERS = ("large", "small")
+
+# (system prompt, response format) per (small tier, batch, compact)
+CLASSIFIER_FORMATS = {
+    (False, False, False): (CLASSIFIER_PROMPT, FeedbackCategory),
+    (False, True, False): (CLASSIFIER_BATCH_PROMPT, FeedbackCategoryBatch),
+    (True, False, False): (CLASSIFIER_SCORED_PROMPT, ScoredFeedbackCategory),
+    (True, True, False): (CLASSIFIER_SCORED_BATCH_PROMPT, ScoredFeedbackCategoryBatch),
+    (False, False, True): (CLASSIFIER_PROMPT, FeedbackLabel),
+    (False, True, True): (CLASSIFIER_LABEL_BATCH_PROMPT, FeedbackLabelBatch),
+    (True, False, True): (CLASSIFIER_SCORED_PROMPT, ScoredFeedbackLabel),
+    (True, True, True): (CLASSIFIER_SCORED_LABEL_BATCH_PROMPT, ScoredFeedbackLabelBatch),
+}
+
+
+def create_classifier_agent(model=None, batch: bool = False, tier: str = "large", compact: Optional[bool] = None):
+    """
+    Create and return the classifier agent.
+
+    Args:
+        model: Optional chat model to use instead of the default ChatOpenAI
+            (e.g. a local fake model for benchmarks)
+        batch: If True, the agent classifies several indexed messages per
+            request and responds with a FeedbackCategoryBatch
+        tier: "large" for MODEL_NAME; "small" for CASCADE_MODEL_NAME, which
+            also returns a confidence per classification
+        compact: If True, the agent only returns the category (an enum, no
+            rationale) within CLASSIFIER_LABEL_MAX_TOKENS per label;
+            None for CLASSIFIER_COMPACT
+    """
+    if tier not in CLASSIFIER_TIERS:
+        raise ValueError(f"Unknown classifier tier {tier!r}, expected one of {CLASSIFIER_TIERS}")
+    small = tier == "small"
+    compact = settings.CLASSIFIER_COMPACT if compact is None else compact
+    model_name = settings.CASCADE_MODEL_NAME if small else settings.MODEL_NAME
+
+    if compact:
+        labels = max(1, settings.CLASSIFICATION_BATCH_SIZE) if batch else 1
+        max_tokens = settings.CLASSIFIER_LABEL_MAX_TOKENS * labels
+    else:
+        max_tokens = settings.CLASSIFIER_MAX_TOKENS
+    if model is None:
+        model = ChatOpenAI(
+            model=model_name,
+            temperature=settings.TEMPERATURE,
+            max_tokens=max_tokens,
+            timeout=settings.TIMEOUT,
+            # Retried by the shared LLM scheduler instead
+            max_retries=0 if settings.LLM_RATE_LIMIT_ENABLED else 2,
+        )
+
+    system_prompt, response_format = CLASSIFIER_FORMATS[(small, batch, compact)]
+    agent = create_agent(
         model=model,
-        system_prompt=CLASSIFIER_PROMPT,
-        response_format=FeedbackCategory,
+        system_prompt=system_prompt,
+        response_format=response_format,
     )
+    name = "classifier_small" if small else "classifier"
+    name = f"{name}_batch" if batch else name
+    reserved_tokens = len(system_prompt) // settings.CHARS_PER_TOKEN + max_tokens
+    return schedule_agent(instrument_agent(agent, name, model_name), name, reserved_tokens)
+
+
+def create_rationale_agent(model=None):
+    """
+    Create and return the agent that explains existing classifications.
+
+    In compact mode the classifier returns labels only; this agent writes
+    the rationales of the comments that reach the report, several per
+    request (FeedbackRationaleBatch).
 
+    Args:
+        model: Optional chat model to use instead of the default ChatOpenAI
+            (e.g. a local fake model for benchmarks)
+    """
+    if model is None:
+        model = ChatOpenAI(
+            model=settings.MODEL_NAME,
+            temperature=settings.TEMPERATURE,
+            max_tokens=settings.CLASSIFIER_MAX_TOKENS,
+            timeout=settings.TIMEOUT,
+            max_retries=0 if settings.LLM_RATE_LIMIT_ENABLED else 2,
+        )
+
+    agent = create_agent(
+        model=model,
+        system_prompt=RATIONALE_PROMPT,
+        response_format=FeedbackRationaleBatch,
+    )
+    reserved_tokens = len(RATIONALE_PROMPT) // settings.CHARS_PER_TOKEN + settings.CLASSIFIER_MAX_TOKENS
+    return schedule_agent(instrument_agent(agent, "rationale", settings.MODEL_NAME), "rationale", reserved_tokens)
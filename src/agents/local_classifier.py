@@ -0,0 +1,221 @@
+"""Local fast-path classifier that labels obvious feedback without an LLM call."""
+import math
+import random
+import re
+from collections import Counter, defaultdict
+from typing import Iterable, List, Optional, Protocol, Tuple
+
+import pandas as pd
+
+from src.config.settings import settings
+from src.models import FEEDBACK_CATEGORIES
+from src.utils.near_duplicates import normalize_text
+
+
+# Rationales of locally labelled items start with this prefix, so exports
+# produced with the fast path are not fed back in as training data
+LOCAL_RATIONALE_PREFIX = "Local fast-path"
+
+Prediction = Tuple[Optional[str], float, str]
+
+
+class Predictor(Protocol):
+    """Anything that maps a feedback text to (category, confidence, reason)."""
+
+    def predict(self, text: str) -> Prediction:
+        ...
+
+
+class RuleClassifier:
+    """High-precision keyword rules derived from the category definitions in CLASSIFIER_PROMPT."""
+
+    # Actionable complaints keep their category even when they swear
+    ACTIONABLE = re.compile(
+        r"\b(error|broken|crash\w*|bug\w*|wrong|incorrect|outdated|missing"
+        r"|not (work\w*|load\w*|play\w*)|(does not|doesn't|won't|will not|can't|cannot) (work|load|play|open))\b",
+        re.IGNORECASE)
+
+    # (category, confidence, reason, pattern, unless): a rule does not apply
+    # when its `unless` pattern also matches; the first matching rule wins
+    RULES = [
+        ("Technical Issues", 0.95, "error or broken component", re.compile(
+            r"\b404\b|page not found|broken (link|cta|button|image|icon|video)"
+            r"|(link|cta|button|image|icon|video)s? (is |are )?broken"
+            r"|video (does not|doesn't|won't|will not) play", re.IGNORECASE), None),
+        ("Rude Feedback", 0.99, "profanity", re.compile(
+            r"\b(fuck\w*|shit\w*|bullshit|crap|wtf|damn)\b", re.IGNORECASE), ACTIONABLE),
+    ]
+
+    def predict(self, text: str) -> Prediction:
+        for category, confidence, reason, pattern, unless in self.RULES:
+            if pattern.search(text) and not (unless and unless.search(text)):
+                return category, confidence, f"rule '{reason}'"
+        return None, 0.0, "no rule matched"
+
+
+class NaiveBayesClassifier:
+    """Multinomial naive Bayes over word unigrams and bigrams."""
+
+    def __init__(self, alpha: float = 1.0):
+        self.alpha = alpha
+        self.class_log_prior = {}
+        self.token_log_prob = {}
+        self.unknown_log_prob = {}
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        words = normalize_text(text).split()
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def fit(self, texts: Iterable[str], labels: Iterable[str]) -> "NaiveBayesClassifier":
+        class_counts = Counter()
+        token_counts = defaultdict(Counter)
+        for text, label in zip(texts, labels):
+            class_counts[label] += 1
+            token_counts[label].update(self.tokenize(text))
+
+        vocabulary = set().union(*token_counts.values()) if token_counts else set()
+        total = sum(class_counts.values())
+        for label, count in class_counts.items():
+            denominator = sum(token_counts[label].values()) + self.alpha * (len(vocabulary) + 1)
+            self.class_log_prior[label] = math.log(count / total)
+            self.token_log_prob[label] = {
+                token: math.log((n + self.alpha) / denominator)
+                for token, n in token_counts[label].items()
+            }
+            self.unknown_log_prob[label] = math.log(self.alpha / denominator)
+        return self
+
+    def predict(self, text: str) -> Prediction:
+        if not self.class_log_prior:
+            return None, 0.0, "model not trained"
+
+        tokens = self.tokenize(text)
+        scores = {
+            label: prior + sum(
+                self.token_log_prob[label].get(token, self.unknown_log_prob[label]) for token in tokens
+            )
+            for label, prior in self.class_log_prior.items()
+        }
+        best = max(scores, key=scores.get)
+        # Softmax over log scores gives the posterior of the best class
+        confidence = 1.0 / sum(math.exp(score - scores[best]) for score in scores.values())
+        return best, confidence, f"naive Bayes confidence {confidence:.2f}"
+
+
+class LocalClassifier:
+    """Chain of local predictors, the first prediction above the threshold wins."""
+
+    def __init__(self, predictors: List[Predictor], threshold: float):
+        self.predictors = predictors
+        self.threshold = threshold
+
+    def predict(self, text: str) -> Prediction:
+        """Best local prediction, or (None, confidence, reason) if nothing is confident enough."""
+        best = (None, 0.0, "no prediction")
+        for predictor in self.predictors:
+            category, confidence, reason = predictor.predict(text)
+            if category in FEEDBACK_CATEGORIES and confidence >= self.threshold:
+                return category, confidence, reason
+            if confidence > best[1]:
+                best = (None, confidence, reason)
+        return best
+
+    def classify(self, text: str) -> Optional[Tuple[str, str]]:
+        """Return (category, rationale) if the local prediction is confident enough."""
+        category, _, reason = self.predict(text)
+        if category is None:
+            return None
+        return category, f"{LOCAL_RATIONALE_PREFIX}: {reason}"
+
+    def agreement(self, texts: List[str], labels: List[str]) -> Tuple[float, float]:
+        """
+        Compare local predictions with LLM labels.
+
+        Returns:
+            (coverage, agreement): the share of items labelled locally and
+            the share of those that match the LLM label
+        """
+        labelled = agreed = 0
+        for text, label in zip(texts, labels):
+            category, _, _ = self.predict(text)
+            if category is not None:
+                labelled += 1
+                agreed += category == label
+        coverage = labelled / len(texts) if texts else 0.0
+        agreement = agreed / labelled if labelled else 0.0
+        return coverage, agreement
+
+
+TRAINING_COLUMNS = ["Feedback", "Category", "Rationale"]
+
+# Export extension -> reader of the training columns, fastest to read first
+EXPORT_READERS = {
+    ".parquet": lambda path: pd.read_parquet(path, columns=TRAINING_COLUMNS),
+    ".csv": lambda path: pd.read_csv(path, usecols=TRAINING_COLUMNS),
+    ".jsonl": lambda path: pd.read_json(path, lines=True)[TRAINING_COLUMNS],
+    ".xlsx": lambda path: pd.read_excel(path, usecols=TRAINING_COLUMNS),
+}
+
+
+def load_training_data() -> Tuple[List[str], List[str]]:
+    """Read LLM-labelled feedback from previously exported classified_feedback_* files."""
+    # One file per run, the fastest format wins when a run exported several
+    exports = {}
+    for extension in reversed(list(EXPORT_READERS)):
+        for path in settings.OUTPUT_DIR.glob(f"classified_feedback_*{extension}"):
+            exports[path.stem] = path
+
+    texts, labels = [], []
+    for stem in sorted(exports):
+        path = exports[stem]
+        df = EXPORT_READERS[path.suffix](path)
+        df = df[df["Category"].isin(FEEDBACK_CATEGORIES)]
+        df = df[~df["Rationale"].astype(str).str.startswith(LOCAL_RATIONALE_PREFIX)]
+        texts.extend(df["Feedback"].astype(str))
+        labels.extend(df["Category"])
+    return texts, labels
+
+
+def create_local_classifier() -> LocalClassifier:
+    """
+    Create the local classifier: keyword rules, then naive Bayes fitted on past exports.
+
+    The model is first fitted on everything but a held-out sample to report
+    its agreement with the LLM labels, then refitted on all the data. The
+    sample is drawn over unique normalized texts, so repeated comments are
+    never on both sides of the split. Naive Bayes is only used when that
+    agreement reaches LOCAL_CLASSIFIER_MIN_AGREEMENT, since its scores are
+    overconfident; otherwise only the rules label items locally.
+    """
+    texts, labels = load_training_data()
+    threshold = settings.LOCAL_CLASSIFIER_THRESHOLD
+
+    if len(texts) >= settings.LOCAL_CLASSIFIER_MIN_TRAINING_ROWS:
+        groups = defaultdict(list)
+        for i, text in enumerate(texts):
+            groups[normalize_text(text)].append(i)
+        keys = sorted(groups)
+        random.Random(42).shuffle(keys)
+        split = int(len(keys) * (1 - settings.LOCAL_CLASSIFIER_HOLDOUT))
+        train = [i for key in keys[:split] for i in groups[key]]
+        holdout = [i for key in keys[split:] for i in groups[key]]
+
+        evaluation = LocalClassifier([
+            RuleClassifier(),
+            NaiveBayesClassifier().fit([texts[i] for i in train], [labels[i] for i in train]),
+        ], threshold)
+        coverage, agreement = evaluation.agreement(
+            [texts[i] for i in holdout], [labels[i] for i in holdout]
+        )
+        print(f"⚡ Local classifier trained on {len(texts)} exported items: "
+              f"labels {coverage:.0%} of held-out items with {agreement:.0%} LLM agreement")
+
+        if agreement >= settings.LOCAL_CLASSIFIER_MIN_AGREEMENT:
+            return LocalClassifier([RuleClassifier(), NaiveBayesClassifier().fit(texts, labels)], threshold)
+        print(f"⚡ Local classifier using rules only, held-out agreement is below "
+              f"{settings.LOCAL_CLASSIFIER_MIN_AGREEMENT:.0%}")
+        return LocalClassifier([RuleClassifier()], threshold)
+
+    print(f"⚡ Local classifier using rules only ({len(texts)} exported items available for training)")
+    return LocalClassifier([RuleClassifier()], threshold)
@@ -3,22 +3,40 @@ from langchain.agents import create_agent
 from langchain_openai import ChatOpenAI
 
 from src.config.settings import settings
-from src.prompts import REPORTER_PROMPT
-from src.models import FeedbackReport
+from src.prompts import REPORTER_PROMPT, REPORT_CHUNK_PROMPT
+from src.models import FeedbackReport, ReportChunkSummary
+from src.utils.llm_metrics import instrument_agent
+from src.utils.llm_rate_limits import schedule_agent
 
 
-def create_reporter_agent():
-    """Create and return the reporter agent."""
-    model = ChatOpenAI(
-        model=settings.MODEL_NAME,
-        temperature=settings.TEMPERATURE,
-        max_tokens=settings.REPORTER_MAX_TOKENS,
-        timeout=settings.TIMEOUT
-    )
-    
-    return create_agent(
+def create_reporter_agent(model=None, chunk: bool = False):
+    """
+    Create and return the reporter agent.
+
+    Args:
+        model: Optional chat model to use instead of the default ChatOpenAI
+            (e.g. a local fake model for benchmarks)
+        chunk: If True, the agent condenses one chunk of a category into its
+            most urgent comments and a summary (ReportChunkSummary) for the
+            map step of hierarchical reports
+    """
+    max_tokens = settings.REPORT_CHUNK_MAX_TOKENS if chunk else settings.REPORTER_MAX_TOKENS
+    system_prompt = REPORT_CHUNK_PROMPT if chunk else REPORTER_PROMPT
+    if model is None:
+        model = ChatOpenAI(
+            model=settings.MODEL_NAME,
+            temperature=settings.TEMPERATURE,
+            max_tokens=max_tokens,
+            timeout=settings.TIMEOUT,
+            # Retried by the shared LLM scheduler instead
+            max_retries=0 if settings.LLM_RATE_LIMIT_ENABLED else 2,
+        )
+
+    agent = create_agent(
         model=model,
-        system_prompt=REPORTER_PROMPT,
-        response_format=FeedbackReport,
+        system_prompt=system_prompt,
+        response_format=ReportChunkSummary if chunk else FeedbackReport,
     )
-
+    name = "report_summarizer" if chunk else "reporter"
+    reserved_tokens = len(system_prompt) // settings.CHARS_PER_TOKEN + max_tokens
+    return schedule_agent(instrument_agent(agent, name), name, reserved_tokens)
@@ -0,0 +1,210 @@
+"""Backfill entry point: run the workflow for every month of a date range, several months at a time."""
+import argparse
+import json
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List
+
+from src.config.settings import settings
+from src.main import invoke_workflow
+from src.nodes.load_data_hive import dispose_presto_engine
+from src.utils import (
+    format_slack_message,
+    llm_run_metrics,
+    llm_scheduler,
+    node_timings,
+    open_checkpointer,
+    print_llm_metrics,
+    print_llm_scheduler,
+    print_node_timings,
+    write_dead_letters,
+    write_llm_metrics,
+)
+from src.utils.node_timing import NodeTiming
+from src.workflows import create_feedback_workflow
+
+
+def month_range(start: str, end: str) -> List[str]:
+    """Every month from `start` to `end` inclusive, as YYYY-MM."""
+    year, month = map(int, start.split("-"))
+    end_year, end_month = map(int, end.split("-"))
+    months = []
+    while (year, month) <= (end_year, end_month):
+        months.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def report_date(month: str) -> str:
+    """First day after `month`, the date a regular run would have produced its report."""
+    year, month_number = map(int, month.split("-"))
+    year, month_number = (year + 1, 1) if month_number == 12 else (year, month_number + 1)
+    return f"{year:04d}-{month_number:02d}-01"
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Regenerate the reports of a range of months.")
+    parser.add_argument("--start", required=True, help="First month to analyse as YYYY-MM")
+    parser.add_argument("--end", required=True, help="Last month to analyse as YYYY-MM (inclusive)")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.BACKFILL_CONCURRENCY,
+        help="Months run at the same time (default: BACKFILL_CONCURRENCY)",
+    )
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="Rerun interrupted months from the start instead of resuming them",
+    )
+    return parser.parse_args()
+
+
+def initial_state(month: str) -> dict:
+    return {
+        "run_id": f"feedback-{month}",
+        "current_date": report_date(month),
+        "analysis_month": month,
+        "feedback_items": [],
+        "classified_results": [],
+        "classified_shards": [],
+        "exported_files": [],
+        "insight_stats": {},
+        "final_report": "",
+        "node_calls": 0
+    }
+
+
+def run_month(workflow, checkpointer, month: str, fresh: bool) -> dict:
+    """
+    Run the workflow for one month and write its Slack report next to the exports.
+
+    Failures are returned in the summary instead of raised, so the other
+    months keep running; rerunning the backfill resumes the failed month.
+    Completed months run again, so prompt or model changes reach them (the
+    classification cache keeps unchanged classifications cheap).
+    """
+    state = initial_state(month)
+    start = time.perf_counter()
+    try:
+        result = invoke_workflow(workflow, state, checkpointer, fresh=fresh)
+    except Exception as e:
+        print(f"❌ {month} failed: {str(e)}")
+        return {"month": month, "status": "failed", "error": str(e), "seconds": time.perf_counter() - start}
+
+    report_path = settings.OUTPUT_DIR / f"slack_report_{month}.txt"
+    report_path.write_text(format_slack_message(result["final_report"], report_month=month))
+
+    classified = result["classified_results"]
+    print(f"✅ {month}: classified {len(classified)} items, report written to: {report_path}")
+    return {
+        "month": month,
+        "status": "completed",
+        "seconds": time.perf_counter() - start,
+        "items": len(classified),
+        "failed_items": sum(1 for feedback in classified if feedback.category is None),
+        "categories": dict(Counter(feedback.category or "Unclassified" for feedback in classified)),
+        "exported_files": result.get("exported_files", []),
+        "report_file": str(report_path),
+    }
+
+
+def combined_node_timings() -> List[NodeTiming]:
+    """Node timings of all months summed per node; peak memory is the highest seen."""
+    grouped = defaultdict(list)
+    for timing in node_timings.timings:
+        grouped[timing.node].append(timing)
+    return [
+        NodeTiming(
+            node,
+            sum(timing.wall_seconds for timing in timings),
+            sum(timing.cpu_seconds for timing in timings),
+            max((timing.peak_mb for timing in timings if timing.peak_mb is not None), default=None),
+            None,
+            any(timing.failed for timing in timings),
+        )
+        for node, timings in grouped.items()
+    ]
+
+
+def main():
+    """Run the workflow for every month of the range, BACKFILL_CONCURRENCY months at a time."""
+    args = parse_args()
+    months = month_range(args.start, args.end)
+    if not months:
+        print(f"❌ No months between {args.start} and {args.end}")
+        return
+
+    # One compiled graph, checkpointer, Presto engine, classifier and
+    # classification cache serve every month
+    print("🔧 Creating workflow...")
+    settings.OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    checkpointer = open_checkpointer() if settings.CHECKPOINT_ENABLED else None
+    workflow = create_feedback_workflow(checkpointer)
+
+    concurrency = max(1, min(args.concurrency, len(months)))
+    print(f"🚀 Backfilling {len(months)} months ({months[0]} to {months[-1]}), {concurrency} at a time...\n")
+    llm_run_metrics.reset()
+    llm_scheduler.reset()
+    node_timings.reset()
+    started_at = time.time()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda month: run_month(workflow, checkpointer, month, args.fresh), months))
+    seconds = time.perf_counter() - start
+    dispose_presto_engine()
+
+    completed = [result for result in results if result["status"] == "completed"]
+    categories = Counter()
+    for result in completed:
+        categories.update(result["categories"])
+    month_seconds = sum(result["seconds"] for result in results)
+    summary = {
+        "start": months[0],
+        "end": months[-1],
+        "concurrency": concurrency,
+        "started_at": started_at,
+        "seconds": seconds,
+        "month_seconds": month_seconds,
+        "months_completed": len(completed),
+        "months_failed": len(results) - len(completed),
+        "items": sum(result["items"] for result in completed),
+        "categories": dict(categories),
+        "months": results,
+    }
+
+    print(f"\n✨ Backfill Complete!")
+    print(f"   Months: {len(completed)} completed, {summary['months_failed']} failed")
+    print(f"   Total items classified: {summary['items']}")
+    print(f"   Wall time: {seconds:.1f}s for {month_seconds:.1f}s of month runs "
+          f"({month_seconds / seconds if seconds else 0:.1f}x overlap)")
+    for result in results:
+        status = f"{result['items']} items" if result["status"] == "completed" else f"failed: {result['error']}"
+        print(f"     {result['month']}: {result['seconds']:.1f}s, {status}")
+    if settings.LLM_METRICS_ENABLED:
+        metrics = llm_run_metrics.summary()
+        summary["llm"] = metrics["total"]
+        print_llm_metrics(metrics)
+        json_path, prometheus_path = write_llm_metrics(metrics)
+        print(f"   LLM metrics written to: {json_path} and {prometheus_path}")
+    if settings.LLM_RATE_LIMIT_ENABLED:
+        summary["rate_limits"] = llm_scheduler.summary()
+        print_llm_scheduler(summary["rate_limits"])
+    dead_letters_path = write_dead_letters()
+    if dead_letters_path:
+        summary["dead_letters_file"] = str(dead_letters_path)
+        print(f"☠️  {len(llm_scheduler.dead_letters)} inputs failed permanently, written to: {dead_letters_path}")
+
+    timestamp = datetime.fromtimestamp(started_at).strftime('%Y%m%d_%H%M%S')
+    summary_path = settings.OUTPUT_DIR / f"backfill_summary_{months[0]}_{months[-1]}_{timestamp}.json"
+    summary_path.write_text(json.dumps(summary, indent=2))
+    print(f"📄 Backfill summary written to: {summary_path}")
+
+    print_node_timings(combined_node_timings())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 """Application settings and configuration."""
 import os
 from pathlib import Path
+from typing import Dict, List, Tuple
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -21,17 +22,130 @@ class Settings:
     MODEL_NAME: str = "gpt-4.1"
     TEMPERATURE: float = 0.1
     CLASSIFIER_MAX_TOKENS: int = 3000
+    CLASSIFIER_COMPACT: bool = False  # Label-only classifier responses, rationales are written later for report candidates only
+    CLASSIFIER_LABEL_MAX_TOKENS: int = 40  # Output budget per label in compact mode
     REPORTER_MAX_TOKENS: int = 6000
     TIMEOUT: int = 30
+    CHARS_PER_TOKEN: int = 4  # Rough characters per token of English text, to size prompts and rate limit budgets
+    LLM_METRICS_ENABLED: bool = True  # Record tokens, latency and cost of every LLM request
+    LLM_INPUT_COST_PER_1M: float = 2.00  # USD per million prompt tokens, for cost estimates
+    LLM_OUTPUT_COST_PER_1M: float = 8.00  # USD per million completion tokens
+    LLM_MODEL_COSTS_PER_1M: Dict[str, Tuple[float, float]] = {  # (prompt, completion) USD per million tokens of other models
+        "gpt-4.1-mini": (0.40, 1.60),
+        "gpt-4.1-nano": (0.10, 0.40),
+    }
+    
+    # LLM Rate Limits
+    LLM_RATE_LIMIT_ENABLED: bool = True  # Send every agent request through the shared scheduler
+    LLM_REQUESTS_PER_MINUTE: int = 5_000  # RPM limit of the OpenAI organization for MODEL_NAME
+    LLM_TOKENS_PER_MINUTE: int = 2_000_000  # TPM limit; requests count their prompt plus max_tokens, as OpenAI does
+    LLM_MAX_CONCURRENCY: int = 32  # Upper bound of the adaptive in-flight request limit
+    LLM_MIN_CONCURRENCY: int = 1
+    LLM_TARGET_LATENCY_SECONDS: float = 25  # Slower responses reduce the in-flight limit like a 429
+    LLM_MAX_RETRIES: int = 4  # Retries of rate limits, timeouts and server errors per request
+    LLM_RETRY_BASE_SECONDS: float = 1.0  # Backoff before the first retry, doubled per attempt and jittered
+    LLM_RETRY_MAX_SECONDS: float = 30.0
+    
+    # Model Cascade
+    CASCADE_ENABLED: bool = False  # Classify with CASCADE_MODEL_NAME first, escalate unsure items to MODEL_NAME
+    CASCADE_MODEL_NAME: str = "gpt-4.1-mini"
+    CASCADE_CONFIDENCE_THRESHOLD: float = 0.8  # Small-model answers below this confidence are escalated
+    CASCADE_AGREEMENT_SAMPLE: float = 0.05  # Share of confident answers also sent to MODEL_NAME to measure agreement
     
     # Paths
     BASE_DIR: Path = Path(__file__).parent.parent.parent
     DATA_DIR: Path = BASE_DIR / "docs"
     OUTPUT_DIR: Path = BASE_DIR / "output"
     
+    # Hive Loading
+    HIVE_TABLE: str = "desktop_product_intelligence_public.halley_feedback_qualtrics_comments"
+    HIVE_DELIVERY_CHANNELS: List[str] = ["account_portal", "email"]
+    HIVE_SENTIMENTS: List[str] = ["Negative", "Very Negative"]
+    HIVE_PRODUCT_LINES: List[str] = []  # Empty for all product lines
+    HIVE_ROW_LIMIT: int = 500  # Set to None to load the whole month, new rows per run in incremental mode
+    HIVE_SORT: bool = True  # ORDER BY dt, disable to skip the global sort
+    HIVE_STREAMING: bool = False  # Classify chunks while they are being fetched
+    HIVE_CHUNK_SIZE: int = 1000
+    HIVE_PREFETCH_CHUNKS: int = 2  # Chunks buffered ahead of classification
+    HIVE_INCREMENTAL: bool = False  # Only fetch rows newer than the stored watermark
+    HIVE_POOL_SIZE: int = 4
+    HIVE_POOL_MAX_OVERFLOW: int = 4
+    HIVE_POOL_PRE_PING: bool = True  # Check pooled connections before reuse
+    HIVE_QUERY_CACHE_ENABLED: bool = True  # Reuse query results stored as Parquet
+    HIVE_QUERY_CACHE_DIR: Path = OUTPUT_DIR / "query_cache"
+    HIVE_QUERY_CACHE_TTL_HOURS: float = 24
+    FEEDBACK_STORE_PATH: Path = OUTPUT_DIR / "feedback_store.sqlite"
+    
     # App Settings
+    COMPACT_FEEDBACK_RECORDS: bool = True  # Slots-based FeedbackRecord rows instead of Pydantic FeedbackItem
     CLASSIFICATION_LIMIT: int = 15  # Limit for testing, set to None for all
+    CLASSIFICATION_CONCURRENCY: int = 8  # Max in-flight classifier calls, 1 for sequential
+    CLASSIFICATION_BATCH_SIZE: int = 1  # Comments per classifier request, 1 disables batching
+    CLASSIFICATION_BATCH_RETRIES: int = 2  # Re-queue rounds for items missing from a batch response
+    CLASSIFICATION_SHARDS: int = 1  # Parallel classify branches, each with its own CLASSIFICATION_CONCURRENCY; 1 for a single node
     SEND_TO_SLACK: bool = True
+    
+    # Text Preprocessing
+    PREPROCESS_ENABLED: bool = True  # Normalize, redact emails/URLs/phone numbers and cap comments before classification
+    PREPROCESS_MAX_CHARS: int = 2000  # Longer comments are cut at a word boundary, None for no cap
+    PREPROCESS_WORKERS: int = 0  # Worker processes, 0 for one per CPU core
+    PREPROCESS_CHUNK_SIZE: int = 5000  # Comments per worker task
+    PREPROCESS_PARALLEL_MIN_ITEMS: int = 20_000  # Smaller inputs are processed without starting workers
+    
+    # Near-Duplicate Collapsing
+    DEDUP_ENABLED: bool = True
+    DEDUP_SIMILARITY_THRESHOLD: float = 0.8  # Estimated Jaccard similarity of character shingles
+    DEDUP_NUM_PERM: int = 64
+    DEDUP_SHINGLE_SIZE: int = 4
+    
+    # Local Fast-Path Classifier
+    LOCAL_CLASSIFIER_ENABLED: bool = True
+    LOCAL_CLASSIFIER_THRESHOLD: float = 0.9  # Min confidence to skip the LLM
+    LOCAL_CLASSIFIER_HOLDOUT: float = 0.2  # Share of exported items held out to measure LLM agreement
+    LOCAL_CLASSIFIER_MIN_TRAINING_ROWS: int = 50
+    LOCAL_CLASSIFIER_MIN_AGREEMENT: float = 0.95  # Held-out LLM agreement naive Bayes needs to be used, rules only otherwise
+    
+    # Classification Cache
+    CLASSIFICATION_CACHE_ENABLED: bool = True
+    CLASSIFICATION_CACHE_PATH: Path = OUTPUT_DIR / "classification_cache.sqlite"
+    CLASSIFICATION_CACHE_MAX_ENTRIES: int = 100_000
+    CLASSIFICATION_CACHE_MAX_AGE_DAYS: int = 180
+    
+    # Report
+    REPORT_MAP_REDUCE: bool = True  # Summarize chunks in parallel when the month does not fit in one prompt
+    REPORT_TOKEN_BUDGET: int = 12_000  # Estimated input tokens per reporter request
+    REPORT_CHUNK_SELECTED: int = 5  # Most urgent comments each chunk passes on to the final report
+    REPORT_MAX_CHUNKS: int = 8  # Chunks summarized per category and level, lower-ranked lines are only counted
+    REPORT_CHUNK_MAX_TOKENS: int = 1500
+    REPORT_MAP_CONCURRENCY: int = 4
+    REPORT_AGGREGATED_CATEGORIES: List[str] = ["Rude Feedback", "Other"]  # Sent as per-insight counts instead of raw comments
+    REPORT_TOP_INSIGHTS: int = 10  # Rows per aggregate table in the report input
+    REPORT_RATIONALE_CANDIDATES: int = 20  # In compact mode, most widespread comments per reported category that get a rationale
+    
+    # Checkpointing
+    CHECKPOINT_ENABLED: bool = True  # Resume interrupted runs from the last completed node and item
+    CHECKPOINT_PATH: Path = OUTPUT_DIR / "checkpoints.sqlite"
+    CLASSIFICATION_CHECKPOINT_ITEMS: int = 50  # LLM-classified clusters between progress saves
+    
+    # Export
+    EXPORT_FORMATS: List[str] = ["xlsx"]  # Any of "xlsx", "csv", "parquet", "jsonl"
+    
+    # Profiling
+    PROFILE_NODE: str = os.getenv("PROFILE_NODE", "")  # Workflow node to profile, empty for none
+    PROFILE_MODE: str = os.getenv("PROFILE_MODE", "cprofile")  # "cprofile" or "tracemalloc"
+    PROFILE_DIR: Path = OUTPUT_DIR / "profiles"
+    
+    # Backfill
+    BACKFILL_CONCURRENCY: int = 3  # Months run at the same time, each with its own CLASSIFICATION_CONCURRENCY
+    
+    # Service
+    SERVICE_HOST: str = "127.0.0.1"
+    SERVICE_PORT: int = 8080
+    SERVICE_BATCH_SIZE: int = 200  # Max items per micro-batch
+    SERVICE_BATCH_WINDOW_SECONDS: float = 5.0  # Max wait after the first queued item before its micro-batch is classified
+    SERVICE_QUEUE_MAX_ITEMS: int = 50_000  # Submissions beyond this are rejected with 503
+    SERVICE_REPORT_DAY: int = 1  # Day of the month the previous month is reported
+    SERVICE_REPORT_HOUR: int = 6
 
 
 settings = Settings()
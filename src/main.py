@@ -1,33 +1,147 @@
 """Main entry point for the feedback classification system."""
+import argparse
 from datetime import datetime
 from src.workflows import create_feedback_workflow
-from src.utils import send_slack_message, format_slack_message
+from src.nodes.load_data_hive import dispose_presto_engine, explain_comments_query, get_month_range
+from src.utils import (
+    send_slack_message,
+    format_slack_message,
+    llm_run_metrics,
+    llm_scheduler,
+    node_timings,
+    open_checkpointer,
+    open_classification_progress,
+    print_llm_metrics,
+    print_llm_scheduler,
+    print_node_timings,
+    write_dead_letters,
+    write_llm_metrics,
+)
+from src.utils.node_timing import PROFILE_MODES
 from src.config.settings import settings
 
 
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Run the feedback classification workflow.")
+    parser.add_argument(
+        "--month",
+        default="",
+        help="Month to analyse as YYYY-MM (default: the previous month)",
+    )
+    parser.add_argument(
+        "--explain-query",
+        action="store_true",
+        help="Print the generated Hive SQL and its Presto EXPLAIN (TYPE IO) output, then exit",
+    )
+    parser.add_argument(
+        "--profile-node",
+        default=settings.PROFILE_NODE,
+        help="Workflow node to profile, e.g. classify_comments (default: PROFILE_NODE env var)",
+    )
+    parser.add_argument(
+        "--profile-mode",
+        choices=PROFILE_MODES,
+        default=settings.PROFILE_MODE,
+        help="cprofile dumps a .prof file, tracemalloc a memory snapshot (default: PROFILE_MODE env var)",
+    )
+    parser.add_argument(
+        "--run-id",
+        default="",
+        help="Checkpoint thread ID of the run (default: one per analysis month, e.g. feedback-2025-09)",
+    )
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="Discard the checkpoints of an interrupted run instead of resuming it",
+    )
+    return parser.parse_args()
+
+
+def invoke_workflow(workflow, initial_state, checkpointer, fresh: bool = False):
+    """
+    Run the workflow, resuming the run's thread if it was interrupted.
+
+    A thread with pending nodes continues from the last completed node;
+    a completed thread (or one discarded with --fresh) starts over.
+    """
+    run_id = initial_state["run_id"]
+    if checkpointer is None:
+        return workflow.invoke(initial_state)
+
+    config = {"configurable": {"thread_id": run_id}}
+    snapshot = workflow.get_state(config)
+    if snapshot.next and not fresh:
+        print(f"♻️  Resuming run {run_id} at: {', '.join(snapshot.next)}\n")
+        return workflow.invoke(None, config, durability="sync")
+
+    if snapshot.values:
+        checkpointer.delete_thread(run_id)
+    progress = open_classification_progress(run_id)
+    progress.clear()
+    progress.close()
+
+    print(f"🧵 Run ID: {run_id}\n")
+    return workflow.invoke(initial_state, config, durability="sync")
+
+
 def main():
     """Run the feedback classification workflow."""
+    args = parse_args()
+    
+    if args.explain_query:
+        explain_comments_query({
+            "current_date": datetime.now().strftime("%Y-%m-%d"),
+            "analysis_month": args.month,
+        })
+        return
     
-    # Create workflow
+    settings.PROFILE_NODE = args.profile_node
+    settings.PROFILE_MODE = args.profile_mode
+    
+    # Create workflow, checkpointed so an interrupted run can resume
     print("🔧 Creating workflow...")
-    workflow = create_feedback_workflow()
+    checkpointer = open_checkpointer() if settings.CHECKPOINT_ENABLED else None
+    workflow = create_feedback_workflow(checkpointer)
     
     # Initial state
     initial_state = {
+        "run_id": args.run_id,
         "current_date": datetime.now().strftime("%Y-%m-%d"),
+        "analysis_month": args.month,
         "feedback_items": [],
         "classified_results": [],
+        "classified_shards": [],
+        "exported_files": [],
+        "insight_stats": {},
         "final_report": "",
         "node_calls": 0
     }
+    if not initial_state["run_id"]:
+        initial_state["run_id"] = f"feedback-{get_month_range(initial_state)[0][:7]}"
+    
     # Run workflow
     print("🚀 Starting feedback classification workflow...\n")
-    result = workflow.invoke(initial_state)
+    llm_run_metrics.reset()
+    llm_scheduler.reset()
+    node_timings.reset()
+    result = invoke_workflow(workflow, initial_state, checkpointer, fresh=args.fresh)
+    dispose_presto_engine()
     
     # Display results
     print(f"\n✨ Workflow Complete!")
     print(f"   Total items classified: {len(result['classified_results'])}")
     print(f"   Total node calls: {result['node_calls']}")
+    if settings.LLM_METRICS_ENABLED:
+        metrics = llm_run_metrics.summary()
+        print_llm_metrics(metrics)
+        json_path, prometheus_path = write_llm_metrics(metrics)
+        print(f"   LLM metrics written to: {json_path} and {prometheus_path}")
+    if settings.LLM_RATE_LIMIT_ENABLED:
+        print_llm_scheduler(llm_scheduler.summary())
+    dead_letters_path = write_dead_letters()
+    if dead_letters_path:
+        print(f"☠️  {len(llm_scheduler.dead_letters)} inputs failed permanently, written to: {dead_letters_path}")
     
     # Format and display the Slack message
     print("\n" + "="*80)
@@ -45,6 +159,8 @@ def main():
     if settings.SEND_TO_SLACK:
         send_slack_message(slack_message, use_dev_channel=True)
         print("✅ Slack message sent")
+    
+    print_node_timings()
 
 if __name__ == "__main__":
     main()
@@ -1,7 +1,48 @@
 """Pydantic models for the application."""
 
-from .feedback import FeedbackItem, FeedbackCategory
-from .report import UrgentFeedback, FeedbackReport
-
-__all__ = ["FeedbackItem", "FeedbackCategory", "UrgentFeedback", "FeedbackReport"]
+from .feedback import (
+    FEEDBACK_CATEGORIES,
+    FeedbackCategoryName,
+    FeedbackItem,
+    FeedbackCategory,
+    IndexedFeedbackCategory,
+    FeedbackCategoryBatch,
+    ScoredFeedbackCategory,
+    ScoredIndexedFeedbackCategory,
+    ScoredFeedbackCategoryBatch,
+    FeedbackLabel,
+    IndexedFeedbackLabel,
+    FeedbackLabelBatch,
+    ScoredFeedbackLabel,
+    ScoredIndexedFeedbackLabel,
+    ScoredFeedbackLabelBatch,
+    IndexedFeedbackRationale,
+    FeedbackRationaleBatch,
+)
+from .feedback_batch import FeedbackRecord, FeedbackBatch
+from .report import UrgentFeedback, FeedbackReport, ReportChunkSummary
 
+__all__ = [
+    "FEEDBACK_CATEGORIES",
+    "FeedbackCategoryName",
+    "FeedbackItem",
+    "FeedbackCategory",
+    "IndexedFeedbackCategory",
+    "FeedbackCategoryBatch",
+    "ScoredFeedbackCategory",
+    "ScoredIndexedFeedbackCategory",
+    "ScoredFeedbackCategoryBatch",
+    "FeedbackLabel",
+    "IndexedFeedbackLabel",
+    "FeedbackLabelBatch",
+    "ScoredFeedbackLabel",
+    "ScoredIndexedFeedbackLabel",
+    "ScoredFeedbackLabelBatch",
+    "IndexedFeedbackRationale",
+    "FeedbackRationaleBatch",
+    "FeedbackRecord",
+    "FeedbackBatch",
+    "UrgentFeedback",
+    "FeedbackReport",
+    "ReportChunkSummary",
+]
@@ -1,6 +1,11 @@
 """Feedback data models."""
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Literal, Optional, get_args
+
+
+FeedbackCategoryName = Literal["Technical Issues", "Content Issues", "Rude Feedback", "Other"]
+
+FEEDBACK_CATEGORIES = list(get_args(FeedbackCategoryName))
 
 
 class FeedbackCategory(BaseModel):
@@ -9,8 +14,85 @@ class FeedbackCategory(BaseModel):
     rationale: str = Field(..., description="Explanation why the category was chosen")
 
 
+class IndexedFeedbackCategory(FeedbackCategory):
+    """The category of one feedback message in a batch."""
+    index: int = Field(..., description="Index of the feedback message in the batch")
+
+
+class FeedbackCategoryBatch(BaseModel):
+    """The categories of a batch of feedback messages."""
+    classifications: List[IndexedFeedbackCategory] = Field(
+        ..., description="One classification per feedback message, keyed by its index"
+    )
+
+
+class ScoredFeedbackCategory(FeedbackCategory):
+    """The category of the feedback with the model's confidence, returned by the small cascade tier."""
+    confidence: float = Field(..., ge=0, le=1, description="Confidence in the category, from 0 to 1")
+
+
+class ScoredIndexedFeedbackCategory(ScoredFeedbackCategory):
+    """The scored category of one feedback message in a batch."""
+    index: int = Field(..., description="Index of the feedback message in the batch")
+
+
+class ScoredFeedbackCategoryBatch(BaseModel):
+    """The scored categories of a batch of feedback messages."""
+    classifications: List[ScoredIndexedFeedbackCategory] = Field(
+        ..., description="One scored classification per feedback message, keyed by its index"
+    )
+
+
+class FeedbackLabel(BaseModel):
+    """The category of the feedback, without a rationale."""
+    category: FeedbackCategoryName = Field(..., description="Category of the feedback")
+
+
+class IndexedFeedbackLabel(FeedbackLabel):
+    """The category of one feedback message in a batch, without a rationale."""
+    index: int = Field(..., description="Index of the feedback message in the batch")
+
+
+class FeedbackLabelBatch(BaseModel):
+    """The categories of a batch of feedback messages, without rationales."""
+    classifications: List[IndexedFeedbackLabel] = Field(
+        ..., description="One category per feedback message, keyed by its index"
+    )
+
+
+class ScoredFeedbackLabel(FeedbackLabel):
+    """The category of the feedback with the model's confidence, compact mode of the small cascade tier."""
+    confidence: float = Field(..., ge=0, le=1, description="Confidence in the category, from 0 to 1")
+
+
+class ScoredIndexedFeedbackLabel(ScoredFeedbackLabel):
+    """The scored category of one feedback message in a batch, without a rationale."""
+    index: int = Field(..., description="Index of the feedback message in the batch")
+
+
+class ScoredFeedbackLabelBatch(BaseModel):
+    """The scored categories of a batch of feedback messages, without rationales."""
+    classifications: List[ScoredIndexedFeedbackLabel] = Field(
+        ..., description="One scored category per feedback message, keyed by its index"
+    )
+
+
+class IndexedFeedbackRationale(BaseModel):
+    """Why one already classified feedback message belongs to its category."""
+    index: int = Field(..., description="Index of the feedback message in the request")
+    rationale: str = Field(..., description="Explanation why the category was chosen")
+
+
+class FeedbackRationaleBatch(BaseModel):
+    """Rationales for a list of already classified feedback messages."""
+    rationales: List[IndexedFeedbackRationale] = Field(
+        ..., description="One rationale per feedback message, keyed by its index"
+    )
+
+
 class FeedbackItem(BaseModel):
     """Represents a single feedback item."""
+    dt: Optional[str] = Field(default=None, description="Partition date (YYYYMMDD) of the feedback row")
     user_id: str = Field(description="The user ID")
     feedback: str = Field(description="The feedback from the user")
     insight_sub_type: str = Field(description="The sub type of the insight")
@@ -18,4 +100,5 @@ class FeedbackItem(BaseModel):
     product_line_name: str = Field(description="The product line name")
     category: Optional[str] = Field(default=None, description="LLM-assigned category")
     rationale: Optional[str] = Field(default=None, description="LLM reasoning for category")
-
+    cluster_id: Optional[int] = Field(default=None, description="Near-duplicate cluster this item belongs to")
+    cluster_size: int = Field(default=1, description="Number of near-duplicate items in the cluster")
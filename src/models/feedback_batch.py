@@ -0,0 +1,83 @@
+"""Compact feedback records built and validated column by column."""
+from dataclasses import dataclass, fields
+from typing import Dict, List, Optional, Sequence
+
+from pydantic import TypeAdapter
+
+from .feedback import FeedbackItem
+
+
+@dataclass(slots=True)
+class FeedbackRecord:
+    """
+    Slots-based feedback row with the same attributes as FeedbackItem.
+
+    Has no per-instance __dict__ or Pydantic bookkeeping, so it is several
+    times smaller and faster to build; validation happens in bulk in
+    FeedbackBatch instead of per row.
+    """
+    user_id: str
+    feedback: str
+    insight_sub_type: str
+    insight_type: str
+    product_line_name: str
+    dt: Optional[str] = None
+    category: Optional[str] = None
+    rationale: Optional[str] = None
+    cluster_id: Optional[int] = None
+    cluster_size: int = 1
+
+    def to_item(self) -> FeedbackItem:
+        """Convert to a full FeedbackItem model."""
+        return FeedbackItem(**{field.name: getattr(self, field.name) for field in fields(self)})
+
+
+REQUIRED_COLUMNS = ["user_id", "feedback", "insight_sub_type", "insight_type", "product_line_name"]
+
+_STR_COLUMN = TypeAdapter(List[str])
+_OPTIONAL_STR_COLUMN = TypeAdapter(List[Optional[str]])
+
+
+class FeedbackBatch(list):
+    """
+    List of FeedbackRecord rows built from whole columns.
+
+    Behaves like the List[FeedbackItem] the nodes already pass around
+    (iteration, slicing, concatenation), so every node can consume it.
+    """
+
+    @classmethod
+    def from_columns(
+        cls,
+        columns: Dict[str, Sequence],
+        defaults: Optional[Dict[str, str]] = None,
+    ) -> "FeedbackBatch":
+        """
+        Validate whole columns with Pydantic, then build one record per row.
+
+        Args:
+            columns: Field name to column values, must include REQUIRED_COLUMNS;
+                `dt` is optional
+            defaults: Replacement for missing or empty values per field
+        """
+        # pandas is only needed here, keep it out of importing the models
+        import pandas as pd
+
+        defaults = defaults or {}
+        length = len(columns[REQUIRED_COLUMNS[0]])
+
+        validated = []
+        for name in REQUIRED_COLUMNS:
+            series = pd.Series(columns[name], dtype=object)
+            if name in defaults:
+                series = series.where(series.notna() & (series != ""), defaults[name])
+            validated.append(_STR_COLUMN.validate_python(series.tolist()))
+
+        dt = columns.get("dt")
+        if dt is None:
+            dt_column = [None] * length
+        else:
+            series = pd.Series(dt, dtype=object)
+            dt_column = _OPTIONAL_STR_COLUMN.validate_python(series.where(series.notna(), None).tolist())
+
+        return cls(FeedbackRecord(*row, dt) for row, dt in zip(zip(*validated), dt_column))
@@ -37,3 +37,13 @@ class FeedbackReport(BaseModel):
         description="Complete report formatted for Slack using Slack markdown syntax (*bold*, _italic_, `code`, emoji). Include all sections with proper formatting and spacing."
     )
 
+
+
+class ReportChunkSummary(BaseModel):
+    """Partial result for one chunk of a category, reduced into the final report."""
+    selected: List[int] = Field(
+        description="Numbers of the most urgent comment lines in the chunk, most urgent first"
+    )
+    summary: str = Field(
+        description="Short summary of the lines that were not selected: recurring issues, insight names and how many comments mention them"
+    )
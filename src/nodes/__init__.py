@@ -1,14 +1,36 @@
 """LangGraph workflow nodes."""
+from typing import TYPE_CHECKING
 
-from .load_data_hive import load_data_from_hive
-from .classify import classify_comments
-from .export import export_classified_results
-from .report import create_report
+from src.utils.lazy import lazy_exports
 
-__all__ = [
-    "load_data_from_hive",
-    "classify_comments",
-    "export_classified_results",
-    "create_report"
-]
+if TYPE_CHECKING:
+    from .load_data_hive import load_data_from_hive
+    from .preprocess import preprocess_feedback
+    from .deduplicate import deduplicate_feedback
+    from .classify import classify_comments
+    from .classify_shards import classify_shard, dispatch_classification_shards, merge_classified_shards
+    from .stream_classify import load_and_classify_from_hive
+    from .merge_store import merge_with_feedback_store
+    from .export import export_classified_results
+    from .aggregate import aggregate_feedback
+    from .report import create_report
 
+# Nodes are imported on first use, so importing one does not load them all
+_EXPORTS = {
+    "load_data_from_hive": "load_data_hive",
+    "preprocess_feedback": "preprocess",
+    "deduplicate_feedback": "deduplicate",
+    "classify_comments": "classify",
+    "dispatch_classification_shards": "classify_shards",
+    "classify_shard": "classify_shards",
+    "merge_classified_shards": "classify_shards",
+    "load_and_classify_from_hive": "stream_classify",
+    "merge_with_feedback_store": "merge_store",
+    "export_classified_results": "export",
+    "aggregate_feedback": "aggregate",
+    "create_report": "report",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+__all__ = list(_EXPORTS)
@@ -0,0 +1,18 @@
+"""Aggregate statistics node."""
+from src.utils import compute_insight_stats
+
+
+def aggregate_feedback(state):
+    """Count classified comments and users per category, insight and product line for the report."""
+
+    classified_results = state["classified_results"]
+
+    stats = compute_insight_stats(classified_results)
+
+    print(f"📊 Aggregated {len(classified_results)} classified items into "
+          f"{len(stats['by_product_line'])} category × insight × product line groups")
+
+    return {
+        "insight_stats": stats,
+        "node_calls": state.get('node_calls', 0) + 1
+    }
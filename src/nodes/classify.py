@@ -1,35 +1,418 @@
 """Classification node."""
-from src.agents import create_classifier_agent
+import hashlib
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from src.agents import create_classifier_agent, create_local_classifier
 from src.config.settings import settings
+from src.models import FEEDBACK_CATEGORIES, FeedbackItem, FeedbackLabel
+from src.utils import (
+    ClassificationProgress,
+    Lazy,
+    llm_run_metrics,
+    llm_scheduler,
+    open_classification_cache,
+    open_classification_progress,
+    single_line,
+)
+
+
+# Agent instances, created once on first use
+agent_classifier = Lazy(create_classifier_agent)
+batch_classifier = Lazy(lambda: create_classifier_agent(batch=True))
+local_classifier = Lazy(lambda: create_local_classifier() if settings.LOCAL_CLASSIFIER_ENABLED else None)
+small_classifier = Lazy(lambda: create_classifier_agent(tier="small"))
+small_batch_classifier = Lazy(lambda: create_classifier_agent(batch=True, tier="small"))
+
+
+def is_valid_classification(entry) -> bool:
+    """A known category, with a rationale unless the response is label-only (compact mode)."""
+    return entry.category in FEEDBACK_CATEGORIES and (isinstance(entry, FeedbackLabel) or bool(entry.rationale))
+
+
+def apply_classification(feedback: FeedbackItem, entry):
+    """Copy a classifier answer to the item, labels leave the rationale empty."""
+    feedback.category = entry.category
+    feedback.rationale = getattr(entry, "rationale", None)
+
+
+def classify_feedback(feedback: FeedbackItem) -> Optional[str]:
+    """
+    Classify a single feedback item in place.
+
+    Failures are recorded on the item and in the dead letters instead of
+    raised, so one timeout does not abort the whole run.
+
+    Returns:
+        None on success, otherwise the error message
+    """
+    inputs = {"messages": [{"role": "user", "content": feedback.feedback}]}
+
+    try:
+        response = agent_classifier.get().invoke(inputs)
+    except Exception as e:
+        feedback.category = None
+        feedback.rationale = f"Classification failed: {str(e)}"
+        llm_scheduler.add_dead_letter("classifier", feedback.feedback, e)
+        return str(e)
+
+    apply_classification(feedback, response["structured_response"])
+    return None
+
+
+def format_batch(batch: List[FeedbackItem]) -> str:
+    """Create the indexed message list for a batch request, one comment per line."""
+    return "\n".join(f"[{i}] {single_line(feedback.feedback)}" for i, feedback in enumerate(batch))
+
+
+def classify_batch(batch: List[FeedbackItem]) -> List[FeedbackItem]:
+    """
+    Classify a batch of feedback items in place with a single request.
+
+    Returns:
+        The items that are missing from or garbled in the response (all of
+        them if the request failed), so the caller can re-queue them
+    """
+    inputs = {"messages": [{"role": "user", "content": format_batch(batch)}]}
+
+    try:
+        response = batch_classifier.get().invoke(inputs)
+    except Exception:
+        return batch
+
+    # Keep the first valid classification per index
+    results = {}
+    for entry in response["structured_response"].classifications:
+        if (
+            0 <= entry.index < len(batch)
+            and entry.index not in results
+            and is_valid_classification(entry)
+        ):
+            results[entry.index] = entry
+
+    for index, entry in results.items():
+        apply_classification(batch[index], entry)
+
+    return [feedback for i, feedback in enumerate(batch) if i not in results]
+
+
+def classify_in_batches(feedback_list: List[FeedbackItem], executor: ThreadPoolExecutor) -> int:
+    """
+    Classify items N per request, re-queueing unanswered items and falling back to single calls.
+
+    Returns:
+        The number of classifier requests made
+    """
+    size = settings.CLASSIFICATION_BATCH_SIZE
+    pending = feedback_list
+    requests = 0
+
+    for _ in range(settings.CLASSIFICATION_BATCH_RETRIES + 1):
+        if not pending:
+            break
+        batches = [pending[i:i + size] for i in range(0, len(pending), size)]
+        if requests:
+            llm_run_metrics.record_retry("classifier_batch", len(pending))
+        requests += len(batches)
+        pending = [feedback for requeued in executor.map(classify_batch, batches) for feedback in requeued]
+
+    if pending:
+        print(f"🔁 {len(pending)} items unanswered in batch responses, classifying individually")
+        llm_run_metrics.record_retry("classifier", len(pending))
+        requests += len(pending)
+        list(executor.map(classify_feedback, pending))
+
+    return requests
+
+
+def classify_with_large_model(feedback_list: List[FeedbackItem], executor: ThreadPoolExecutor) -> int:
+    """
+    Classify items with MODEL_NAME, batched when CLASSIFICATION_BATCH_SIZE > 1.
+
+    Returns:
+        The number of classifier requests made
+    """
+    if settings.CLASSIFICATION_BATCH_SIZE > 1:
+        return classify_in_batches(feedback_list, executor)
+    list(executor.map(classify_feedback, feedback_list))
+    return len(feedback_list)
+
+
+def score_feedback(feedback: FeedbackItem) -> Optional[float]:
+    """
+    Classify a single feedback item in place with the small cascade tier.
+
+    Returns:
+        The model's confidence, None if the request failed or the answer was invalid
+    """
+    inputs = {"messages": [{"role": "user", "content": feedback.feedback}]}
+
+    try:
+        response = small_classifier.get().invoke(inputs)
+    except Exception:
+        return None
+
+    result = response["structured_response"]
+    if not is_valid_classification(result):
+        return None
+    apply_classification(feedback, result)
+    return result.confidence
+
+
+def score_batch(batch: List[FeedbackItem]) -> List[Optional[float]]:
+    """
+    Classify a batch of feedback items in place with the small cascade tier.
+
+    Returns:
+        The confidence per item, None for items missing from or invalid in
+        the response (all of them if the request failed)
+    """
+    inputs = {"messages": [{"role": "user", "content": format_batch(batch)}]}
+    confidences = [None] * len(batch)
+
+    try:
+        response = small_batch_classifier.get().invoke(inputs)
+    except Exception:
+        return confidences
+
+    # Keep the first valid classification per index
+    for entry in response["structured_response"].classifications:
+        if (
+            0 <= entry.index < len(batch)
+            and confidences[entry.index] is None
+            and is_valid_classification(entry)
+        ):
+            apply_classification(batch[entry.index], entry)
+            confidences[entry.index] = entry.confidence
 
+    return confidences
 
-# Create agent instance once
-agent_classifier = create_classifier_agent()
+
+def in_agreement_sample(text: str) -> bool:
+    """Pick CASCADE_AGREEMENT_SAMPLE of the comments by hash, so reruns check the same ones."""
+    digest = hashlib.sha256(text.encode("utf-8")).digest()
+    return int.from_bytes(digest[:4], "big") / 2**32 < settings.CASCADE_AGREEMENT_SAMPLE
+
+
+def classify_cascade(feedback_list: List[FeedbackItem], executor: ThreadPoolExecutor) -> Counter:
+    """
+    Classify items with the small model first, escalating to MODEL_NAME where it is unsure.
+
+    Items the small model fails on or answers below CASCADE_CONFIDENCE_THRESHOLD
+    are reclassified by the large model. A hash-based sample of the confident
+    answers is classified by both tiers to measure their agreement; the large
+    model's answer is kept for those.
+
+    Returns:
+        Counters for requests per tier, items finished on the small model,
+        escalations and sampled agreement
+    """
+    stats = Counter()
+    size = settings.CLASSIFICATION_BATCH_SIZE
+
+    if size > 1:
+        batches = [feedback_list[i:i + size] for i in range(0, len(feedback_list), size)]
+        confidences = [confidence for scored in executor.map(score_batch, batches) for confidence in scored]
+        stats["small_requests"] += len(batches)
+    else:
+        confidences = list(executor.map(score_feedback, feedback_list))
+        stats["small_requests"] += len(feedback_list)
+
+    escalated = []
+    sampled = []
+    for feedback, confidence in zip(feedback_list, confidences):
+        if confidence is None:
+            stats["escalated_failed"] += 1
+            escalated.append(feedback)
+        elif confidence < settings.CASCADE_CONFIDENCE_THRESHOLD:
+            stats["escalated_low_confidence"] += 1
+            escalated.append(feedback)
+        elif in_agreement_sample(feedback.feedback):
+            sampled.append((feedback, feedback.category, feedback.rationale))
+            # Cleared so a failed large-model call shows as no answer
+            feedback.category = feedback.rationale = None
+        else:
+            stats["small_final"] += 1
+
+    stats["llm_requests"] += classify_with_large_model(escalated + [feedback for feedback, _, _ in sampled], executor)
+
+    for feedback, category, rationale in sampled:
+        if feedback.category is None:
+            # The large model failed, the confident small-model answer stands
+            # and there is nothing to compare it with
+            feedback.category, feedback.rationale = category, rationale
+            continue
+        stats["sampled"] += 1
+        stats["agreed"] += feedback.category == category
+
+    return stats
+
+
+def fan_out(representative: FeedbackItem, members: List[FeedbackItem]):
+    """Copy a representative's classification to the other members of its cluster."""
+    for feedback in members:
+        if feedback is not representative:
+            feedback.category = representative.category
+            feedback.rationale = representative.rationale
+
+
+def classify_items(feedback_list: List[FeedbackItem], progress: Optional[ClassificationProgress] = None) -> Counter:
+    """
+    Classify feedback items in place.
+
+    One representative per near-duplicate cluster is served from the cache
+    or the local fast path when possible, the rest go to the LLM, and the
+    results fan back out to the cluster members.
+
+    Args:
+        feedback_list: Items to classify
+        progress: If given, classified items are saved to it every
+            CLASSIFICATION_CHECKPOINT_ITEMS LLM-classified clusters
+
+    Returns:
+        Counters for cache hits/misses, local and LLM labels, LLM requests,
+        calls saved by clustering and failures
+    """
+    stats = Counter()
+
+    # Only one representative per near-duplicate cluster gets classified
+    clusters = defaultdict(list)
+    for feedback in feedback_list:
+        cluster_key = feedback.cluster_id if feedback.cluster_id is not None else id(feedback)
+        clusters[cluster_key].append(feedback)
+    representatives = {cluster_key: members[0] for cluster_key, members in clusters.items()}
+
+    # Serve repeated comments from the cache, then let the local fast path
+    # label confident items, only the rest reach the LLM
+    cache = open_classification_cache() if settings.CLASSIFICATION_CACHE_ENABLED else None
+    local = local_classifier.get()
+    to_classify = []
+    for cluster_key, feedback in representatives.items():
+        cached = cache.get(feedback.feedback) if cache else None
+        labelled = local.classify(feedback.feedback) if local and not cached else None
+        if cached:
+            feedback.category, feedback.rationale = cached
+        elif labelled:
+            feedback.category, feedback.rationale = labelled
+            stats["local"] += 1
+        else:
+            to_classify.append(cluster_key)
+            continue
+        fan_out(feedback, clusters[cluster_key])
+
+    # Classify with a bounded number of in-flight calls, map() keeps input order.
+    # Clusters go to the LLM in slices, saving progress after each slice.
+    max_workers = max(1, settings.CLASSIFICATION_CONCURRENCY)
+    step = settings.CLASSIFICATION_CHECKPOINT_ITEMS if progress else len(to_classify)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for start in range(0, len(to_classify), max(1, step)):
+            keys = to_classify[start:start + step]
+            part = [representatives[cluster_key] for cluster_key in keys]
+            if settings.CASCADE_ENABLED:
+                stats += classify_cascade(part, executor)
+            else:
+                stats["llm_requests"] += classify_with_large_model(part, executor)
+
+            for cluster_key in keys:
+                fan_out(representatives[cluster_key], clusters[cluster_key])
+            if progress:
+                progress.save(feedback for cluster_key in keys for feedback in clusters[cluster_key])
+    stats["llm"] += len(to_classify)
+
+    if cache:
+        for cluster_key in to_classify:
+            feedback = representatives[cluster_key]
+            if feedback.category in FEEDBACK_CATEGORIES:
+                cache.put(feedback.feedback, feedback.category, feedback.rationale)
+        cache.close()
+        stats["cache_hits"] += cache.hits
+        stats["cache_misses"] += cache.misses
+
+    stats["clustered"] += len(feedback_list) - len(representatives)
+    stats["classified"] += len(feedback_list)
+    stats["failed"] += sum(1 for feedback in feedback_list if feedback.category is None)
+    return stats
+
+
+def print_cascade_summary(stats: Counter):
+    """Print items, latency and agreement per cascade tier."""
+    escalated = stats["escalated_low_confidence"] + stats["escalated_failed"]
+    print(f"🪜 Cascade: {stats['small_final']} of {stats['llm']} items finished on {settings.CASCADE_MODEL_NAME}, "
+          f"{escalated} escalated to {settings.MODEL_NAME} "
+          f"({stats['escalated_low_confidence']} low confidence, {stats['escalated_failed']} failed)")
+    if stats["sampled"]:
+        print(f"   Tier agreement on {stats['sampled']} sampled items: {stats['agreed'] / stats['sampled']:.0%}")
+
+    agents = llm_run_metrics.summary()["agents"]
+    latencies = []
+    for name in ("classifier_small", "classifier_small_batch", "classifier", "classifier_batch"):
+        if agents.get(name, {}).get("requests"):
+            latency = agents[name]["latency_seconds"]
+            latencies.append(f"{name} p50 {latency['p50']:.2f}s / p95 {latency['p95']:.2f}s")
+    if latencies:
+        print(f"   Request latency: {', '.join(latencies)}")
+
+
+def print_classification_summary(stats: Counter):
+    """Print the counters returned by classify_items."""
+    lookups = stats["cache_hits"] + stats["cache_misses"]
+    if lookups:
+        print(f"💾 Classification cache: {stats['cache_hits']} hits, {stats['cache_misses']} misses "
+              f"({stats['cache_hits'] / lookups * 100:.0f}% hit rate)")
+    if local_classifier.get():
+        print(f"⚡ Local fast path labelled {stats['local']} items, {stats['llm']} sent to the LLM")
+    if stats["small_requests"]:
+        print_cascade_summary(stats)
+    if settings.CLASSIFICATION_BATCH_SIZE > 1 and stats["small_requests"]:
+        print(f"📦 Batched {stats['llm']} items into {stats['small_requests']} {settings.CASCADE_MODEL_NAME} "
+              f"and {stats['llm_requests']} {settings.MODEL_NAME} requests")
+    elif settings.CLASSIFICATION_BATCH_SIZE > 1:
+        print(f"📦 Batched {stats['llm']} items into {stats['llm_requests']} classifier requests")
+    if stats["clustered"]:
+        print(f"🧩 Near-duplicate clustering saved {stats['clustered']} classifier calls")
+    if stats["resumed"]:
+        print(f"♻️  Restored {stats['resumed']} items classified before the run was interrupted")
+
+    print(f"✅ Classified {stats['classified'] - stats['failed']} feedback items")
+    if stats["failed"]:
+        print(f"⚠️  {stats['failed']} feedback items failed classification")
+
+
+def classify_run_items(feedback_list: List[FeedbackItem], run_id: Optional[str]) -> Counter:
+    """
+    Classify items of a workflow run in place, resuming its saved progress.
+
+    Items classified before an interruption of the run are restored, not
+    reclassified, and new classifications are saved as they complete.
+
+    Returns:
+        The classify_items counters, including restored items
+    """
+    progress = open_classification_progress(run_id) if settings.CHECKPOINT_ENABLED and run_id else None
+    pending = progress.restore(feedback_list) if progress else feedback_list
+
+    stats = classify_items(pending, progress)
+    if progress:
+        progress.close()
+    stats["resumed"] += len(feedback_list) - len(pending)
+    stats["classified"] += len(feedback_list) - len(pending)
+    return stats
 
 
 def classify_comments(state):
     """Node with the classifier agent that classifies the feedback."""
-    
+
     feedback_list = state["feedback_items"]
-    classified_results = []
-    
-    for feedback in feedback_list:
-        # Apply classification limit if set
-        if settings.CLASSIFICATION_LIMIT and len(classified_results) >= settings.CLASSIFICATION_LIMIT:
-            break
-        
-        inputs = {"messages": [{"role": "user", "content": feedback.feedback}]}
-        response = agent_classifier.invoke(inputs)
-        
-        feedback.category = response["structured_response"].category
-        feedback.rationale = response["structured_response"].rationale
-        
-        classified_results.append(feedback)
-    
-    print(f"✅ Classified {len(classified_results)} feedback items")
-    
+
+    # Apply classification limit if set
+    if settings.CLASSIFICATION_LIMIT:
+        feedback_list = feedback_list[:settings.CLASSIFICATION_LIMIT]
+
+    stats = classify_run_items(feedback_list, state.get("run_id"))
+    print_classification_summary(stats)
+
     return {
-        "classified_results": classified_results,
+        "classified_results": list(feedback_list),
         "node_calls": state.get('node_calls', 0) + 1
     }
-
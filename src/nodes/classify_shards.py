@@ -0,0 +1,97 @@
+"""Sharded classification: parallel classify branches dispatched with LangGraph Send."""
+import heapq
+from collections import Counter, defaultdict
+from typing import List
+
+from langgraph.types import Send
+
+from src.config.settings import settings
+from src.nodes.classify import classify_run_items, print_classification_summary
+
+
+def shard_feedback(feedback_list: List, shards: int) -> List[List[int]]:
+    """
+    Split items into at most `shards` groups of positions.
+
+    Near-duplicate clusters stay in one shard, so each cluster is still
+    classified once. Clusters are assigned largest first to the shard with
+    the fewest items, ties going to the lower shard, so the split only
+    depends on the input.
+
+    Returns:
+        The sorted item positions of every non-empty shard
+    """
+    clusters = defaultdict(list)
+    for position, feedback in enumerate(feedback_list):
+        cluster_key = feedback.cluster_id if feedback.cluster_id is not None else ("item", position)
+        clusters[cluster_key].append(position)
+
+    loads = [(0, shard) for shard in range(max(1, shards))]
+    assigned = defaultdict(list)
+    for positions in sorted(clusters.values(), key=lambda positions: (-len(positions), positions[0])):
+        load, shard = heapq.heappop(loads)
+        assigned[shard].extend(positions)
+        heapq.heappush(loads, (load + len(positions), shard))
+
+    return [sorted(assigned[shard]) for shard in sorted(assigned)]
+
+
+def dispatch_classification_shards(state) -> List[Send]:
+    """Conditional edge sending each shard of feedback_items to its own classify_shard branch."""
+
+    feedback_list = state["feedback_items"]
+
+    # Apply classification limit if set
+    if settings.CLASSIFICATION_LIMIT:
+        feedback_list = feedback_list[:settings.CLASSIFICATION_LIMIT]
+
+    shards = shard_feedback(feedback_list, settings.CLASSIFICATION_SHARDS)
+    print(f"🔀 Classifying {len(feedback_list)} items in {len(shards)} parallel shards")
+
+    # An empty month still needs one branch, otherwise the graph stops here
+    return [
+        Send("classify_shard", {
+            "run_id": state.get("run_id"),
+            "shard": shard,
+            "positions": positions,
+            "feedback_items": [feedback_list[position] for position in positions],
+        })
+        for shard, positions in enumerate(shards or [[]])
+    ]
+
+
+def classify_shard(state):
+    """Node classifying one shard; its items are merged by merge_classified_shards."""
+
+    feedback_list = state["feedback_items"]
+    stats = classify_run_items(feedback_list, state["run_id"])
+    print(f"✅ Shard {state['shard']}: classified {len(feedback_list)} items")
+
+    # node_calls has no reducer, so parallel branches leave it to the merge node
+    return {
+        "classified_shards": [{
+            "shard": state["shard"],
+            "positions": state["positions"],
+            "items": list(feedback_list),
+            "stats": dict(stats),
+        }]
+    }
+
+
+def merge_classified_shards(state):
+    """Merge the shard results into classified_results in the original item order."""
+
+    # Every position is kept once, from the lowest shard, whatever order the branches finished in
+    merged = {}
+    stats = Counter()
+    for result in sorted(state["classified_shards"], key=lambda result: result["shard"]):
+        for position, feedback in zip(result["positions"], result["items"]):
+            merged.setdefault(position, feedback)
+        stats.update(result["stats"])
+
+    print_classification_summary(stats)
+
+    return {
+        "classified_results": [merged[position] for position in sorted(merged)],
+        "node_calls": state.get('node_calls', 0) + 1
+    }
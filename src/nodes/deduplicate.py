@@ -0,0 +1,66 @@
+"""Near-duplicate collapsing node."""
+from collections import Counter
+from typing import List
+
+from src.config.settings import settings
+from src.models import FeedbackItem
+from src.utils import cluster_near_duplicates
+
+
+def assign_clusters(feedback_list: List[FeedbackItem], offset: int = 0) -> int:
+    """
+    Set cluster_id and cluster_size on every item.
+
+    Args:
+        feedback_list: Items to cluster
+        offset: Added to every cluster ID, so IDs stay unique when items
+            are clustered in separate chunks
+
+    Returns:
+        The number of clusters
+    """
+    cluster_ids = cluster_near_duplicates(
+        [feedback.feedback for feedback in feedback_list],
+        threshold=settings.DEDUP_SIMILARITY_THRESHOLD,
+        num_perm=settings.DEDUP_NUM_PERM,
+        shingle_size=settings.DEDUP_SHINGLE_SIZE,
+    )
+    cluster_sizes = Counter(cluster_ids)
+
+    for feedback, cluster_id in zip(feedback_list, cluster_ids):
+        feedback.cluster_id = cluster_id + offset
+        feedback.cluster_size = cluster_sizes[cluster_id]
+
+    return len(cluster_sizes)
+
+
+def deduplicate_feedback(state):
+    """
+    Group near-duplicate feedback so only one item per cluster gets classified.
+
+    Only the items within CLASSIFICATION_LIMIT are clustered, the ones the
+    classify step keeps, so cluster sizes count classified items only.
+    """
+
+    feedback_list = state["feedback_items"]
+
+    if not settings.DEDUP_ENABLED or not feedback_list:
+        return {
+            "node_calls": state.get('node_calls', 0) + 1
+        }
+
+    # Apply classification limit if set
+    limited = feedback_list
+    if settings.CLASSIFICATION_LIMIT:
+        limited = feedback_list[:settings.CLASSIFICATION_LIMIT]
+
+    clusters = assign_clusters(limited)
+
+    saved_calls = len(limited) - clusters
+    print(f"🧩 Collapsed {len(limited)} items into {clusters} clusters "
+          f"(saves {saved_calls} classifier calls)")
+
+    return {
+        "feedback_items": feedback_list,
+        "node_calls": state.get('node_calls', 0) + 1
+    }
@@ -1,43 +1,49 @@
 """Export node."""
-import pandas as pd
 from datetime import datetime
 
 from src.config.settings import settings
+from src.nodes.load_data_hive import get_month_range
+from src.utils.export_writers import export_rows
+
+
+# Export header -> feedback attribute
+EXPORT_COLUMNS = {
+    'User ID': 'user_id',
+    'Feedback': 'feedback',
+    'Insight Sub Type': 'insight_sub_type',
+    'Insight Type': 'insight_type',
+    'Product Line': 'product_line_name',
+    'Category': 'category',
+    'Rationale': 'rationale',
+    'Cluster Size': 'cluster_size',
+}
 
 
 def export_classified_results(state):
-    """Export classified feedback to Excel file."""
-    
+    """Export classified feedback to one file per format in EXPORT_FORMATS."""
+
     classified_results = state["classified_results"]
-    
+
     # Create output directory if it doesn't exist
     settings.OUTPUT_DIR.mkdir(exist_ok=True)
-    
-    # Convert to DataFrame
-    data = []
-    for item in classified_results:
-        data.append({
-            'User ID': item.user_id,
-            'Feedback': item.feedback,
-            'Insight Sub Type': item.insight_sub_type,
-            'Insight Type': item.insight_type,
-            'Product Line': item.product_line_name,
-            'Category': item.category,
-            'Rationale': item.rationale
-        })
-    
-    df = pd.DataFrame(data)
-    
-    # Generate filename with timestamp
+
+    # Rows are produced lazily and streamed to every writer (works for FeedbackItem and FeedbackRecord rows)
+    attributes = list(EXPORT_COLUMNS.values())
+    rows = (tuple(getattr(item, attribute) for attribute in attributes) for item in classified_results)
+
+    # Generate filename with the analysis month and timestamp, the extension is added per format,
+    # so months exported at the same time by a backfill do not overwrite each other
+    month = get_month_range(state)[0][:7]
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    filename = settings.OUTPUT_DIR / f'classified_feedback_{timestamp}.xlsx'
-    
-    # Export to Excel
-    df.to_excel(filename, index=False)
-    
-    print(f"✅ Exported {len(classified_results)} classified items to: {filename}")
-    
+    stem = settings.OUTPUT_DIR / f'classified_feedback_{month}_{timestamp}'
+
+    paths = export_rows(stem, settings.EXPORT_FORMATS, list(EXPORT_COLUMNS), rows)
+
+    for filename in paths.values():
+        print(f"✅ Exported {len(classified_results)} classified items to: {filename}")
+
     return {
+        "exported_files": [str(path) for path in paths.values()],
         "node_calls": state.get('node_calls', 0) + 1
     }
 
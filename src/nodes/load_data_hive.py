@@ -3,26 +3,31 @@ LangGraph node to load negative feedback data from Hive/Presto database.
 """
 
 import pandas as pd
-from sqlalchemy import create_engine
+from sqlalchemy import String, bindparam, create_engine, text
+from sqlalchemy.sql.elements import TextClause
 import os
+import threading
+from collections import Counter
+from typing import Iterable, Iterator, List, Set, Tuple
 from dotenv import load_dotenv
 
-from src.models import FeedbackItem
+from src.config.settings import settings
+from src.models import FeedbackBatch, FeedbackItem
+from src.utils.feedback_store import feedback_row_hash, open_feedback_store
+from src.utils.text_preprocessing import preprocess_text
+from src.utils.query_cache import read_sql_cached
 
 
-def load_data_from_hive(state):
-    """
-    Load negative feedback comments from Hive/Presto database.
-    
-    Args:
-        state: Current state containing month_analysis and year_analysis
-        
-    Returns:
-        Updated state with feedback_items (List[FeedbackItem]) and classified_results
-    """
+# Engine shared by every load in the process, created on first use
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def create_presto_engine():
+    """Create a pooled SQLAlchemy engine for the Presto/Trino warehouse."""
     # Load environment variables
     load_dotenv()
-    
+
     # Connection parameters
     PRESTO_HOST = "presto-gdc.adp.autodesk.com"
     PRESTO_PORT = 443
@@ -30,90 +35,323 @@ def load_data_from_hive(state):
     PRESTO_PASSWORD = os.getenv("PRESTO_PASSWORD")
     PRESTO_CATALOG = os.getenv("PRESTO_CATALOG", "hive")
     PRESTO_SCHEMA = "desktop_product_intelligence_public"
-    
-    # Get month and year from state
-    current_date = state.get("current_date","2025-09-01")
-    month_analysis = int(current_date.split("-")[1]) - 1  # Subtract 1 to get previous month
-    year_analysis = int(current_date.split("-")[0])   
-    
-    # Build the start date for the query (YYYY-MM-01)
-    start_date = f"{year_analysis}-{month_analysis:02d}-01"
-    
-    print(f"📅 Loading data for: {start_date} (Month {month_analysis}, Year {year_analysis})")
-    
-    try:
-        # Create SQLAlchemy engine
-        connection_string = (
-            f"trino://{PRESTO_USER}:{PRESTO_PASSWORD}@"
-            f"{PRESTO_HOST}:{PRESTO_PORT}/"
-            f"{PRESTO_CATALOG}/{PRESTO_SCHEMA}"
-        )
-        
-        engine = create_engine(connection_string)
-        
-        # Dynamic query using month and year parameters
-        query_comments = f"""
+
+    connection_string = (
+        f"trino://{PRESTO_USER}:{PRESTO_PASSWORD}@"
+        f"{PRESTO_HOST}:{PRESTO_PORT}/"
+        f"{PRESTO_CATALOG}/{PRESTO_SCHEMA}"
+    )
+
+    return create_engine(
+        connection_string,
+        pool_size=settings.HIVE_POOL_SIZE,
+        max_overflow=settings.HIVE_POOL_MAX_OVERFLOW,
+        pool_pre_ping=settings.HIVE_POOL_PRE_PING,
+    )
+
+
+def get_presto_engine():
+    """Return the process-wide engine, so connections are reused across loads."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = create_presto_engine()
+        return _engine
+
+
+def dispose_presto_engine():
+    """Close all pooled connections, e.g. at process shutdown."""
+    global _engine
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+            _engine = None
+
+
+def get_month_range(state) -> Tuple[str, str]:
+    """
+    Start (inclusive) and end (exclusive) dates, YYYY-MM-DD, of the analysis month.
+
+    Uses `analysis_month` (YYYY-MM) from the state when set, otherwise the
+    month before current_date.
+    """
+    analysis_month = state.get("analysis_month")
+    if analysis_month:
+        year_analysis, month_analysis = map(int, analysis_month.split("-")[:2])
+    else:
+        current_date = state.get("current_date","2025-09-01")
+        year_analysis = int(current_date.split("-")[0])
+        month_analysis = int(current_date.split("-")[1])
+        # Previous month, January wraps to December of the previous year
+        if month_analysis == 1:
+            year_analysis, month_analysis = year_analysis - 1, 12
+        else:
+            month_analysis -= 1
+
+    if month_analysis == 12:
+        end_year, end_month = year_analysis + 1, 1
+    else:
+        end_year, end_month = year_analysis, month_analysis + 1
+
+    return f"{year_analysis}-{month_analysis:02d}-01", f"{end_year}-{end_month:02d}-01"
+
+
+def build_comments_query() -> TextClause:
+    """
+    Build the query for the negative feedback comments of one month.
+
+    Filters directly on the `dt` partition string so Presto prunes
+    partitions outside the range; channels, sentiments, product lines,
+    row limit and sorting come from settings.
+
+    Bind parameters:
+        min_dt, end_dt: `dt` partition range as YYYYMMDD (end exclusive),
+            min_dt is the incremental watermark when one is stored
+        delivery_channels, sentiments, product_lines: Value lists for the IN filters
+    """
+    filters = [
+        "dt >= :min_dt",
+        "dt < :end_dt",
+        "delivery_channel IN :delivery_channels",
+        "sentiment IN :sentiments",
+    ]
+    bind_params = [
+        bindparam("delivery_channels", expanding=True, type_=String),
+        bindparam("sentiments", expanding=True, type_=String),
+    ]
+    if settings.HIVE_PRODUCT_LINES:
+        filters.append("product_line_name IN :product_lines")
+        bind_params.append(bindparam("product_lines", expanding=True, type_=String))
+
+    # Incremental runs read oldest first and apply the row limit after
+    # skipping known rows (see limit_new_rows): a LIMIT in SQL would return
+    # the same known rows forever once one dt holds more than the limit
+    order_clause = ""
+    if settings.HIVE_SORT or settings.HIVE_INCREMENTAL:
+        order_clause = f"ORDER BY dt {'ASC' if settings.HIVE_INCREMENTAL else 'DESC'}"
+    limit_clause = ""
+    if settings.HIVE_ROW_LIMIT and not settings.HIVE_INCREMENTAL:
+        limit_clause = f"LIMIT {int(settings.HIVE_ROW_LIMIT)}"
+
+    where_clause = "\n            AND ".join(filters)
+
+    return text(f"""
         SELECT DISTINCT
-            DATE_FORMAT(parsed_date, '%Y-%m-%d') AS date_date,
+            dt,
             user_id,
             translated_comment,
             insight,
             insight_sub_type,
             product_line_name
-        FROM (
-            SELECT 
-                DATE_PARSE(dt, '%Y%m%d') AS parsed_date,
-                user_id,
-                translated_comment,
-                insight,
-                insight_sub_type,
-                product_line_name,
-                delivery_channel,
-                sentiment
-            FROM desktop_product_intelligence_public.halley_feedback_qualtrics_comments
-            WHERE delivery_channel IN ('account_portal', 'email')
-                AND sentiment IN ('Negative', 'Very Negative')
-        ) subquery
-        WHERE parsed_date >= TIMESTAMP '{start_date}'
-            AND parsed_date < DATE_ADD('month', 1, TIMESTAMP '{start_date}')
-        ORDER BY 1 DESC
-        LIMIT 500
-        """
-        
-        # Execute query
+        FROM {settings.HIVE_TABLE}
+        WHERE {where_clause}
+        {order_clause}
+        {limit_clause}
+        """).bindparams(*bind_params)
+
+
+def get_query_params(state) -> Tuple[dict, Set[str]]:
+    """
+    Bind parameters for the comments query and the row hashes to skip.
+
+    In incremental mode the scan starts at the stored watermark `dt`, and
+    rows already in the feedback store are skipped. The watermark partition
+    itself is read again, since it may have grown after the last run.
+    """
+    start_date, end_date = get_month_range(state)
+    params = {
+        "min_dt": start_date.replace("-", ""),
+        "end_dt": end_date.replace("-", ""),
+        "delivery_channels": list(settings.HIVE_DELIVERY_CHANNELS),
+        "sentiments": list(settings.HIVE_SENTIMENTS),
+    }
+    if settings.HIVE_PRODUCT_LINES:
+        params["product_lines"] = list(settings.HIVE_PRODUCT_LINES)
+    known_rows = set()
+
+    print(f"📅 Loading data for: {start_date} to {end_date} (exclusive)")
+
+    if settings.HIVE_INCREMENTAL:
+        store = open_feedback_store()
+        month = start_date[:7]
+        watermark = store.get_watermark(month)
+        known_rows = store.known_hashes(month)
+        store.close()
+
+        if watermark:
+            params["min_dt"] = max(params["min_dt"], watermark)
+        print(f"⏩ Incremental load from dt >= {params['min_dt']} "
+              f"({len(known_rows)} rows already classified this month)")
+
+    return params, known_rows
+
+
+def render_query(query: TextClause, params: dict, engine) -> str:
+    """Render the query with its parameters inlined, for logging and EXPLAIN."""
+    compiled = query.bindparams(**params).compile(engine, compile_kwargs={"literal_binds": True})
+    return str(compiled)
+
+
+def explain_comments_query(state, explain_type: str = "IO") -> str:
+    """
+    Print the generated SQL and the Presto EXPLAIN output for it.
+
+    Args:
+        state: Workflow state selecting the month
+        explain_type: Presto EXPLAIN type; IO lists the partitions and
+            estimated bytes read, DISTRIBUTED shows the full plan
+
+    Returns:
+        The EXPLAIN output
+    """
+    params, _ = get_query_params(state)
+    engine = get_presto_engine()
+    sql = render_query(build_comments_query(), params, engine)
+
+    print(f"📝 Generated SQL:\n{sql}")
+
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(f"EXPLAIN (TYPE {explain_type}) {sql}").fetchall()
+
+    plan = "\n".join(str(row[0]) for row in rows)
+    print(f"🔎 EXPLAIN (TYPE {explain_type}):\n{plan}")
+    return plan
+
+
+def skip_known_rows(feedback_list: List[FeedbackItem], known_rows: Set[str]) -> List[FeedbackItem]:
+    """
+    Drop rows whose hash is already in the feedback store.
+
+    Stored rows hold the preprocessed comment, so a raw row that is not
+    found is looked up again with its comment preprocessed.
+    """
+    if not known_rows:
+        return feedback_list
+
+    def is_known(feedback) -> bool:
+        if feedback_row_hash(feedback) in known_rows:
+            return True
+        if not settings.PREPROCESS_ENABLED:
+            return False
+        text = preprocess_text(feedback.feedback, settings.PREPROCESS_MAX_CHARS or 0, Counter())
+        return feedback_row_hash(feedback, text) in known_rows
+
+    return [feedback for feedback in feedback_list if not is_known(feedback)]
+
+
+def limit_new_rows(chunks: Iterable[List[FeedbackItem]], known_rows: Set[str]) -> Iterator[List[FeedbackItem]]:
+    """
+    Skip known rows and stop after HIVE_ROW_LIMIT new ones.
+
+    Incremental mode only. The rows come oldest first, so rows cut by the
+    limit are at or after the last kept `dt` and the next run, starting
+    from the watermark, fetches them again.
+    """
+    limit = settings.HIVE_ROW_LIMIT
+    kept = 0
+    for chunk in chunks:
+        chunk = skip_known_rows(chunk, known_rows)
+        if limit:
+            chunk = chunk[:limit - kept]
+        kept += len(chunk)
+        yield chunk
+        if limit and kept >= limit:
+            return
+
+
+EMPTY_DEFAULTS = {
+    'user_id': 'EMPTY_USER_ID',
+    'feedback': 'EMPTY_FEEDBACK',
+    'insight_sub_type': 'EMPTY_INSIGHT_SUB_TYPE',
+    'insight_type': 'EMPTY_INSIGHT_TYPE',
+    'product_line_name': 'EMPTY_PRODUCT_LINE_NAME',
+}
+
+
+def to_feedback_items(df_comments: pd.DataFrame) -> List[FeedbackItem]:
+    """Convert query rows to FeedbackItem objects (compact records when enabled)."""
+    if settings.COMPACT_FEEDBACK_RECORDS:
+        return FeedbackBatch.from_columns(
+            {
+                'dt': df_comments['dt'] if 'dt' in df_comments else None,
+                'user_id': df_comments['user_id'],
+                'feedback': df_comments['translated_comment'],
+                'insight_sub_type': df_comments['insight_sub_type'],
+                'insight_type': df_comments['insight'],
+                'product_line_name': df_comments['product_line_name'],
+            },
+            defaults=EMPTY_DEFAULTS,
+        )
+
+    return [
+        FeedbackItem(
+            dt=row.get('dt'),
+            user_id=row['user_id'] or 'EMPTY_USER_ID',
+            feedback=row['translated_comment'] or 'EMPTY_FEEDBACK',
+            insight_sub_type=row['insight_sub_type'] or 'EMPTY_INSIGHT_SUB_TYPE',
+            insight_type=row['insight'] or 'EMPTY_INSIGHT_TYPE',
+            product_line_name=row['product_line_name'] or 'EMPTY_PRODUCT_LINE_NAME'
+        )
+        for row in df_comments.to_dict('records')
+    ]
+
+
+def stream_feedback_items(engine, query, chunksize: int, params: dict = None) -> Iterator[List[FeedbackItem]]:
+    """
+    Fetch query results in chunks of FeedbackItem objects.
+
+    Uses a server-side cursor, so only one chunk of rows is held in memory
+    at a time regardless of how many rows the query returns.
+    """
+    with engine.connect().execution_options(stream_results=True) as connection:
+        for df_chunk in pd.read_sql(query, connection, params=params, chunksize=chunksize):
+            yield to_feedback_items(df_chunk)
+
+
+def load_data_from_hive(state):
+    """
+    Load negative feedback comments from Hive/Presto database.
+
+    Args:
+        state: Current state containing current_date (and optionally analysis_month)
+
+    Returns:
+        Updated state with feedback_items (List[FeedbackItem]) and classified_results
+    """
+    try:
+        # Bind parameters for the month (and watermark in incremental mode)
+        params, known_rows = get_query_params(state)
+
+        # Pooled engine, reused across loads
+        engine = get_presto_engine()
+
+        # Execute query, incremental loads always go to the warehouse for fresh rows
         print("🔍 Executing query to fetch negative feedback comments...")
-        df_comments = pd.read_sql(query_comments, engine)
-        
-        # Clean up connection
-        engine.dispose()
-        
+        if settings.HIVE_INCREMENTAL:
+            df_comments = pd.read_sql(build_comments_query(), engine, params=params)
+        else:
+            df_comments = read_sql_cached(build_comments_query(), engine, params=params)
+
         print(f"✅ Successfully fetched {len(df_comments)} rows")
-        print(f"Date range: {df_comments['date_date'].min()} to {df_comments['date_date'].max()}")
+        print(f"Date range: {df_comments['dt'].min()} to {df_comments['dt'].max()}")
         print(f"Unique users: {df_comments['user_id'].nunique()}")
-        
-      
-        
+
+
+
     except Exception as e:
         error_msg = f"Failed to load data from Hive: {str(e)}"
         print(f"❌ {error_msg}")
-        
+
         # Return empty state on error
         return {
             "feedback_items": [],
             "classified_results": []
         }
-    
+
     # Convert DataFrame to list of FeedbackItem objects
-    feedback_list = [
-        FeedbackItem(
-            user_id=row['user_id'] or 'EMPTY_USER_ID',
-            feedback=row['translated_comment'] or 'EMPTY_FEEDBACK',
-            insight_sub_type=row['insight_sub_type'] or 'EMPTY_INSIGHT_SUB_TYPE',
-            insight_type=row['insight'] or 'EMPTY_INSIGHT_TYPE',
-            product_line_name=row['product_line_name'] or 'EMPTY_PRODUCT_LINE_NAME'
-        )
-        for row in df_comments.to_dict('records')
-    ]
+    feedback_list = to_feedback_items(df_comments)
+    if settings.HIVE_INCREMENTAL:
+        feedback_list = [feedback for chunk in limit_new_rows([feedback_list], known_rows) for feedback in chunk]
 
     print(f"✅ Converted to {len(feedback_list)} feedback items")
 
@@ -0,0 +1,47 @@
+"""Node merging newly classified feedback with the local feedback store."""
+from src.config.settings import settings
+from src.nodes.deduplicate import assign_clusters
+from src.nodes.load_data_hive import get_month_range
+from src.utils.feedback_store import feedback_row_hash, open_feedback_store
+
+
+def merge_with_feedback_store(state):
+    """
+    Persist newly classified items and merge in those classified by earlier runs.
+
+    Only used in incremental mode. The watermark advances past every stored
+    row; rows that were fetched but not classified (failures or beyond
+    CLASSIFICATION_LIMIT) hold it back so the next run fetches them again.
+    """
+    start_date, _ = get_month_range(state)
+    month = start_date[:7]
+    new_items = state["classified_results"]
+    fetched_items = state["feedback_items"]
+
+    store = open_feedback_store()
+    saved = store.save(month, new_items)
+
+    stored_rows = {feedback_row_hash(feedback) for feedback in new_items if feedback.category is not None}
+    pending = [feedback for feedback in fetched_items if feedback_row_hash(feedback) not in stored_rows]
+    if pending:
+        watermark = min((feedback.dt for feedback in pending if feedback.dt), default=None)
+    else:
+        watermark = max((feedback.dt for feedback in fetched_items if feedback.dt), default=None)
+    if watermark:
+        store.set_watermark(month, watermark)
+
+    previous_items = store.load(month, exclude={feedback_row_hash(feedback) for feedback in new_items})
+    store.close()
+
+    # Recluster the whole month so the report sees month-wide cluster sizes
+    if settings.DEDUP_ENABLED and previous_items:
+        assign_clusters(new_items + previous_items)
+
+    print(f"🗄️  Stored {saved} newly classified items, merged {len(previous_items)} "
+          f"from earlier runs (watermark dt {watermark or 'unchanged'})")
+
+    # classified_results uses an add reducer, so returning the previous items appends them
+    return {
+        "classified_results": previous_items,
+        "node_calls": state.get('node_calls', 0) + 1
+    }
@@ -0,0 +1,23 @@
+"""Text preprocessing node."""
+from src.utils.text_preprocessing import preprocess_texts, print_preprocessing_summary
+
+
+def preprocess_feedback(state):
+    """Normalize, redact and length-cap the comments before they are deduplicated and classified."""
+
+    feedback_list = state["feedback_items"]
+
+    if not feedback_list:
+        return {
+            "node_calls": state.get('node_calls', 0) + 1
+        }
+
+    texts, counts = preprocess_texts([feedback.feedback for feedback in feedback_list])
+    for feedback, text in zip(feedback_list, texts):
+        feedback.feedback = text
+    print_preprocessing_summary(counts, len(feedback_list))
+
+    return {
+        "feedback_items": feedback_list,
+        "node_calls": state.get('node_calls', 0) + 1
+    }
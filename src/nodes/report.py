@@ -1,77 +1,367 @@
 """Report generation node."""
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional
 
-from src.agents import create_reporter_agent
-from src.models import FeedbackItem
+from src.agents import create_rationale_agent, create_reporter_agent
+from src.config.settings import settings
+from src.models import FEEDBACK_CATEGORIES, FeedbackItem
+from src.utils import Lazy, compute_insight_stats, llm_scheduler, single_line
 
 
-# Create agent instance once
-reporter_agent = create_reporter_agent()
+# Agent instances, created once on first use
+reporter_agent = Lazy(create_reporter_agent)
+report_summarizer = Lazy(lambda: create_reporter_agent(chunk=True))
+rationale_writer = Lazy(create_rationale_agent)
+
+
+class ReportLine(NamedTuple):
+    """One line of a report section: a comment or a summary of several comments."""
+    text: str
+    comments: int
+    summary: bool = False
+    comment: Optional[FeedbackItem] = None  # Item of a comment line, so its rationale can be added later
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a prompt fragment."""
+    return len(text) // settings.CHARS_PER_TOKEN + 1
+
+
+def format_feedback_line(comment: FeedbackItem) -> str:
+    """Create the compact line of one comment, without a rationale if it has none yet (compact mode)."""
+    rationale = f"Rationale: {comment.rationale} | " if comment.rationale else ""
+    return (
+        f"[User: {comment.user_id}] | "
+        f"Product: {comment.product_line_name} | "
+        f"Insight type: {comment.insight_type} | "
+        f"Insight name: {comment.insight_sub_type} | "
+        f"Feedback: \"{single_line(comment.feedback)}\" | "
+        f"{rationale}"
+        f"Similar comments: {comment.cluster_size}"
+    )
+
+
+def format_feedback_lines(comments: List[FeedbackItem]) -> List[ReportLine]:
+    """Create compact lines for the LLM, listing each near-duplicate cluster once."""
+    lines = []
+    seen_clusters = set()
+    for comment in comments:
+        if comment.cluster_id is not None:
+            if comment.cluster_id in seen_clusters:
+                continue
+            seen_clusters.add(comment.cluster_id)
+        lines.append(ReportLine(format_feedback_line(comment), comment.cluster_size, comment=comment))
+    return lines
+
+
+def number_lines(lines: List[ReportLine]) -> str:
+    """Render lines as a numbered list."""
+    return "\n".join(f"{i}. {line.text}" for i, line in enumerate(lines, 1))
+
+
+# Stats column -> table header
+INSIGHT_TABLE_COLUMNS = {
+    'insight_sub_type': 'Insight name',
+    'comments': 'Comments',
+    'users': 'Users',
+}
+PRODUCT_LINE_TABLE_COLUMNS = {
+    'insight_sub_type': 'Insight name',
+    'product_line_name': 'Product',
+    'comments': 'Comments',
+    'users': 'Users',
+}
+
+
+def format_stats_table(rows: List[dict], columns: Dict[str, str]) -> str:
+    """Render the top REPORT_TOP_INSIGHTS stats rows as a markdown table."""
+    shown = rows[:settings.REPORT_TOP_INSIGHTS]
+    lines = [
+        "| " + " | ".join(columns.values()) + " |",
+        "|" + "---|" * len(columns),
+    ]
+    lines.extend("| " + " | ".join(str(row[column]) for column in columns) + " |" for row in shown)
+    if len(rows) > len(shown):
+        lines.append(f"_{len(rows) - len(shown)} more groups not shown_")
+    return "\n".join(lines)
+
+
+def format_category_stats(category: str, stats: Dict[str, List[dict]]) -> str:
+    """Aggregate tables of one category: top insights, and per product line for aggregated categories."""
+    insights = [row for row in stats['by_insight'] if row['category'] == category]
+    if not insights:
+        return ""
+    tables = [f"Top insights:\n{format_stats_table(insights, INSIGHT_TABLE_COLUMNS)}"]
+    if category in settings.REPORT_AGGREGATED_CATEGORIES:
+        product_lines = [row for row in stats['by_product_line'] if row['category'] == category]
+        tables.append(f"Comments per insight and product line:\n{format_stats_table(product_lines, PRODUCT_LINE_TABLE_COLUMNS)}")
+    return "\n\n".join(tables)
+
+
+def build_report_message(current_date: str, stats: Dict[str, List[dict]], sections: Dict[str, List[ReportLine]]) -> str:
+    """
+    Build the input message for the reporter, one section per category.
+
+    Each section starts with the exact aggregate counts of the category;
+    categories without lines in `sections` are sent as counts only.
+    """
+    totals = {row['category']: row for row in stats['by_category']}
+
+    def format_section(category: str) -> str:
+        total = totals.get(category, {'comments': 0, 'users': 0})
+        body = "\n\n".join(part for part in (
+            format_category_stats(category, stats),
+            number_lines(sections[category]) if sections.get(category) else "",
+        ) if part)
+        return f"""
+    ## {category} ({total['comments']} comments from {total['users']} users)
+    {body or "None"}
+"""
+
+    formatted_sections = "".join(format_section(category) for category in FEEDBACK_CATEGORIES)
+    return f"""
+    # CLASSIFIED USER FEEDBACK REPORT
+    **Report Date:** {current_date}
+{formatted_sections}
+    ---
+    Please analyze this feedback and create the prioritized report as instructed.
+    """
+
+
+def chunk_lines(lines: List[ReportLine], budget: int) -> List[List[ReportLine]]:
+    """Split lines into consecutive chunks of at most `budget` estimated tokens."""
+    chunks, current, size = [], [], 0
+    for line in lines:
+        tokens = estimate_tokens(line.text)
+        if current and size + tokens > budget:
+            chunks.append(current)
+            current, size = [], 0
+        current.append(line)
+        size += tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def summarize_chunk(category: str, chunk: List[ReportLine]) -> List[ReportLine]:
+    """
+    Map step: condense a chunk into its most urgent comments plus one summary line.
+
+    If the request fails, the chunk's largest clusters are kept and the
+    rest is only counted, so one timeout does not abort the report.
+    """
+    keep = settings.REPORT_CHUNK_SELECTED
+    content = (
+        f"## {category}\n{number_lines(chunk)}\n\n"
+        f"Select at most {keep} lines."
+    )
+    inputs = {"messages": [{"role": "user", "content": content}]}
+
+    try:
+        response = report_summarizer.get().invoke(inputs)["structured_response"]
+    except Exception as e:
+        print(f"⚠️ Failed to summarize a {category} chunk: {str(e)}")
+        llm_scheduler.add_dead_letter("report_summarizer", content, e)
+        selected = sorted(chunk, key=lambda line: line.comments, reverse=True)[:keep]
+        summary = "Not available, summarizing these comments failed."
+    else:
+        selected = []
+        for number in response.selected:
+            if 1 <= number <= len(chunk) and chunk[number - 1] not in selected:
+                selected.append(chunk[number - 1])
+        selected = selected[:keep]
+        summary = response.summary
+
+    summarized = sum(line.comments for line in chunk if line not in selected)
+    if summarized:
+        selected.append(ReportLine(f"Summary of {summarized} comments: {summary}", summarized, summary=True))
+    return selected
+
+
+def fit_to_budget(lines: List[ReportLine], budget: int) -> List[ReportLine]:
+    """Keep the leading lines that fit in the budget (at least one)."""
+    kept, size = [], 0
+    for line in lines:
+        size += estimate_tokens(line.text)
+        if kept and size > budget:
+            break
+        kept.append(line)
+    return kept
+
+
+def truncate_line(line: ReportLine, budget: int) -> ReportLine:
+    """Shorten a line to at most `budget` estimated tokens."""
+    max_chars = max(1, budget - 1) * settings.CHARS_PER_TOKEN
+    if len(line.text) <= max_chars:
+        return line
+    return line._replace(text=line.text[:max_chars - 1] + "…")
+
+
+def reduce_sections(sections: Dict[str, List[ReportLine]]) -> Dict[str, List[ReportLine]]:
+    """
+    Condense every section until it fits its share of REPORT_TOKEN_BUDGET.
+
+    Each level ranks the lines of the oversized sections (most widespread
+    comments first), splits them into chunks of the token budget and
+    summarizes up to REPORT_MAX_CHUNKS chunks per section in parallel; lines
+    beyond those chunks are only counted, so requests and tokens stay
+    bounded however large the month is. The selected comments and summaries
+    of one level are the input of the next. Lines longer than a section's
+    share are truncated, and a level that does not shrink a section keeps
+    only what fits, so every section fits after a bounded number of levels.
+    """
+    budget = settings.REPORT_TOKEN_BUDGET
+    section_budget = budget // len(sections)
+
+    def section_tokens(lines: List[ReportLine]) -> int:
+        return sum(estimate_tokens(line.text) for line in lines)
+
+    def rank(lines: List[ReportLine]) -> List[ReportLine]:
+        # Most widespread comments first, summaries last
+        return sorted(lines, key=lambda line: (line.summary, -line.comments))
+
+    sections = {
+        category: [truncate_line(line, section_budget) for line in lines]
+        for category, lines in sections.items()
+    }
+    level = 0
+    with ThreadPoolExecutor(max_workers=max(1, settings.REPORT_MAP_CONCURRENCY)) as executor:
+        while True:
+            oversized = [category for category, lines in sections.items() if section_tokens(lines) > section_budget]
+            if not oversized:
+                return sections
+
+            level += 1
+            jobs = []
+            reduced = {category: [] for category in oversized}
+            for category in oversized:
+                chunks = chunk_lines(rank(sections[category]), budget)
+                jobs.extend((category, chunk) for chunk in chunks[:settings.REPORT_MAX_CHUNKS])
+
+                skipped = sum(line.comments for chunk in chunks[settings.REPORT_MAX_CHUNKS:] for line in chunk)
+                if skipped:
+                    reduced[category].append(ReportLine(
+                        f"Summary of {skipped} comments: not reviewed individually, "
+                        f"each was reported by fewer users than the comments above.",
+                        skipped,
+                        summary=True,
+                    ))
+
+            for (category, _), lines in zip(jobs, executor.map(lambda job: summarize_chunk(*job), jobs)):
+                reduced[category].extend(lines)
+
+            for category in oversized:
+                lines = rank([truncate_line(line, section_budget) for line in reduced[category]])
+                if section_tokens(lines) >= section_tokens(sections[category]):
+                    # No progress (a few very long comments), keep what fits
+                    lines = fit_to_budget(lines, section_budget)
+                sections[category] = lines
+
+            print(f"🗜️ Report level {level}: summarized {len(jobs)} chunks of {', '.join(oversized)}")
+
+
+def write_rationales(category: str, comments: List[FeedbackItem]) -> int:
+    """
+    Write the rationales of classified comments in place with one request.
+
+    If the request fails, the comments are reported without a rationale.
+
+    Returns:
+        The number of comments that got a rationale
+    """
+    content = "\n".join(f"[{i}] ({category}) {single_line(comment.feedback)}" for i, comment in enumerate(comments))
+    inputs = {"messages": [{"role": "user", "content": content}]}
+
+    try:
+        response = rationale_writer.get().invoke(inputs)["structured_response"]
+    except Exception as e:
+        print(f"⚠️ Failed to write rationales for {category}: {str(e)}")
+        llm_scheduler.add_dead_letter("rationale", content, e)
+        return 0
+
+    written = 0
+    for entry in response.rationales:
+        if 0 <= entry.index < len(comments) and not comments[entry.index].rationale and entry.rationale:
+            comments[entry.index].rationale = entry.rationale
+            written += 1
+    return written
+
+
+def explain_report_candidates(sections: Dict[str, List[ReportLine]]) -> Dict[str, List[ReportLine]]:
+    """
+    Add rationales to the comments that reach the reporter, for label-only (compact) classifications.
+
+    Only the REPORT_RATIONALE_CANDIDATES most widespread comments per section
+    without a rationale are explained, one request per section in parallel;
+    the other lines are sent as they are.
+    """
+    candidates = {}
+    for category, lines in sections.items():
+        missing = [line for line in lines if line.comment is not None and not line.comment.rationale]
+        missing.sort(key=lambda line: -line.comments)
+        if missing[:settings.REPORT_RATIONALE_CANDIDATES]:
+            candidates[category] = [line.comment for line in missing[:settings.REPORT_RATIONALE_CANDIDATES]]
+    if not candidates:
+        return sections
+
+    with ThreadPoolExecutor(max_workers=max(1, settings.REPORT_MAP_CONCURRENCY)) as executor:
+        written = sum(executor.map(lambda category: write_rationales(category, candidates[category]), candidates))
+    requested = sum(len(comments) for comments in candidates.values())
+    print(f"💬 Wrote rationales for {written} of {requested} report candidates in {len(candidates)} requests")
+
+    return {
+        category: [
+            line._replace(text=format_feedback_line(line.comment)) if line.comment is not None else line
+            for line in lines
+        ]
+        for category, lines in sections.items()
+    }
 
 
 def create_report(state) -> dict:
     """Generate prioritized report from classified feedback."""
-    
+
     classified_comments = state["classified_results"]
     current_date = state.get("current_date","2025-09-01")
-    
+
     # 1. Pre-process: Group by category
-    categorized = {
-        "Technical Issues": [],
-        "Content Issues": [],
-        "Rude Feedback": [],
-        "Other": []
-    }
-    
+    categorized = {category: [] for category in FEEDBACK_CATEGORIES}
+
     for comment in classified_comments:
         if comment.category in categorized:
             categorized[comment.category].append(comment)
-    
-    # 2. Format feedback concisely for the LLM
-    def format_feedback_list(comments: List[FeedbackItem]) -> str:
-        """Create compact format for LLM."""
-        formatted = []
-        for i, comment in enumerate(comments, 1):
-            formatted.append(
-                f"{i}. [User: {comment.user_id}] | "
-                f"Product: {comment.product_line_name} | "
-                f"Insight type: {comment.insight_type} | "
-                f"Insight name: {comment.insight_sub_type} | "
-                f"Feedback: \"{comment.feedback}\" | "
-                f"Rationale: {comment.rationale}"
-            )
-        return "\n".join(formatted)
-    
-    # 3. Build the input message for the LLM
-    input_message = f"""
-    # CLASSIFIED USER FEEDBACK REPORT
-    **Report Date:** {current_date}
-
-    ## Technical Issues ({len(categorized['Technical Issues'])} comments)
-    {format_feedback_list(categorized['Technical Issues']) if categorized['Technical Issues'] else "None"}
-
-    ## Content Issues ({len(categorized['Content Issues'])} comments)
-    {format_feedback_list(categorized['Content Issues']) if categorized['Content Issues'] else "None"}
 
-    ## Rude Feedback ({len(categorized['Rude Feedback'])} comments)
-    {format_feedback_list(categorized['Rude Feedback']) if categorized['Rude Feedback'] else "None"}
+    # 2. Format feedback concisely for the LLM, aggregated categories are sent as counts only
+    stats = state.get("insight_stats") or compute_insight_stats(classified_comments)
+    sections = {
+        category: format_feedback_lines(comments)
+        for category, comments in categorized.items()
+        if category not in settings.REPORT_AGGREGATED_CATEGORIES
+    }
 
-    ## Other ({len(categorized['Other'])} comments)
-    {format_feedback_list(categorized['Other']) if categorized['Other'] else "None"}
+    # 3. Build the input message for the LLM, condensing months that do not fit in one prompt
+    input_message = build_report_message(current_date, stats, sections)
+    if settings.REPORT_MAP_REDUCE and sections and estimate_tokens(input_message) > settings.REPORT_TOKEN_BUDGET:
+        print(f"📚 Report input of ~{estimate_tokens(input_message)} tokens exceeds the budget, summarizing in chunks...")
+        sections = reduce_sections(sections)
+        input_message = build_report_message(current_date, stats, sections)
+    if settings.CLASSIFIER_COMPACT:
+        # Label-only classifications: explain just the comments that made it into the report input
+        sections = explain_report_candidates(sections)
+        input_message = build_report_message(current_date, stats, sections)
 
-    ---
-    Please analyze this feedback and create the prioritized report as instructed.
-    """
-    
     # 4. Call the reporter agent with structured output
     inputs = {"messages": [{"role": "user", "content": input_message}]}
-    response = reporter_agent.invoke(inputs)
-    
+    try:
+        response = reporter_agent.get().invoke(inputs)
+    except Exception as e:
+        llm_scheduler.add_dead_letter("reporter", input_message, e)
+        raise
+
     print("✅ Report generated successfully!")
-    
+
     # 5. Return the report
     return {
         "final_report": response,
         "node_calls": state.get('node_calls', 0) + 1
     }
-
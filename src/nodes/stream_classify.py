@@ -0,0 +1,195 @@
+"""Streaming node that classifies Hive rows chunk by chunk while they are fetched."""
+import queue
+import threading
+from collections import Counter
+from typing import Iterator, List, Optional
+
+from src.config.settings import settings
+from src.models import FeedbackItem
+from src.nodes.classify import classify_items, fan_out, print_classification_summary
+from src.utils import ClassificationProgress, NearDuplicateIndex, open_classification_progress
+from src.utils.text_preprocessing import preprocess_texts, print_preprocessing_summary
+from src.nodes.load_data_hive import (
+    build_comments_query,
+    get_presto_engine,
+    get_query_params,
+    limit_new_rows,
+    stream_feedback_items,
+)
+
+
+_DONE = object()
+
+
+def prefetch(chunks: Iterator[List[FeedbackItem]], depth: int) -> Iterator[List[FeedbackItem]]:
+    """
+    Pull chunks on a background thread, keeping at most `depth` chunks buffered.
+
+    The fetch of the next chunks overlaps with the classification of the
+    current one, and a full buffer pauses the fetch so memory stays bounded.
+    """
+    buffer = queue.Queue(maxsize=max(1, depth))
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def producer():
+        try:
+            for chunk in chunks:
+                if not put(chunk):
+                    return
+            put(_DONE)
+        except Exception as e:
+            put(e)
+        finally:
+            if hasattr(chunks, "close"):
+                chunks.close()
+
+    thread = threading.Thread(target=producer, daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+def classify_stream(
+    chunks: Iterator[List[FeedbackItem]],
+    feedback_list: List[FeedbackItem],
+    progress: Optional[ClassificationProgress] = None,
+) -> Counter:
+    """
+    Cluster and classify each chunk as it arrives.
+
+    Near-duplicates are clustered across chunks: an item whose cluster was
+    classified in an earlier chunk takes over that classification without
+    an LLM call. Classified items are appended to `feedback_list` as they
+    complete, so the caller keeps partial results if the stream fails.
+
+    Args:
+        chunks: Feedback items in chunks, as fetched
+        feedback_list: Receives the classified items
+        progress: If given, items classified before an interruption of the
+            run are restored and new classifications are saved per chunk
+
+    Returns:
+        Classification counters summed over all chunks
+    """
+    stats = Counter()
+    preprocessing = Counter()
+    index = NearDuplicateIndex(
+        threshold=settings.DEDUP_SIMILARITY_THRESHOLD,
+        num_perm=settings.DEDUP_NUM_PERM,
+        shingle_size=settings.DEDUP_SHINGLE_SIZE,
+    ) if settings.DEDUP_ENABLED else None
+    cluster_sizes = Counter()
+
+    try:
+        for chunk_number, chunk in enumerate(prefetch(chunks, settings.HIVE_PREFETCH_CHUNKS), 1):
+            # Apply classification limit if set
+            if settings.CLASSIFICATION_LIMIT:
+                chunk = chunk[:settings.CLASSIFICATION_LIMIT - len(feedback_list)]
+
+            if settings.PREPROCESS_ENABLED:
+                texts, counts = preprocess_texts([feedback.feedback for feedback in chunk])
+                for feedback, text in zip(chunk, texts):
+                    feedback.feedback = text
+                preprocessing += counts
+
+            pending = chunk
+            if index:
+                # Cluster IDs are positions in feedback_list, so earlier chunks can be looked up
+                start = len(feedback_list)
+                for feedback, cluster_id in zip(chunk, index.add([feedback.feedback for feedback in chunk])):
+                    feedback.cluster_id = cluster_id
+                    cluster_sizes[cluster_id] += 1
+
+                known = [
+                    feedback for feedback in chunk
+                    if feedback.cluster_id < start and feedback_list[feedback.cluster_id].category is not None
+                ]
+                for feedback in known:
+                    fan_out(feedback_list[feedback.cluster_id], [feedback])
+                if known and progress:
+                    progress.save(known)
+                stats["clustered"] += len(known)
+                stats["classified"] += len(known)
+                pending = [feedback for feedback in chunk if feedback.category is None]
+
+            if progress:
+                restored = progress.restore(pending)
+                stats["resumed"] += len(pending) - len(restored)
+                stats["classified"] += len(pending) - len(restored)
+                pending = restored
+
+            stats += classify_items(pending, progress)
+            feedback_list.extend(chunk)
+            print(f"🌊 Chunk {chunk_number}: classified {len(chunk)} items ({len(feedback_list)} total)")
+
+            if settings.CLASSIFICATION_LIMIT and len(feedback_list) >= settings.CLASSIFICATION_LIMIT:
+                break
+    finally:
+        # Clusters grow across chunks, so earlier members get their final size last
+        if index:
+            for feedback in feedback_list:
+                feedback.cluster_size = cluster_sizes[feedback.cluster_id]
+
+    if settings.PREPROCESS_ENABLED:
+        print_preprocessing_summary(preprocessing, len(feedback_list))
+    return stats
+
+
+def load_and_classify_from_hive(state):
+    """
+    Stream negative feedback from Hive/Presto and classify it chunk by chunk.
+
+    Replaces load_data_from_hive, deduplicate_feedback and classify_comments
+    when HIVE_STREAMING is enabled, so the LLM starts working on the first
+    chunk while the rest of the month is still being fetched. A failure
+    mid-stream fails the node, classifications saved so far are restored
+    when the run is resumed.
+    """
+    feedback_list = []
+
+    print("🔍 Streaming negative feedback comments...")
+    params, known_rows = get_query_params(state)
+    chunks = stream_feedback_items(
+        get_presto_engine(), build_comments_query(), settings.HIVE_CHUNK_SIZE, params
+    )
+    if settings.HIVE_INCREMENTAL:
+        chunks = limit_new_rows(chunks, known_rows)
+    run_id = state.get("run_id")
+    progress = open_classification_progress(run_id) if settings.CHECKPOINT_ENABLED and run_id else None
+    try:
+        stats = classify_stream(chunks, feedback_list, progress)
+    except Exception as e:
+        # A partial month must not be exported or reported; the failed node
+        # is rerun on resume and restores the saved classifications
+        print(f"❌ Failed to load data from Hive: {str(e)}")
+        if progress:
+            print(f"   {len(feedback_list)} items classified before the failure are saved, rerun to resume")
+        raise
+    finally:
+        if progress:
+            progress.close()
+    print_classification_summary(stats)
+
+    return {
+        "feedback_items": feedback_list,
+        "classified_results": list(feedback_list),
+        "node_calls": state.get('node_calls', 0) + 1
+    }
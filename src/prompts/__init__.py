@@ -1,7 +1,24 @@
 """Prompt templates for agents."""
 
-from .classifier_prompt import CLASSIFIER_PROMPT
-from .reporter_prompt import REPORTER_PROMPT
-
-__all__ = ["CLASSIFIER_PROMPT", "REPORTER_PROMPT"]
+from .classifier_prompt import (
+    CLASSIFIER_PROMPT,
+    CLASSIFIER_BATCH_PROMPT,
+    CLASSIFIER_SCORED_PROMPT,
+    CLASSIFIER_SCORED_BATCH_PROMPT,
+    CLASSIFIER_LABEL_BATCH_PROMPT,
+    CLASSIFIER_SCORED_LABEL_BATCH_PROMPT,
+    RATIONALE_PROMPT,
+)
+from .reporter_prompt import REPORTER_PROMPT, REPORT_CHUNK_PROMPT
 
+__all__ = [
+    "CLASSIFIER_PROMPT",
+    "CLASSIFIER_BATCH_PROMPT",
+    "CLASSIFIER_SCORED_PROMPT",
+    "CLASSIFIER_SCORED_BATCH_PROMPT",
+    "CLASSIFIER_LABEL_BATCH_PROMPT",
+    "CLASSIFIER_SCORED_LABEL_BATCH_PROMPT",
+    "RATIONALE_PROMPT",
+    "REPORTER_PROMPT",
+    "REPORT_CHUNK_PROMPT",
+]
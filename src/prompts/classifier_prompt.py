@@ -1,16 +1,17 @@
 """Classifier agent prompt."""
 
-CLASSIFIER_PROMPT = """
-You are a feedback classification agent. Your task is to categorize user feedback messages about Insights recommendations into one of four categories.
-
-Description of an Insight:
+# Shared by the classifier and the rationale writer, so explanations use the
+# same category definitions the labels were assigned with
+INSIGHT_DESCRIPTION = """Description of an Insight:
 An Insight is a card that contains the following elements:
 Primary Text: Text containing the title of the recommendation.
 Secondary Text: Text containing the recommendation the user is encouraged to follow.
 Image or Video: An image or video that accompanies the recommendation to enhance the user experience.
 1-2 Calls to Action: Each card contains one to two buttons that take the user to external help or interest sites following the recommendation in the Secondary Text.
+"""
+
 
-Categories:
+CATEGORY_DEFINITIONS = """Categories:
 
 Content Issues - Problems with the Insights content itself, including:
 - Irrelevant content for the user in the Insight
@@ -31,11 +32,66 @@ Rude Feedback - Messages that are:
 - Provide no actionable feedback
 
 Other - Any feedback that doesn't fit the above categories
+"""
+
+
+CATEGORY_NOTES = """IMPORTANT:
+- The Technical Issues category is only for problems with the Insight or its components, not a feature or the product.
+"""
+
+
+CLASSIFIER_PROMPT = f"""
+You are a feedback classification agent. Your task is to categorize user feedback messages about Insights recommendations into one of four categories.
 
+{INSIGHT_DESCRIPTION}
+{CATEGORY_DEFINITIONS}
 Instructions:
 Read the user's feedback message and respond with exactly one category name: "Technical Issues", "Content Issues", "Rude Feedback", or "Other". Do not include any explanation or additional text in your response.
 
-IMPORTANT:
-- The Technical Issues category is only for problems with the Insight or its components, not a feature or the product.
+{CATEGORY_NOTES}"""
+
+
+CLASSIFIER_BATCH_PROMPT = CLASSIFIER_PROMPT + """
+Batch Instructions:
+You will receive several feedback messages, each prefixed with its index in square brackets, e.g. "[0] The link is broken".
+Classify every message independently using the categories above and return exactly one classification per message.
+Each classification must include the message index, the category name and a short rationale.
 """
 
+
+CONFIDENCE_INSTRUCTIONS = """
+Confidence Instructions:
+Also return a confidence between 0 and 1 for every classification: close to 1 when the feedback clearly matches
+one category, 0.5 or lower when it is ambiguous, could fit several categories or you are unsure.
+Low-confidence feedback is sent to a larger model, so do not overstate your confidence.
+"""
+
+
+CLASSIFIER_SCORED_PROMPT = CLASSIFIER_PROMPT + CONFIDENCE_INSTRUCTIONS
+
+
+CLASSIFIER_SCORED_BATCH_PROMPT = CLASSIFIER_BATCH_PROMPT + CONFIDENCE_INSTRUCTIONS
+
+
+CLASSIFIER_LABEL_BATCH_PROMPT = CLASSIFIER_PROMPT + """
+Batch Instructions:
+You will receive several feedback messages, each prefixed with its index in square brackets, e.g. "[0] The link is broken".
+Classify every message independently using the categories above and return exactly one classification per message.
+Each classification must include only the message index and the category name, no rationale.
+"""
+
+
+CLASSIFIER_SCORED_LABEL_BATCH_PROMPT = CLASSIFIER_LABEL_BATCH_PROMPT + CONFIDENCE_INSTRUCTIONS
+
+
+RATIONALE_PROMPT = f"""
+You explain classifications of user feedback messages about Insights recommendations.
+
+{INSIGHT_DESCRIPTION}
+{CATEGORY_DEFINITIONS}
+{CATEGORY_NOTES}
+Instructions:
+You will receive several feedback messages that were already classified, each prefixed with its index and category,
+e.g. "[0] (Technical Issues) The link is broken". Do not change the categories. For every message return one short
+sentence explaining why it belongs to its category, naming the concrete problem the user reports.
+"""
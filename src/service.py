@@ -0,0 +1,359 @@
+"""Service entry point: classify feedback continuously over local HTTP and report each month on a schedule."""
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from pydantic import ValidationError
+
+from src.backfill import report_date
+from src.config.settings import settings
+from src.models import FeedbackItem
+from src.nodes import (
+    aggregate_feedback,
+    classify,
+    create_report,
+    export_classified_results,
+    preprocess_feedback,
+    report,
+)
+from src.nodes.deduplicate import assign_clusters
+from src.utils import (
+    format_slack_message,
+    llm_run_metrics,
+    llm_scheduler,
+    open_feedback_store,
+    print_llm_metrics,
+    send_slack_message,
+    write_dead_letters,
+)
+
+
+def previous_month(now: datetime) -> str:
+    """The month before `now`, as YYYY-MM."""
+    year, month = (now.year - 1, 12) if now.month == 1 else (now.year, now.month - 1)
+    return f"{year:04d}-{month:02d}"
+
+
+class FeedbackService:
+    """
+    Warm classifier behind a queue.
+
+    Submitted items are collected into micro-batches of up to
+    SERVICE_BATCH_SIZE items, or whatever arrived within
+    SERVICE_BATCH_WINDOW_SECONDS of the first one. Each batch is
+    preprocessed, deduplicated and classified like a workflow run, and
+    stored per month in the feedback store. Monthly reports are built from
+    the store, so they only need the report step.
+    """
+
+    def __init__(self):
+        self.queue: "queue.Queue[FeedbackItem]" = queue.Queue(maxsize=settings.SERVICE_QUEUE_MAX_ITEMS)
+        self.stopping = threading.Event()
+        self._report_lock = threading.Lock()
+        self.batches = 0
+        self.classified = 0
+        self.failed = 0
+        self.last_batch_at: Optional[float] = None
+        self.last_report_month: Optional[str] = None
+
+    def warm_up(self):
+        """Build the agents and the local classifier now instead of on the first request."""
+        start = time.perf_counter()
+        classify.local_classifier.get()
+        if settings.CASCADE_ENABLED:
+            classify.small_classifier.get()
+            classify.small_batch_classifier.get()
+        classify.agent_classifier.get()
+        classify.batch_classifier.get()
+        report.reporter_agent.get()
+        report.report_summarizer.get()
+        if settings.CLASSIFIER_COMPACT:
+            report.rationale_writer.get()
+        print(f"🔥 Agents ready in {time.perf_counter() - start:.1f}s")
+
+    def submit(self, items: List[FeedbackItem]) -> int:
+        """
+        Queue items for classification.
+
+        Returns:
+            The number of items queued; fewer than given when the queue is full
+        """
+        received = datetime.now().strftime("%Y%m%d")
+        for queued, feedback in enumerate(items):
+            # Items without a partition date belong to the day they were received
+            feedback.dt = feedback.dt or received
+            try:
+                self.queue.put_nowait(feedback)
+            except queue.Full:
+                return queued
+        return len(items)
+
+    def next_batch(self) -> List[FeedbackItem]:
+        """Wait for the next micro-batch, empty if the service stopped while waiting."""
+        batch = []
+        while not batch:
+            try:
+                batch.append(self.queue.get(timeout=0.5))
+            except queue.Empty:
+                if self.stopping.is_set():
+                    return []
+
+        deadline = time.monotonic() + settings.SERVICE_BATCH_WINDOW_SECONDS
+        while len(batch) < settings.SERVICE_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def process(self, batch: List[FeedbackItem]):
+        """Preprocess, deduplicate, classify and store one micro-batch."""
+        state = {"feedback_items": batch}
+        if settings.PREPROCESS_ENABLED:
+            preprocess_feedback(state)
+        # The whole batch is classified, CLASSIFICATION_LIMIT does not apply
+        if settings.DEDUP_ENABLED:
+            assign_clusters(batch)
+
+        stats = classify.classify_run_items(batch, None)
+        classify.print_classification_summary(stats)
+
+        by_month = defaultdict(list)
+        for feedback in batch:
+            by_month[f"{feedback.dt[:4]}-{feedback.dt[4:6]}"].append(feedback)
+        store = open_feedback_store()
+        for month, items in by_month.items():
+            store.save(month, items)
+        store.close()
+
+        self.batches += 1
+        self.classified += stats["classified"] - stats["failed"]
+        self.failed += stats["failed"]
+        self.last_batch_at = time.time()
+
+    def run_batches(self):
+        """Classify micro-batches until the service stops and the queue is drained."""
+        while True:
+            batch = self.next_batch()
+            if not batch:
+                return
+            try:
+                self.process(batch)
+            except Exception as e:
+                self.failed += len(batch)
+                for feedback in batch:
+                    llm_scheduler.add_dead_letter("service", feedback.feedback, e)
+                print(f"❌ Micro-batch of {len(batch)} items failed: {str(e)}")
+
+    def create_month_report(self, month: str) -> dict:
+        """Export and report the stored items of a month, writing the Slack message next to the exports."""
+        with self._report_lock:
+            store = open_feedback_store()
+            items = store.load(month)
+            store.close()
+            if not items:
+                raise ValueError(f"No classified feedback stored for {month}")
+            if settings.DEDUP_ENABLED:
+                assign_clusters(items)
+
+            print(f"📝 Creating the {month} report from {len(items)} stored items...")
+            start = time.perf_counter()
+            state = {
+                "current_date": report_date(month),
+                "analysis_month": month,
+                "classified_results": items,
+            }
+            state.update(export_classified_results(state))
+            state.update(aggregate_feedback(state))
+            state.update(create_report(state))
+
+            slack_message = format_slack_message(state["final_report"], report_month=month)
+            report_path = settings.OUTPUT_DIR / f"slack_report_{month}.txt"
+            report_path.write_text(slack_message)
+            if settings.SEND_TO_SLACK:
+                send_slack_message(slack_message, use_dev_channel=True)
+            self.last_report_month = month
+            seconds = time.perf_counter() - start
+            print(f"✅ {month} report written to: {report_path} in {seconds:.1f}s")
+            return {
+                "month": month,
+                "items": len(items),
+                "seconds": seconds,
+                "report_file": str(report_path),
+                "exported_files": state["exported_files"],
+            }
+
+    def run_report_schedule(self):
+        """Report the previous month once, from SERVICE_REPORT_HOUR on SERVICE_REPORT_DAY."""
+        while not self.stopping.wait(60):
+            now = datetime.now()
+            if (now.day, now.hour) < (settings.SERVICE_REPORT_DAY, settings.SERVICE_REPORT_HOUR):
+                continue
+            month = previous_month(now)
+            # Same file as backfill runs, so a month reported by either is not reported again
+            if (settings.OUTPUT_DIR / f"slack_report_{month}.txt").exists():
+                continue
+            try:
+                self.create_month_report(month)
+            except Exception as e:
+                print(f"❌ Scheduled {month} report failed: {str(e)}")
+                # Retry at the next check instead of every minute
+                self.stopping.wait(3600)
+
+    def health(self) -> dict:
+        return {
+            "queued": self.queue.qsize(),
+            "batches": self.batches,
+            "classified": self.classified,
+            "failed": self.failed,
+            "last_batch_at": self.last_batch_at,
+            "last_report_month": self.last_report_month,
+            "rate_limits": llm_scheduler.summary(),
+        }
+
+
+# Fields of FeedbackItem a client may send, the warehouse columns
+FEEDBACK_INPUT_FIELDS = ("dt", "user_id", "feedback", "insight_sub_type", "insight_type", "product_line_name")
+
+
+def parse_date(value: str, fmt: str, name: str, expected: str) -> str:
+    """Return `value` if it is a valid date in `fmt`, else raise ValueError."""
+    try:
+        if datetime.strptime(value, fmt).strftime(fmt) == value:
+            return value
+    except (TypeError, ValueError):
+        pass
+    raise ValueError(f"Invalid {name} {value!r}, expected {expected}")
+
+
+def parse_items(body: bytes) -> List[FeedbackItem]:
+    """Feedback items of a request body: one item, a list of items or {"items": [...]}."""
+    payload = json.loads(body or b"null")
+    if isinstance(payload, dict):
+        payload = payload.get("items", [payload])
+    if not isinstance(payload, list):
+        raise ValueError("Expected a feedback item, a list of items or {\"items\": [...]}")
+    if not all(isinstance(item, dict) for item in payload):
+        raise ValueError("Every feedback item must be a JSON object")
+    # Category, rationale and clusters are produced by the service, never taken from clients
+    items = [
+        FeedbackItem.model_validate({field: item[field] for field in FEEDBACK_INPUT_FIELDS if field in item})
+        for item in payload
+    ]
+    for feedback in items:
+        # dt picks the month the item is stored under
+        if feedback.dt is not None:
+            parse_date(feedback.dt, "%Y%m%d", "dt", "YYYYMMDD")
+    return items
+
+
+def create_handler(service: FeedbackService):
+    """Request handler class bound to the service."""
+
+    class FeedbackRequestHandler(BaseHTTPRequestHandler):
+        """POST /feedback, POST /report?month=YYYY-MM, GET /health."""
+
+        def send_json(self, status: int, payload: dict):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if urlparse(self.path).path == "/health":
+                self.send_json(200, service.health())
+            else:
+                self.send_json(404, {"error": "Not found"})
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if url.path == "/feedback":
+                try:
+                    items = parse_items(body)
+                except (ValueError, ValidationError) as e:
+                    self.send_json(400, {"error": str(e)})
+                    return
+                accepted = service.submit(items)
+                status = 202 if accepted == len(items) else 503
+                self.send_json(status, {"accepted": accepted, "rejected": len(items) - accepted,
+                                        "queued": service.queue.qsize()})
+            elif url.path == "/report":
+                month = parse_qs(url.query).get("month", [previous_month(datetime.now())])[0]
+                try:
+                    parse_date(month, "%Y-%m", "month", "YYYY-MM")
+                except ValueError as e:
+                    self.send_json(400, {"error": str(e)})
+                    return
+                try:
+                    self.send_json(200, service.create_month_report(month))
+                except ValueError as e:
+                    self.send_json(404, {"error": str(e)})
+            else:
+                self.send_json(404, {"error": "Not found"})
+
+        def log_message(self, format, *args):
+            # Batches and reports print their own progress
+            pass
+
+    return FeedbackRequestHandler
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Classify feedback continuously and report monthly.")
+    parser.add_argument("--host", default=settings.SERVICE_HOST, help="Interface to listen on (default: SERVICE_HOST)")
+    parser.add_argument("--port", type=int, default=settings.SERVICE_PORT, help="Port to listen on (default: SERVICE_PORT)")
+    parser.add_argument("--no-schedule", action="store_true", help="Only create reports on POST /report")
+    return parser.parse_args()
+
+
+def main():
+    """Run the service until interrupted, then classify what is still queued."""
+    args = parse_args()
+    settings.OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    llm_run_metrics.reset()
+    llm_scheduler.reset()
+
+    service = FeedbackService()
+    service.warm_up()
+
+    threads = [threading.Thread(target=service.run_batches, name="batches")]
+    if not args.no_schedule:
+        threads.append(threading.Thread(target=service.run_report_schedule, name="reports", daemon=True))
+    for thread in threads:
+        thread.start()
+
+    server = ThreadingHTTPServer((args.host, args.port), create_handler(service))
+    print(f"🚀 Listening on http://{args.host}:{args.port} (POST /feedback, POST /report, GET /health)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n🛑 Stopping, classifying {service.queue.qsize()} queued items...")
+    finally:
+        server.server_close()
+        service.stopping.set()
+        threads[0].join()
+
+    print(f"✨ Classified {service.classified} items in {service.batches} batches, {service.failed} failed")
+    if settings.LLM_METRICS_ENABLED:
+        print_llm_metrics(llm_run_metrics.summary())
+    dead_letters_path = write_dead_letters()
+    if dead_letters_path:
+        print(f"☠️  {len(llm_scheduler.dead_letters)} inputs failed permanently, written to: {dead_letters_path}")
+
+
+if __name__ == "__main__":
+    main()
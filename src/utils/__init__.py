@@ -1,6 +1,54 @@
 """Utility functions."""
+from typing import TYPE_CHECKING
 
-from .slack_client import send_slack_message, format_slack_message
+from .lazy import Lazy, lazy_exports
 
-__all__ = ["send_slack_message", "format_slack_message"]
+if TYPE_CHECKING:
+    from .slack_client import send_slack_message, format_slack_message
+    from .classification_cache import ClassificationCache, open_classification_cache
+    from .near_duplicates import NearDuplicateIndex, cluster_near_duplicates
+    from .feedback_store import FeedbackStore, feedback_row_hash, open_feedback_store
+    from .query_cache import read_sql_cached
+    from .export_writers import EXPORT_WRITERS, export_rows
+    from .insight_stats import compute_insight_stats
+    from .llm_metrics import llm_run_metrics, print_llm_metrics, write_llm_metrics
+    from .llm_rate_limits import llm_scheduler, print_llm_scheduler, schedule_agent, write_dead_letters
+    from .node_timing import node_timings, print_node_timings, timed_node
+    from .run_checkpoints import ClassificationProgress, open_checkpointer, open_classification_progress
+    from .text_preprocessing import single_line
 
+# Submodules pull in slack_sdk, pandas, SQLAlchemy and LangChain, so they are
+# only imported when one of their names is used
+_EXPORTS = {
+    "send_slack_message": "slack_client",
+    "format_slack_message": "slack_client",
+    "ClassificationCache": "classification_cache",
+    "open_classification_cache": "classification_cache",
+    "NearDuplicateIndex": "near_duplicates",
+    "cluster_near_duplicates": "near_duplicates",
+    "FeedbackStore": "feedback_store",
+    "feedback_row_hash": "feedback_store",
+    "open_feedback_store": "feedback_store",
+    "read_sql_cached": "query_cache",
+    "EXPORT_WRITERS": "export_writers",
+    "export_rows": "export_writers",
+    "compute_insight_stats": "insight_stats",
+    "llm_run_metrics": "llm_metrics",
+    "print_llm_metrics": "llm_metrics",
+    "write_llm_metrics": "llm_metrics",
+    "llm_scheduler": "llm_rate_limits",
+    "print_llm_scheduler": "llm_rate_limits",
+    "schedule_agent": "llm_rate_limits",
+    "write_dead_letters": "llm_rate_limits",
+    "node_timings": "node_timing",
+    "print_node_timings": "node_timing",
+    "timed_node": "node_timing",
+    "ClassificationProgress": "run_checkpoints",
+    "open_checkpointer": "run_checkpoints",
+    "open_classification_progress": "run_checkpoints",
+    "single_line": "text_preprocessing",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+__all__ = ["Lazy", *_EXPORTS]
@@ -0,0 +1,141 @@
+"""Persistent content-addressed cache of classifier results."""
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+from src.agents.classifier import CLASSIFIER_FORMATS
+from src.config.settings import settings
+from src.prompts import RATIONALE_PROMPT
+
+
+def normalize_feedback(text: str) -> str:
+    """Normalize feedback text so trivial variations share a cache entry."""
+    return " ".join(text.lower().split())
+
+
+def classifier_fingerprint() -> str:
+    """
+    Hash of everything that changes the classifier output besides the text.
+
+    Covers the prompt and response schema of every classifier format
+    (single, batch, scored and label-only), since any of them can produce
+    a cached entry depending on the batch size, cascade and compact settings.
+    """
+    parts = [settings.MODEL_NAME, str(settings.TEMPERATURE), RATIONALE_PROMPT]
+    for prompt, response_format in CLASSIFIER_FORMATS.values():
+        parts += [prompt, json.dumps(response_format.model_json_schema(), sort_keys=True)]
+    if settings.CASCADE_ENABLED:
+        parts += [settings.CASCADE_MODEL_NAME, str(settings.CASCADE_CONFIDENCE_THRESHOLD)]
+    if settings.CLASSIFIER_COMPACT:
+        parts.append("compact")
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class ClassificationCache:
+    """
+    SQLite-backed cache mapping feedback text to (category, rationale).
+
+    Keys combine the normalized text with the classifier fingerprint, so
+    changing the prompt, model or temperature invalidates old entries.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        fingerprint: str,
+        max_entries: int = 100_000,
+        max_age_days: int = 180,
+    ):
+        self.fingerprint = fingerprint
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+        # Writes are buffered until close(), so the database is only locked briefly
+        # and several classify shards can read the cache at the same time
+        self._used_keys = []
+        self._new_rows = []
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS classifications (
+                key TEXT PRIMARY KEY,
+                category TEXT NOT NULL,
+                rationale TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used_at REAL NOT NULL
+            )
+            """
+        )
+
+    def _key(self, text: str) -> str:
+        payload = f"{self.fingerprint}\x1f{normalize_feedback(text)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, text: str) -> Optional[Tuple[str, Optional[str]]]:
+        """Return the cached (category, rationale) for the text, if any; labels of compact mode have no rationale."""
+        key = self._key(text)
+        row = self.connection.execute(
+            "SELECT category, rationale FROM classifications WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._used_keys.append(key)
+        category, rationale = row
+        return category, rationale or None
+
+    def put(self, text: str, category: str, rationale: Optional[str]):
+        """Store a classification for the text, written on close()."""
+        self._new_rows.append((self._key(text), category, rationale or ""))
+
+    def evict(self) -> int:
+        """Drop entries past the max age, then the least recently used beyond max entries."""
+        cutoff = time.time() - self.max_age_days * 86400
+        removed = self.connection.execute(
+            "DELETE FROM classifications WHERE created_at < ?", (cutoff,)
+        ).rowcount
+        removed += self.connection.execute(
+            """
+            DELETE FROM classifications WHERE key IN (
+                SELECT key FROM classifications
+                ORDER BY last_used_at DESC
+                LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,),
+        ).rowcount
+        return removed
+
+    def close(self):
+        """Write buffered entries, run eviction, commit and close the database."""
+        now = time.time()
+        self.connection.executemany(
+            "UPDATE classifications SET last_used_at = ? WHERE key = ?",
+            [(now, key) for key in self._used_keys],
+        )
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO classifications VALUES (?, ?, ?, ?, ?)",
+            [(key, category, rationale, now, now) for key, category, rationale in self._new_rows],
+        )
+        self.evict()
+        self.connection.commit()
+        self.connection.close()
+
+
+def open_classification_cache() -> ClassificationCache:
+    """Open the classification cache configured in settings."""
+    return ClassificationCache(
+        path=settings.CLASSIFICATION_CACHE_PATH,
+        fingerprint=classifier_fingerprint(),
+        max_entries=settings.CLASSIFICATION_CACHE_MAX_ENTRIES,
+        max_age_days=settings.CLASSIFICATION_CACHE_MAX_AGE_DAYS,
+    )
@@ -0,0 +1,132 @@
+"""Streaming writers that export rows incrementally with constant memory."""
+import csv
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import Workbook
+
+
+class XlsxWriter:
+    """Excel writer using openpyxl write-only mode, rows are flushed as they are appended."""
+
+    def __init__(self, path: Path, header: Sequence[str]):
+        self.path = path
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet()
+        self.sheet.append(list(header))
+
+    def write(self, row: Sequence):
+        self.sheet.append(list(row))
+
+    def close(self):
+        self.workbook.save(self.path)
+
+
+class CsvWriter:
+    """CSV writer."""
+
+    def __init__(self, path: Path, header: Sequence[str]):
+        self.path = path
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(header)
+
+    def write(self, row: Sequence):
+        self.writer.writerow(row)
+
+    def close(self):
+        self.file.close()
+
+
+class JsonlWriter:
+    """JSON Lines writer, one object per row."""
+
+    def __init__(self, path: Path, header: Sequence[str]):
+        self.path = path
+        self.header = list(header)
+        self.file = open(path, "w", encoding="utf-8")
+
+    def write(self, row: Sequence):
+        self.file.write(json.dumps(dict(zip(self.header, row)), ensure_ascii=False) + "\n")
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetWriter:
+    """Parquet writer that buffers rows into fixed-size row groups."""
+
+    def __init__(self, path: Path, header: Sequence[str], row_group_size: int = 50_000):
+        self.path = path
+        self.header = list(header)
+        self.row_group_size = row_group_size
+        self.buffer: List[Sequence] = []
+        self.writer = None
+
+    def write(self, row: Sequence):
+        self.buffer.append(row)
+        if len(self.buffer) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self):
+        if not self.buffer:
+            return
+        columns = {name: [row[i] for row in self.buffer] for i, name in enumerate(self.header)}
+        table = pa.table(columns)
+        if self.writer is None:
+            # A column that is all None in the first row group would be typed null
+            schema = pa.schema([
+                field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                for field in table.schema
+            ])
+            self.writer = pq.ParquetWriter(self.path, schema)
+        self.writer.write_table(table.cast(self.writer.schema))
+        self.buffer = []
+
+    def close(self):
+        self._flush()
+        if self.writer is not None:
+            self.writer.close()
+        else:
+            # No rows: still write a valid file with the header as schema
+            pq.write_table(pa.table({name: pa.array([], pa.string()) for name in self.header}), self.path)
+
+
+EXPORT_WRITERS = {
+    "xlsx": XlsxWriter,
+    "csv": CsvWriter,
+    "jsonl": JsonlWriter,
+    "parquet": ParquetWriter,
+}
+
+
+def export_rows(stem: Path, formats: Iterable[str], header: Sequence[str], rows: Iterable[Sequence]) -> Dict[str, Path]:
+    """
+    Write rows to one file per format in a single pass.
+
+    Args:
+        stem: Output path without extension
+        formats: Keys of EXPORT_WRITERS
+        header: Column names
+        rows: Row tuples, consumed lazily
+
+    Returns:
+        Format to written file path
+    """
+    unknown = set(formats) - set(EXPORT_WRITERS)
+    if unknown:
+        raise ValueError(f"Unknown export formats: {', '.join(sorted(unknown))}")
+
+    writers = {fmt: EXPORT_WRITERS[fmt](stem.with_suffix(f".{fmt}"), header) for fmt in formats}
+    try:
+        for row in rows:
+            for writer in writers.values():
+                writer.write(row)
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    return {fmt: writer.path for fmt, writer in writers.items()}
@@ -0,0 +1,132 @@
+"""Local store of classified feedback rows for incremental loading."""
+import hashlib
+import sqlite3
+from pathlib import Path
+from typing import Iterable, List, Optional, Set
+
+from src.config.settings import settings
+from src.models import FeedbackItem
+
+
+def feedback_row_hash(feedback: FeedbackItem, text: Optional[str] = None) -> str:
+    """
+    Stable identity of a warehouse row, independent of its classification.
+
+    `text` replaces the comment, e.g. to hash a raw row as it is stored after preprocessing.
+    """
+    parts = [
+        feedback.dt or "",
+        feedback.user_id,
+        feedback.feedback if text is None else text,
+        feedback.insight_type,
+        feedback.insight_sub_type,
+        feedback.product_line_name,
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class FeedbackStore:
+    """
+    SQLite-backed store of classified feedback, grouped by analysis month.
+
+    Keeps a high-water mark (last loaded `dt` partition) per month, so
+    later runs only fetch and classify rows that are not stored yet.
+    """
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS feedback (
+                row_hash TEXT PRIMARY KEY,
+                month TEXT NOT NULL,
+                dt TEXT,
+                user_id TEXT NOT NULL,
+                feedback TEXT NOT NULL,
+                insight_sub_type TEXT NOT NULL,
+                insight_type TEXT NOT NULL,
+                product_line_name TEXT NOT NULL,
+                category TEXT NOT NULL,
+                rationale TEXT
+            );
+            CREATE INDEX IF NOT EXISTS feedback_month ON feedback (month);
+            CREATE TABLE IF NOT EXISTS watermarks (
+                month TEXT PRIMARY KEY,
+                last_dt TEXT NOT NULL
+            );
+            """
+        )
+
+    def get_watermark(self, month: str) -> Optional[str]:
+        """Last `dt` partition loaded for the month, if any."""
+        row = self.connection.execute(
+            "SELECT last_dt FROM watermarks WHERE month = ?", (month,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_watermark(self, month: str, last_dt: str):
+        """Record the last `dt` partition loaded for the month."""
+        self.connection.execute(
+            "INSERT OR REPLACE INTO watermarks VALUES (?, ?)", (month, last_dt)
+        )
+
+    def known_hashes(self, month: str) -> Set[str]:
+        """Row hashes already stored for the month."""
+        rows = self.connection.execute(
+            "SELECT row_hash FROM feedback WHERE month = ?", (month,)
+        )
+        return {row[0] for row in rows}
+
+    def save(self, month: str, feedback_list: Iterable[FeedbackItem]) -> int:
+        """Store classified items, returns the number of rows written."""
+        rows = [
+            (
+                feedback_row_hash(feedback), month, feedback.dt, feedback.user_id, feedback.feedback,
+                feedback.insight_sub_type, feedback.insight_type, feedback.product_line_name,
+                feedback.category, feedback.rationale,
+            )
+            for feedback in feedback_list
+            if feedback.category is not None
+        ]
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO feedback VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+        )
+        return len(rows)
+
+    def load(self, month: str, exclude: Set[str] = frozenset()) -> List[FeedbackItem]:
+        """Stored items of the month, skipping the given row hashes."""
+        rows = self.connection.execute(
+            """
+            SELECT row_hash, dt, user_id, feedback, insight_sub_type, insight_type,
+                   product_line_name, category, rationale
+            FROM feedback WHERE month = ?
+            ORDER BY dt DESC
+            """,
+            (month,),
+        )
+        return [
+            FeedbackItem(
+                dt=dt,
+                user_id=user_id,
+                feedback=feedback,
+                insight_sub_type=insight_sub_type,
+                insight_type=insight_type,
+                product_line_name=product_line_name,
+                category=category,
+                rationale=rationale,
+            )
+            for row_hash, dt, user_id, feedback, insight_sub_type, insight_type,
+                product_line_name, category, rationale in rows
+            if row_hash not in exclude
+        ]
+
+    def close(self):
+        """Commit and close the database."""
+        self.connection.commit()
+        self.connection.close()
+
+
+def open_feedback_store() -> FeedbackStore:
+    """Open the feedback store configured in settings."""
+    return FeedbackStore(settings.FEEDBACK_STORE_PATH)
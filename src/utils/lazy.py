@@ -0,0 +1,63 @@
+"""Values created on first use, so importing a module stays cheap."""
+import importlib
+import sys
+import threading
+from typing import Callable, Dict, Generic, TypeVar
+
+
+T = TypeVar("T")
+
+
+class Lazy(Generic[T]):
+    """
+    Thread-safe holder of a value built by `factory` on the first get().
+
+    Used for agents, so importing a node does not build a ChatOpenAI client
+    (or train the local classifier) until the node actually runs.
+    """
+
+    def __init__(self, factory: Callable[[], T]):
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._created = False
+        self._value = None
+
+    def get(self) -> T:
+        if not self._created:
+            with self._lock:
+                if not self._created:
+                    self._value = self._factory()
+                    self._created = True
+        return self._value
+
+    def set(self, value: T):
+        """Replace the value, e.g. with an agent backed by a fake model in benchmarks."""
+        with self._lock:
+            self._value = value
+            self._created = True
+
+
+def lazy_exports(package: str, exports: Dict[str, str]):
+    """
+    Module `__getattr__` and `__dir__` importing each export from its submodule on first access.
+
+    Args:
+        package: `__name__` of the package
+        exports: Exported name -> submodule of the package that defines it
+
+    Returns:
+        The `__getattr__` and `__dir__` functions to assign in the package
+    """
+    def __getattr__(name: str):
+        submodule = exports.get(name)
+        if submodule is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(f".{submodule}", package), name)
+        # Cache on the package so later lookups skip __getattr__
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
@@ -0,0 +1,237 @@
+"""Token, cost and latency metrics of LLM requests, collected through LangChain callbacks."""
+import json
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from src.config.settings import settings
+
+
+LATENCY_QUANTILES = [0.5, 0.95, 0.99]
+
+
+class LLMMetrics:
+    """Thread-safe per-agent counters for one run of the workflow."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Model behind each agent, kept across runs like the agents themselves
+        self.agent_models: Dict[str, str] = {}
+        self.reset()
+
+    def reset(self):
+        """Start a new run."""
+        with self._lock:
+            self.started_at = time.time()
+            self.requests = defaultdict(int)
+            self.errors = defaultdict(int)
+            self.retries = defaultdict(int)
+            self.prompt_tokens = defaultdict(int)
+            self.completion_tokens = defaultdict(int)
+            self.latencies = defaultdict(list)
+
+    def record_request(self, agent: str, latency: float, prompt_tokens: int, completion_tokens: int):
+        with self._lock:
+            self.requests[agent] += 1
+            self.latencies[agent].append(latency)
+            self.prompt_tokens[agent] += prompt_tokens
+            self.completion_tokens[agent] += completion_tokens
+
+    def record_error(self, agent: str, latency: float):
+        with self._lock:
+            self.requests[agent] += 1
+            self.errors[agent] += 1
+            self.latencies[agent].append(latency)
+
+    def record_retry(self, agent: str, count: int = 1):
+        """Count items or requests sent again after a failed or incomplete response."""
+        with self._lock:
+            self.retries[agent] += count
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Per-agent and total metrics of the run.
+
+        Cost is estimated from LLM_INPUT_COST_PER_1M / LLM_OUTPUT_COST_PER_1M.
+        """
+        with self._lock:
+            agents = sorted(set(self.requests) | set(self.retries))
+            per_agent = {agent: self._agent_summary(agent) for agent in agents}
+            all_latencies = [latency for agent in agents for latency in self.latencies[agent]]
+
+        total = {
+            key: sum(stats[key] for stats in per_agent.values())
+            for key in ("requests", "errors", "retries", "prompt_tokens", "completion_tokens", "cost_usd")
+        }
+        total["latency_seconds"] = latency_percentiles(all_latencies)
+
+        return {
+            "started_at": self.started_at,
+            "duration_seconds": time.time() - self.started_at,
+            "model": settings.MODEL_NAME,
+            "agents": per_agent,
+            "total": total,
+        }
+
+    def _agent_summary(self, agent: str) -> Dict[str, Any]:
+        prompt_tokens = self.prompt_tokens[agent]
+        completion_tokens = self.completion_tokens[agent]
+        model = self.agent_models.get(agent, settings.MODEL_NAME)
+        return {
+            "model": model,
+            "requests": self.requests[agent],
+            "errors": self.errors[agent],
+            "retries": self.retries[agent],
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cost_usd": estimate_cost(prompt_tokens, completion_tokens, model),
+            "latency_seconds": latency_percentiles(self.latencies[agent]),
+        }
+
+
+def estimate_cost(prompt_tokens: int, completion_tokens: int, model: Optional[str] = None) -> float:
+    """USD cost at the LLM_MODEL_COSTS_PER_1M prices of `model`, LLM_INPUT/OUTPUT_COST_PER_1M otherwise."""
+    input_cost, output_cost = settings.LLM_MODEL_COSTS_PER_1M.get(
+        model, (settings.LLM_INPUT_COST_PER_1M, settings.LLM_OUTPUT_COST_PER_1M)
+    )
+    return (prompt_tokens * input_cost + completion_tokens * output_cost) / 1_000_000
+
+
+def latency_percentiles(latencies: List[float]) -> Dict[str, float]:
+    """p50/p95/p99, mean and sum of the latencies in seconds."""
+    if not latencies:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "mean": 0.0, "sum": 0.0}
+    values = np.percentile(latencies, [q * 100 for q in LATENCY_QUANTILES])
+    result = {f"p{int(q * 100)}": float(value) for q, value in zip(LATENCY_QUANTILES, values)}
+    result["mean"] = float(np.mean(latencies))
+    result["sum"] = float(np.sum(latencies))
+    return result
+
+
+def token_usage(response: LLMResult) -> Tuple[int, int]:
+    """Prompt and completion tokens of a chat model response."""
+    prompt_tokens = completion_tokens = 0
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                prompt_tokens += usage.get("input_tokens", 0)
+                completion_tokens += usage.get("output_tokens", 0)
+    if not prompt_tokens and not completion_tokens and response.llm_output:
+        usage = response.llm_output.get("token_usage") or {}
+        prompt_tokens = usage.get("prompt_tokens", 0)
+        completion_tokens = usage.get("completion_tokens", 0)
+    return prompt_tokens, completion_tokens
+
+
+class LLMMetricsCallback(BaseCallbackHandler):
+    """Records latency and token usage of every chat model request made by one agent."""
+
+    def __init__(self, agent: str, metrics: "LLMMetrics"):
+        self.agent = agent
+        self.metrics = metrics
+        self._started: Dict[Any, float] = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response: LLMResult, *, run_id, **kwargs):
+        latency = time.perf_counter() - self._started.pop(run_id, time.perf_counter())
+        self.metrics.record_request(self.agent, latency, *token_usage(response))
+
+    def on_llm_error(self, error: BaseException, *, run_id, **kwargs):
+        latency = time.perf_counter() - self._started.pop(run_id, time.perf_counter())
+        self.metrics.record_error(self.agent, latency)
+
+
+# Metrics of the current process, shared by every agent
+llm_run_metrics = LLMMetrics()
+
+
+def instrument_agent(agent, name: str, model: Optional[str] = None):
+    """Attach the metrics callback to an agent, labelling its requests with `name` and pricing them as `model`."""
+    llm_run_metrics.agent_models[name] = model or settings.MODEL_NAME
+    if not settings.LLM_METRICS_ENABLED:
+        return agent
+    return agent.with_config(callbacks=[LLMMetricsCallback(name, llm_run_metrics)])
+
+
+def format_prometheus(summary: Dict[str, Any]) -> str:
+    """Render the run summary in the Prometheus text exposition format."""
+    counters = [
+        ("requests", "feedback_llm_requests_total", "LLM requests per agent"),
+        ("errors", "feedback_llm_errors_total", "Failed LLM requests per agent"),
+        ("retries", "feedback_llm_retries_total", "Items or requests sent again per agent"),
+        ("prompt_tokens", "feedback_llm_prompt_tokens_total", "Prompt tokens per agent"),
+        ("completion_tokens", "feedback_llm_completion_tokens_total", "Completion tokens per agent"),
+        ("cost_usd", "feedback_llm_cost_usd_total", "Estimated cost in USD per agent"),
+    ]
+    lines = []
+    for key, metric, description in counters:
+        lines.append(f"# HELP {metric} {description}")
+        lines.append(f"# TYPE {metric} counter")
+        for agent, stats in summary["agents"].items():
+            lines.append(f'{metric}{{agent="{agent}"}} {stats[key]}')
+
+    metric = "feedback_llm_latency_seconds"
+    lines.append(f"# HELP {metric} LLM request latency per agent")
+    lines.append(f"# TYPE {metric} summary")
+    for agent, stats in summary["agents"].items():
+        latency = stats["latency_seconds"]
+        for q in LATENCY_QUANTILES:
+            lines.append(f'{metric}{{agent="{agent}",quantile="{q}"}} {latency[f"p{int(q * 100)}"]}')
+        lines.append(f'{metric}_sum{{agent="{agent}"}} {latency["sum"]}')
+        lines.append(f'{metric}_count{{agent="{agent}"}} {stats["requests"]}')
+
+    lines.append("# HELP feedback_run_duration_seconds Wall time of the last run")
+    lines.append("# TYPE feedback_run_duration_seconds gauge")
+    lines.append(f"feedback_run_duration_seconds {summary['duration_seconds']}")
+    return "\n".join(lines) + "\n"
+
+
+def write_llm_metrics(summary: Dict[str, Any], output_dir: Optional[Path] = None) -> Tuple[Path, Path]:
+    """
+    Write the run summary as JSON and in Prometheus text format.
+
+    The JSON file is timestamped per run; the Prometheus file keeps a fixed
+    name so a node_exporter textfile collector always reads the last run.
+
+    Returns:
+        The JSON and Prometheus file paths
+    """
+    output_dir = output_dir or settings.OUTPUT_DIR
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    timestamp = time.strftime('%Y%m%d_%H%M%S', time.localtime(summary["started_at"]))
+    json_path = output_dir / f"llm_metrics_{timestamp}.json"
+    json_path.write_text(json.dumps(summary, indent=2))
+
+    # Write to a temporary file first so the collector never reads a partial file
+    prometheus_path = output_dir / "llm_metrics.prom"
+    temporary_path = prometheus_path.with_suffix(".tmp")
+    temporary_path.write_text(format_prometheus(summary))
+    temporary_path.replace(prometheus_path)
+
+    return json_path, prometheus_path
+
+
+def print_llm_metrics(summary: Dict[str, Any]):
+    """Print the per-agent request, token, cost and latency breakdown."""
+    total = summary["total"]
+    print(f"   LLM requests: {total['requests']} ({total['errors']} failed, {total['retries']} retried)")
+    print(f"   Tokens: {total['prompt_tokens']:,} prompt + {total['completion_tokens']:,} completion "
+          f"(~${total['cost_usd']:.4f})")
+    for agent, stats in summary["agents"].items():
+        latency = stats["latency_seconds"]
+        print(f"     {agent}: {stats['requests']} requests, "
+              f"{stats['prompt_tokens']:,} + {stats['completion_tokens']:,} tokens, "
+              f"p50 {latency['p50']:.2f}s, p95 {latency['p95']:.2f}s")
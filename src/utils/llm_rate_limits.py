@@ -0,0 +1,295 @@
+"""Rate limits, adaptive concurrency and retries shared by every LLM request of the process."""
+import json
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, List, NamedTuple, Optional, TypeVar
+
+from src.config.settings import settings
+from src.utils.llm_metrics import llm_run_metrics
+
+
+T = TypeVar("T")
+
+# Token buckets hold this many seconds of their per-minute rate, so a cold
+# start cannot send a whole minute of requests at once
+BURST_SECONDS = 10
+
+# HTTP statuses worth retrying besides 429: timeouts, conflicts and server errors
+RETRYABLE_STATUSES = {408, 409, 500, 502, 503, 504}
+RETRYABLE_ERRORS = {"RateLimitError", "APITimeoutError", "APIConnectionError", "InternalServerError"}
+
+
+class DeadLetter(NamedTuple):
+    """An LLM request whose input could not be processed, kept for a later rerun."""
+    agent: str
+    content: str
+    error: str
+    failed_at: float
+
+
+def error_status(error: Exception) -> Optional[int]:
+    """HTTP status of an OpenAI (or fake) error, None for other exceptions."""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_rate_limited(error: Exception) -> bool:
+    return error_status(error) == 429 or type(error).__name__ == "RateLimitError"
+
+
+def is_congestion(error: Exception) -> bool:
+    """Errors that mean the API is overloaded: rate limits and timeouts."""
+    return (
+        is_rate_limited(error)
+        or error_status(error) == 408
+        or isinstance(error, TimeoutError)
+        or type(error).__name__ == "APITimeoutError"
+    )
+
+
+def is_retryable(error: Exception) -> bool:
+    """Rate limits, timeouts, connection problems and server errors; not bad requests or validation errors."""
+    return (
+        is_rate_limited(error)
+        or error_status(error) in RETRYABLE_STATUSES
+        or isinstance(error, (TimeoutError, ConnectionError))
+        or type(error).__name__ in RETRYABLE_ERRORS
+    )
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Delay requested by the server's Retry-After header, if any."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled at `per_minute` units per minute.
+
+    acquire() takes the amount right away and sleeps off any deficit, so
+    callers are served in arrival order and large requests are not starved.
+    """
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        self.per_minute = per_minute
+        self.capacity = max(1.0, per_minute * BURST_SECONDS / 60)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = clock()
+
+    def reserve(self, amount: float) -> float:
+        """Take `amount` units, returning the seconds to wait before using them."""
+        rate = self.per_minute / 60
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * rate)
+            self._updated = now
+            # Larger requests than the bucket holds wait for a full bucket instead of forever
+            self._tokens -= min(amount, self.capacity)
+            return max(0.0, -self._tokens / rate)
+
+    def acquire(self, amount: float = 1) -> float:
+        """Block until `amount` units are available, returning the seconds waited."""
+        wait = self.reserve(amount)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD limit on in-flight requests.
+
+    Each successful request adds 1/limit (about +1 per round of requests),
+    a 429, timeout or response slower than the target latency halves the
+    limit. Only requests started after the last decrease can trigger the
+    next one, so a burst of failures from the same round halves it once.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1, target_latency: Optional[float] = None):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.target_latency = target_latency
+        self.limit = float(self.max_limit)
+        self.in_flight = 0
+        self.decreases = 0
+        self._decreased_at = float("-inf")
+        self._condition = threading.Condition()
+
+    def acquire(self) -> float:
+        """Wait for a free slot, returning the start time to pass to release()."""
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+            return time.monotonic()
+
+    def release(self, started: float, congested: bool = False):
+        """Free a slot and adapt the limit to the outcome of the request."""
+        now = time.monotonic()
+        slow = self.target_latency is not None and now - started > self.target_latency
+        with self._condition:
+            self.in_flight -= 1
+            if congested or slow:
+                if started >= self._decreased_at:
+                    self.limit = max(self.min_limit, self.limit / 2)
+                    self._decreased_at = now
+                    self.decreases += 1
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+
+class LLMScheduler:
+    """
+    Process-wide gate for LLM requests: request and token buckets, adaptive
+    concurrency and jittered exponential retries.
+
+    Limits are read from settings on reset(), which every run calls, so one
+    scheduler serves all agents (classifier, cascade tiers, reporter) and
+    all parallel shards or backfill months of the process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Start a new run with the limits configured in settings."""
+        with self._lock:
+            self.requests = TokenBucket(settings.LLM_REQUESTS_PER_MINUTE)
+            self.tokens = TokenBucket(settings.LLM_TOKENS_PER_MINUTE)
+            self.concurrency = AdaptiveConcurrency(
+                settings.LLM_MAX_CONCURRENCY,
+                settings.LLM_MIN_CONCURRENCY,
+                settings.LLM_TARGET_LATENCY_SECONDS,
+            )
+            self.rate_limited = 0
+            self.retried = 0
+            self.throttled_seconds = 0.0
+            self.dead_letters: List[DeadLetter] = []
+
+    def call(self, agent: str, request: Callable[[], T], tokens: int = 0) -> T:
+        """
+        Run `request` within the rate limits, retrying retryable errors.
+
+        Args:
+            agent: Agent name, for retry metrics
+            request: The LLM call
+            tokens: Estimated prompt + completion tokens of the request
+
+        Raises:
+            The last error once LLM_MAX_RETRIES retries are used up, or
+            immediately for errors that are not worth retrying
+        """
+        for attempt in range(settings.LLM_MAX_RETRIES + 1):
+            waited = self.requests.acquire(1) + self.tokens.acquire(tokens)
+            started = self.concurrency.acquire()
+            try:
+                result = request()
+            except Exception as e:
+                rate_limited = is_rate_limited(e)
+                self.concurrency.release(started, congested=is_congestion(e))
+                with self._lock:
+                    self.throttled_seconds += waited
+                    self.rate_limited += rate_limited
+                if not is_retryable(e) or attempt == settings.LLM_MAX_RETRIES:
+                    raise
+                # Full jitter: spread retries of requests that failed together
+                backoff = min(settings.LLM_RETRY_MAX_SECONDS, settings.LLM_RETRY_BASE_SECONDS * 2 ** attempt)
+                delay = max(random.uniform(0, backoff), retry_after_seconds(e) or 0)
+                with self._lock:
+                    self.retried += 1
+                llm_run_metrics.record_retry(agent)
+                time.sleep(delay)
+            else:
+                self.concurrency.release(started)
+                with self._lock:
+                    self.throttled_seconds += waited
+                return result
+
+    def add_dead_letter(self, agent: str, content: str, error: Any):
+        """Record an input that failed permanently, after retries and fallbacks."""
+        with self._lock:
+            self.dead_letters.append(DeadLetter(agent, content, str(error), time.time()))
+
+    def summary(self) -> dict:
+        return {
+            "concurrency_limit": int(self.concurrency.limit),
+            "concurrency_decreases": self.concurrency.decreases,
+            "rate_limited": self.rate_limited,
+            "retried": self.retried,
+            "throttled_seconds": self.throttled_seconds,
+            "dead_letters": len(self.dead_letters),
+        }
+
+
+# Scheduler of the current process, shared by every agent
+llm_scheduler = LLMScheduler()
+
+
+class ScheduledAgent:
+    """Agent wrapper that sends invoke() through the shared LLM scheduler."""
+
+    def __init__(self, agent, name: str, reserved_tokens: int = 0):
+        self.agent = agent
+        self.name = name
+        self.reserved_tokens = reserved_tokens
+
+    def invoke(self, inputs, *args, **kwargs):
+        tokens = self.reserved_tokens + len(str(inputs)) // settings.CHARS_PER_TOKEN
+        return llm_scheduler.call(self.name, lambda: self.agent.invoke(inputs, *args, **kwargs), tokens)
+
+    def __getattr__(self, name):
+        return getattr(self.agent, name)
+
+
+def schedule_agent(agent, name: str, reserved_tokens: int = 0):
+    """
+    Send an agent's requests through the shared scheduler.
+
+    Args:
+        agent: The (instrumented) agent
+        name: Agent name, for retry metrics
+        reserved_tokens: Tokens counted against LLM_TOKENS_PER_MINUTE per
+            request on top of the user message: system prompt and max output
+    """
+    if not settings.LLM_RATE_LIMIT_ENABLED:
+        return agent
+    return ScheduledAgent(agent, name, reserved_tokens)
+
+
+def print_llm_scheduler(summary: dict):
+    """Print rate limit waits, 429s, retries and the final concurrency limit."""
+    print(f"   Rate limits: {summary['rate_limited']} rate-limited responses, {summary['retried']} retries, "
+          f"{summary['throttled_seconds']:.1f}s waited for request/token budget (summed over requests)")
+    print(f"   Concurrency limit: {summary['concurrency_limit']} "
+          f"(reduced {summary['concurrency_decreases']} times)")
+
+
+def write_dead_letters(output_dir: Optional[Path] = None) -> Optional[Path]:
+    """
+    Write the dead letters of the run as JSON lines, one failed input per line.
+
+    Returns:
+        The file path, None when nothing failed
+    """
+    if not llm_scheduler.dead_letters:
+        return None
+    output_dir = output_dir or settings.OUTPUT_DIR
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    path = output_dir / f"dead_letters_{time.strftime('%Y%m%d_%H%M%S')}.jsonl"
+    with path.open("w") as f:
+        for letter in llm_scheduler.dead_letters:
+            f.write(json.dumps(letter._asdict()) + "\n")
+    return path
@@ -0,0 +1,148 @@
+"""Near-duplicate detection with MinHash signatures and LSH banding."""
+import re
+import zlib
+from collections import defaultdict
+from typing import List, Tuple
+
+import numpy as np
+
+
+_MERSENNE_PRIME = (1 << 31) - 1
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace."""
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+
+def shingles(text: str, size: int) -> List[int]:
+    """Hashed character shingles of the normalized text."""
+    normalized = normalize_text(text)
+    if len(normalized) <= size:
+        return [zlib.crc32(normalized.encode("utf-8"))]
+    return list({
+        zlib.crc32(normalized[i:i + size].encode("utf-8"))
+        for i in range(len(normalized) - size + 1)
+    })
+
+
+def minhash_signatures(texts: List[str], num_perm: int, shingle_size: int, seed: int = 1) -> np.ndarray:
+    """Compute a (len(texts), num_perm) matrix of MinHash values."""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    signatures = np.empty((len(texts), num_perm), dtype=np.uint64)
+    for row, text in enumerate(texts):
+        hashes = np.array(shingles(text, shingle_size), dtype=np.uint64) & _MERSENNE_PRIME
+        # (a * h + b) mod p stays below 2**63, so uint64 never overflows
+        signatures[row] = ((np.outer(a, hashes) + b[:, None]) % _MERSENNE_PRIME).min(axis=1)
+    return signatures
+
+
+def lsh_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """Pick (bands, rows) whose LSH threshold (1/bands)**(1/rows) is closest to the target."""
+    candidates = [(num_perm // rows, rows) for rows in range(1, num_perm + 1) if num_perm % rows == 0]
+    return min(candidates, key=lambda br: abs((1 / br[0]) ** (1 / br[1]) - threshold))
+
+
+def cluster_near_duplicates(
+    texts: List[str],
+    threshold: float = 0.8,
+    num_perm: int = 64,
+    shingle_size: int = 4,
+) -> List[int]:
+    """
+    Group texts whose estimated Jaccard similarity is at least the threshold.
+
+    Returns:
+        For each text, the index of its cluster representative (the first
+        text of the cluster), so unique texts map to themselves
+    """
+    if not texts:
+        return []
+
+    signatures = minhash_signatures(texts, num_perm, shingle_size)
+    bands, rows = lsh_bands(threshold, num_perm)
+
+    parent = list(range(len(texts)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    # Candidate pairs share at least one band bucket, then get verified on the full signature
+    for band in range(bands):
+        buckets = defaultdict(list)
+        band_values = signatures[:, band * rows:(band + 1) * rows]
+        for i, key in enumerate(map(bytes, band_values)):
+            buckets[key].append(i)
+
+        for members in buckets.values():
+            first = members[0]
+            for other in members[1:]:
+                root_first, root_other = find(first), find(other)
+                if root_first == root_other:
+                    continue
+                similarity = np.mean(signatures[first] == signatures[other])
+                if similarity >= threshold:
+                    # Smallest index stays root so the representative is the first occurrence
+                    parent[max(root_first, root_other)] = min(root_first, root_other)
+
+    return [find(i) for i in range(len(texts))]
+
+
+class NearDuplicateIndex:
+    """
+    Incremental near-duplicate clustering for texts that arrive in batches.
+
+    Keeps the signature and LSH band buckets of every cluster representative,
+    so a text in a later batch joins a cluster started by an earlier one.
+    Each text is compared with representatives only, which makes clusters
+    slightly tighter than the transitive ones of cluster_near_duplicates;
+    memory grows with the number of clusters, not of texts.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 64, shingle_size: int = 4):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = lsh_bands(threshold, num_perm)
+        self.buckets = [{} for _ in range(self.bands)]  # band value -> representative positions
+        self.signatures = {}  # representative position -> signature
+        self.size = 0
+
+    def add(self, texts: List[str]) -> List[int]:
+        """
+        Add texts after those of earlier calls.
+
+        Returns:
+            For each text, the position of its cluster representative among
+            all texts added so far, so unique texts map to their own position
+        """
+        if not texts:
+            return []
+
+        signatures = minhash_signatures(texts, self.num_perm, self.shingle_size)
+        representatives = []
+        for position, signature in enumerate(signatures, self.size):
+            keys = [bytes(signature[band * self.rows:(band + 1) * self.rows]) for band in range(self.bands)]
+            representative = position
+            for band, key in enumerate(keys):
+                for candidate in self.buckets[band].get(key, ()):
+                    if np.mean(self.signatures[candidate] == signature) >= self.threshold:
+                        representative = candidate
+                        break
+                if representative != position:
+                    break
+
+            if representative == position:
+                self.signatures[position] = signature
+                for band, key in enumerate(keys):
+                    self.buckets[band].setdefault(key, []).append(position)
+            representatives.append(representative)
+
+        self.size += len(texts)
+        return representatives
@@ -0,0 +1,145 @@
+"""Per-node wall time, CPU time and memory of workflow runs, with opt-in profiling."""
+import cProfile
+import functools
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, List, NamedTuple, Optional
+
+from src.config.settings import settings
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+PROFILE_MODES = ("cprofile", "tracemalloc")
+
+
+class NodeTiming(NamedTuple):
+    """Measurements of one node execution."""
+    node: str
+    wall_seconds: float
+    cpu_seconds: float
+    peak_mb: Optional[float]
+    rss_growth_mb: Optional[float]
+    failed: bool
+
+
+def peak_rss_mb() -> Optional[float]:
+    """High-water mark of the process resident set size, None where unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+class NodeTimings:
+    """Thread-safe list of node measurements for one run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.timings: List[NodeTiming] = []
+
+    def reset(self):
+        with self._lock:
+            self.timings = []
+
+    def record(self, timing: NodeTiming):
+        with self._lock:
+            self.timings.append(timing)
+
+
+# Timings of the current process, shared by every node
+node_timings = NodeTimings()
+
+
+def profile_path(node: str, extension: str):
+    settings.PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    return settings.PROFILE_DIR / f"{node}_{timestamp}.{extension}"
+
+
+def timed_node(name: str, node: Callable) -> Callable:
+    """
+    Wrap a workflow node to record its wall time, CPU time and memory.
+
+    CPU time is the process time of all threads, so it can exceed the wall
+    time when a node uses a thread pool. Memory is the process peak RSS at
+    the end of the node and how much the node raised it; when the node is
+    profiled with tracemalloc, the exact peak of Python allocations is used
+    instead.
+
+    The node named by PROFILE_NODE also runs under cProfile or tracemalloc
+    (PROFILE_MODE), and the .prof file or snapshot is written to PROFILE_DIR.
+    cProfile only sees the calling thread, so work done in thread pools shows
+    up as waiting.
+    """
+    @functools.wraps(node)
+    def wrapper(state):
+        mode = settings.PROFILE_MODE if settings.PROFILE_NODE == name else None
+        profiler = cProfile.Profile() if mode == "cprofile" else None
+        tracing = mode == "tracemalloc" and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+
+        rss_before = peak_rss_mb()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        failed = True
+        try:
+            if profiler:
+                result = profiler.runcall(node, state)
+            else:
+                result = node(state)
+            failed = False
+            return result
+        finally:
+            wall_seconds = time.perf_counter() - wall_start
+            cpu_seconds = time.process_time() - cpu_start
+            peak_mb = peak_rss_mb()
+            rss_growth_mb = peak_mb - rss_before if peak_mb is not None else None
+
+            if profiler:
+                path = profile_path(name, "prof")
+                profiler.dump_stats(path)
+                print(f"🔬 cProfile stats of {name} written to: {path}")
+                pstats.Stats(profiler).sort_stats("cumulative").print_stats(15)
+            if tracing:
+                _, traced_peak = tracemalloc.get_traced_memory()
+                snapshot = tracemalloc.take_snapshot()
+                tracemalloc.stop()
+                peak_mb, rss_growth_mb = traced_peak / 2**20, None
+                path = profile_path(name, "tracemalloc")
+                snapshot.dump(str(path))
+                print(f"🔬 tracemalloc snapshot of {name} written to: {path} (peak {peak_mb:.1f} MB)")
+                for stat in snapshot.statistics("lineno")[:10]:
+                    print(f"   {stat}")
+
+            node_timings.record(NodeTiming(name, wall_seconds, cpu_seconds, peak_mb, rss_growth_mb, failed))
+
+    return wrapper
+
+
+def print_node_timings(timings: Optional[List[NodeTiming]] = None):
+    """Print the per-node breakdown table of the run."""
+    timings = node_timings.timings if timings is None else timings
+    if not timings:
+        return
+
+    def megabytes(value: Optional[float]) -> str:
+        return f"{value:.1f}" if value is not None else "-"
+
+    total_wall = sum(timing.wall_seconds for timing in timings) or 1.0
+    width = max(len("Node"), *(len(timing.node) for timing in timings))
+    print(f"\n⏱️  {'Node':<{width}} {'wall s':>8} {'share':>6} {'cpu s':>8} {'peak MB':>9} {'+MB':>7}")
+    for timing in timings:
+        status = " (failed)" if timing.failed else ""
+        print(f"   {timing.node:<{width}} {timing.wall_seconds:>8.2f} "
+              f"{timing.wall_seconds / total_wall:>6.0%} {timing.cpu_seconds:>8.2f} "
+              f"{megabytes(timing.peak_mb):>9} {megabytes(timing.rss_growth_mb):>7}{status}")
+    print(f"   {'Total':<{width}} {sum(timing.wall_seconds for timing in timings):>8.2f}")
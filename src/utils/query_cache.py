@@ -0,0 +1,66 @@
+"""Local Parquet cache of warehouse query results."""
+import hashlib
+import json
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from src.config.settings import settings
+
+
+def query_cache_key(query, params: dict, engine) -> str:
+    """Hash of the normalized SQL, its parameters and the target database."""
+    normalized_sql = " ".join(str(query).split())
+    payload = json.dumps(
+        {
+            "sql": normalized_sql,
+            "params": params or {},
+            "database": engine.url.render_as_string(hide_password=True),
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def evict_expired(cache_dir: Path, ttl_seconds: float) -> int:
+    """Delete cached results older than the TTL, returns the number removed."""
+    cutoff = time.time() - ttl_seconds
+    removed = 0
+    for path in cache_dir.glob("*.parquet"):
+        if path.stat().st_mtime < cutoff:
+            path.unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+
+def read_sql_cached(query, engine, params: dict = None) -> pd.DataFrame:
+    """
+    pd.read_sql with a local Parquet cache in front of it.
+
+    Results are stored under HIVE_QUERY_CACHE_DIR and reused for
+    HIVE_QUERY_CACHE_TTL_HOURS, so re-running the same month reads from
+    disk instead of querying the warehouse again.
+    """
+    if not settings.HIVE_QUERY_CACHE_ENABLED:
+        return pd.read_sql(query, engine, params=params)
+
+    cache_dir = settings.HIVE_QUERY_CACHE_DIR
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    ttl_seconds = settings.HIVE_QUERY_CACHE_TTL_HOURS * 3600
+    evict_expired(cache_dir, ttl_seconds)
+
+    path = cache_dir / f"{query_cache_key(query, params, engine)}.parquet"
+    if path.exists():
+        print(f"💾 Loaded query results from cache: {path.name}")
+        return pd.read_parquet(path)
+
+    df = pd.read_sql(query, engine, params=params)
+
+    # Write to a temporary file first so a crash never leaves a partial cache entry
+    temporary_path = path.with_suffix(".tmp")
+    df.to_parquet(temporary_path, index=False)
+    temporary_path.replace(path)
+
+    return df
@@ -0,0 +1,112 @@
+"""Persistent checkpoints that let an interrupted workflow run resume."""
+import sqlite3
+from pathlib import Path
+from typing import Iterable, List
+
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from src.config.settings import settings
+from src.utils.feedback_store import feedback_row_hash
+
+
+# Application types stored in the workflow state, allowed when checkpoints are read back
+CHECKPOINT_TYPES = [
+    ("src.models.feedback", "FeedbackItem"),
+    ("src.models.feedback_batch", "FeedbackRecord"),
+    ("src.models.report", "FeedbackReport"),
+    ("src.models.report", "UrgentFeedback"),
+]
+
+
+def open_checkpointer(path: Path = None) -> SqliteSaver:
+    """
+    Open the SQLite LangGraph checkpointer at CHECKPOINT_PATH.
+
+    The graph saves its state after every node under the run's thread ID,
+    so a failed run continues from the last completed node.
+    """
+    path = path or settings.CHECKPOINT_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Nodes run on LangGraph's worker threads
+    connection = sqlite3.connect(path, check_same_thread=False)
+    return SqliteSaver(connection, serde=JsonPlusSerializer(allowed_msgpack_modules=CHECKPOINT_TYPES))
+
+
+class ClassificationProgress:
+    """
+    Classifications completed so far in one run, keyed by warehouse row hash.
+
+    Saved every CLASSIFICATION_CHECKPOINT_ITEMS items while classify_comments
+    runs, so a restart inside the node only classifies the remaining items.
+    """
+
+    def __init__(self, path: Path, run_id: str):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.run_id = run_id
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS classification_progress (
+                run_id TEXT NOT NULL,
+                row_hash TEXT NOT NULL,
+                category TEXT NOT NULL,
+                rationale TEXT,
+                PRIMARY KEY (run_id, row_hash)
+            )
+            """
+        )
+        self.connection.commit()
+
+    def restore(self, feedback_list: List) -> List:
+        """
+        Copy saved classifications onto the matching items.
+
+        Returns:
+            The items that still need to be classified
+        """
+        saved = {
+            row_hash: (category, rationale)
+            for row_hash, category, rationale in self.connection.execute(
+                "SELECT row_hash, category, rationale FROM classification_progress WHERE run_id = ?",
+                (self.run_id,),
+            )
+        }
+        if not saved:
+            return feedback_list
+
+        pending = []
+        for feedback in feedback_list:
+            classification = saved.get(feedback_row_hash(feedback))
+            if classification:
+                feedback.category, feedback.rationale = classification
+            else:
+                pending.append(feedback)
+        return pending
+
+    def save(self, feedback_list: Iterable):
+        """Record classified items and commit, unclassified items are skipped."""
+        rows = [
+            (self.run_id, feedback_row_hash(feedback), feedback.category, feedback.rationale)
+            for feedback in feedback_list
+            if feedback.category is not None
+        ]
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO classification_progress VALUES (?, ?, ?, ?)", rows
+        )
+        self.connection.commit()
+
+    def clear(self):
+        """Forget the run's progress, e.g. once the run has completed."""
+        self.connection.execute(
+            "DELETE FROM classification_progress WHERE run_id = ?", (self.run_id,)
+        )
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+
+def open_classification_progress(run_id: str) -> ClassificationProgress:
+    """Open the classification progress of a run, stored next to the graph checkpoints."""
+    return ClassificationProgress(settings.CHECKPOINT_PATH, run_id)
@@ -6,10 +6,17 @@ from slack_sdk.errors import SlackApiError
 from src.config.settings import settings
 
 
-def format_slack_message(report_response) -> str:
-    """Format the report for Slack with header."""
-    current_month = datetime.now().strftime('%B')
-    current_year = datetime.now().year
+def format_slack_message(report_response, report_month: str = "") -> str:
+    """
+    Format the report for Slack with header.
+
+    Args:
+        report_response: Reporter agent response
+        report_month: Month named in the header as YYYY-MM, defaults to the current month
+    """
+    month = datetime.strptime(report_month, "%Y-%m") if report_month else datetime.now()
+    current_month = month.strftime('%B')
+    current_year = month.year
     
     slack_message = f"""📊 *User Feedback Analysis Report - {current_month} {current_year}*
 
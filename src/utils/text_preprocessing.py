@@ -0,0 +1,134 @@
+"""CPU-bound cleanup of feedback text before it reaches the prompts, parallelized across processes."""
+import multiprocessing
+import os
+import re
+import unicodedata
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import List, Tuple
+
+from src.config.settings import settings
+
+
+# Digit groups of a phone number, separated by spaces or hyphens
+PHONE_DIGITS = r"\d{2,4}(?:[ -]?\d{2,4}){1,4}"
+
+REDACTIONS = [
+    ("emails", re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+"), "[email]"),
+    ("urls", re.compile(r"(?:https?://|www\.)\S+", re.IGNORECASE), "[url]"),
+    # Only clearly phone-shaped numbers: a +country code, a (area code) or a
+    # phone keyword in front; other digit groups are IDs, versions or amounts.
+    # The keyword is kept, so the placeholder refers to its first group.
+    ("phones", re.compile(
+        rf"(?<![\w+])(?:\+\d{{1,3}}[ -]?(?:\(\d{{1,4}}\)[ -]?)?|\(\d{{2,4}}\)[ -]?){PHONE_DIGITS}(?!\w)"
+        rf"|(\b(?:tel|telephone|phone|mobile|cell|fax|call me|call us)\b(?:\s*(?:number|no|nr|#))?"
+        rf"\.?:?\s*(?:(?:at|on)\s+)?){PHONE_DIGITS}(?!\w)",
+        re.IGNORECASE), r"\1[phone]"),
+]
+# Letters and punctuation only, digit runs are amounts, IDs or error codes
+REPEATED_CHARACTERS = re.compile(r"([^\W\d]|[^\w\s])\1{3,}")
+WHITESPACE = re.compile(r"\s+")
+TRUNCATION_MARK = " ..."
+
+
+def strip_control_characters(text: str) -> str:
+    """Drop control and format characters (zero-width spaces, BOMs, bidi marks), keeping whitespace."""
+    if text.isprintable():
+        return text
+    return "".join(
+        character for character in text
+        if character.isspace() or unicodedata.category(character) not in ("Cc", "Cf")
+    )
+
+
+def single_line(text: str) -> str:
+    """Join the lines of a comment with spaces, for prompts that list one comment per line."""
+    return " ".join(text.splitlines())
+
+
+def preprocess_text(text: str, max_chars: int, counts: Counter) -> str:
+    """
+    Normalize, redact and cap one comment.
+
+    Applies NFKC normalization, removes control characters, replaces
+    emails, URLs and phone numbers with placeholders, shortens runs of a
+    repeated letter or punctuation mark to three (digits are kept as is),
+    collapses whitespace and cuts the text at a word boundary after
+    `max_chars` characters. Running it twice gives the same text.
+
+    Args:
+        text: Raw comment
+        max_chars: Length cap, 0 for none
+        counts: Incremented per redaction type and for truncated comments
+    """
+    text = strip_control_characters(unicodedata.normalize("NFKC", text))
+    for name, pattern, placeholder in REDACTIONS:
+        text, replaced = pattern.subn(placeholder, text)
+        counts[name] += replaced
+    text = REPEATED_CHARACTERS.sub(r"\1\1\1", text)
+    text = WHITESPACE.sub(" ", text).strip()
+
+    if max_chars and len(text) > max_chars:
+        cut = text[:max_chars - len(TRUNCATION_MARK)]
+        text = (cut.rsplit(" ", 1)[0] or cut) + TRUNCATION_MARK
+        counts["truncated"] += 1
+    return text
+
+
+def preprocess_chunk(texts: List[str], max_chars: int) -> Tuple[List[str], Counter]:
+    """Preprocess a chunk of comments; runs in a worker process."""
+    counts = Counter()
+    processed = [preprocess_text(text, max_chars, counts) for text in texts]
+    counts["chars_before"] += sum(len(text) for text in texts)
+    counts["chars_after"] += sum(len(text) for text in processed)
+    return processed, counts
+
+
+def preprocess_workers() -> int:
+    return max(1, settings.PREPROCESS_WORKERS or os.cpu_count() or 1)
+
+
+def preprocess_texts(texts: List[str], workers: int = 0) -> Tuple[List[str], Counter]:
+    """
+    Preprocess comments in chunks of PREPROCESS_CHUNK_SIZE across a process pool.
+
+    Inputs under PREPROCESS_PARALLEL_MIN_ITEMS are processed in this
+    process, where starting workers would cost more than it saves.
+
+    Args:
+        texts: Raw comments
+        workers: Worker processes, defaults to PREPROCESS_WORKERS (one per core)
+
+    Returns:
+        The processed comments in input order, and counters for redactions,
+        truncations, characters before/after and estimated tokens saved
+    """
+    workers = workers or preprocess_workers()
+    size = max(1, settings.PREPROCESS_CHUNK_SIZE)
+    chunks = [texts[i:i + size] for i in range(0, len(texts), size)]
+    max_chars = settings.PREPROCESS_MAX_CHARS or 0
+
+    if workers > 1 and len(chunks) > 1 and len(texts) >= settings.PREPROCESS_PARALLEL_MIN_ITEMS:
+        # Nodes run on LangGraph's threads, so avoid forking the whole process
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        context = multiprocessing.get_context(method)
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), mp_context=context) as executor:
+            results = list(executor.map(preprocess_chunk, chunks, repeat(max_chars)))
+    else:
+        results = [preprocess_chunk(chunk, max_chars) for chunk in chunks]
+
+    processed = []
+    counts = Counter()
+    for chunk, chunk_counts in results:
+        processed.extend(chunk)
+        counts += chunk_counts
+    counts["tokens_saved"] = max(0, counts["chars_before"] - counts["chars_after"]) // settings.CHARS_PER_TOKEN
+    return processed, counts
+
+
+def print_preprocessing_summary(counts: Counter, items: int):
+    redacted = ", ".join(f"{counts[name]} {name}" for name, _, _ in REDACTIONS)
+    print(f"🧼 Preprocessed {items} comments: redacted {redacted}, truncated {counts['truncated']}")
+    print(f"   {counts['chars_before']:,} -> {counts['chars_after']:,} characters "
+          f"(~{counts['tokens_saved']:,} prompt tokens saved)")
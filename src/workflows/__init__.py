@@ -1,7 +1,17 @@
 """LangGraph workflow definitions."""
+from typing import TYPE_CHECKING
 
-from .state import MessagesState
-from .feedback_workflow import create_feedback_workflow
+from src.utils.lazy import lazy_exports
 
-__all__ = ["MessagesState", "create_feedback_workflow"]
+if TYPE_CHECKING:
+    from .state import MessagesState
+    from .feedback_workflow import create_feedback_workflow
 
+_EXPORTS = {
+    "MessagesState": "state",
+    "create_feedback_workflow": "feedback_workflow",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+__all__ = list(_EXPORTS)
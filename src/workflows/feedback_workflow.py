@@ -1,33 +1,93 @@
 """Main feedback classification workflow."""
-from langgraph.graph import StateGraph, START, END
+from src.config.settings import settings
 
-from src.workflows.state import MessagesState
-from src.nodes import (
-    load_data_from_hive,
-    classify_comments,
-    export_classified_results,
-    create_report
-)
 
-
-def create_feedback_workflow():
-    """Create and compile the feedback classification workflow."""
+def create_feedback_workflow(checkpointer=None):
+    """
+    Create and compile the feedback classification workflow.
     
+    Args:
+        checkpointer: Optional LangGraph checkpointer; the state is then saved
+            after every node under the run's thread ID, so an interrupted run
+            can be resumed
+    """
+    # Imported here so importing the package stays cheap for tooling that only needs the state
+    from langgraph.graph import StateGraph, START, END
+
+    from src.utils import timed_node
+    from src.workflows.state import MessagesState
+    from src.nodes import (
+        load_data_from_hive,
+        preprocess_feedback,
+        deduplicate_feedback,
+        classify_comments,
+        classify_shard,
+        dispatch_classification_shards,
+        merge_classified_shards,
+        load_and_classify_from_hive,
+        merge_with_feedback_store,
+        export_classified_results,
+        aggregate_feedback,
+        create_report
+    )
+
     workflow = StateGraph(MessagesState)
     
+    def add_node(name, node):
+        # Every node records its wall time, CPU time and memory
+        workflow.add_node(name, timed_node(name, node))
+    
     # Add nodes
-    workflow.add_node("load_data_from_hive", load_data_from_hive)
-    workflow.add_node("classify_comments", classify_comments)
-    workflow.add_node("export_classified_results", export_classified_results)
-    workflow.add_node("create_report", create_report)
+    if settings.HIVE_STREAMING:
+        # Load, deduplicate and classify chunk by chunk in a single node
+        add_node("load_and_classify_from_hive", load_and_classify_from_hive)
+    else:
+        add_node("load_data_from_hive", load_data_from_hive)
+        if settings.PREPROCESS_ENABLED:
+            add_node("preprocess_feedback", preprocess_feedback)
+        add_node("deduplicate_feedback", deduplicate_feedback)
+        if settings.CLASSIFICATION_SHARDS > 1:
+            # Shards run as parallel branches, merged back before export
+            add_node("classify_shard", classify_shard)
+            add_node("merge_classified_shards", merge_classified_shards)
+        else:
+            add_node("classify_comments", classify_comments)
+    if settings.HIVE_INCREMENTAL:
+        add_node("merge_with_feedback_store", merge_with_feedback_store)
+    add_node("export_classified_results", export_classified_results)
+    add_node("aggregate_feedback", aggregate_feedback)
+    add_node("create_report", create_report)
     
     # Add edges
-    workflow.add_edge(START, "load_data_from_hive")
-    workflow.add_edge("load_data_from_hive", "classify_comments")
-    workflow.add_edge("classify_comments", "export_classified_results")
-    workflow.add_edge("export_classified_results", "create_report")
+    if settings.HIVE_STREAMING:
+        workflow.add_edge(START, "load_and_classify_from_hive")
+        classified_node = "load_and_classify_from_hive"
+    else:
+        workflow.add_edge(START, "load_data_from_hive")
+        if settings.PREPROCESS_ENABLED:
+            workflow.add_edge("load_data_from_hive", "preprocess_feedback")
+            workflow.add_edge("preprocess_feedback", "deduplicate_feedback")
+        else:
+            workflow.add_edge("load_data_from_hive", "deduplicate_feedback")
+        if settings.CLASSIFICATION_SHARDS > 1:
+            workflow.add_conditional_edges(
+                "deduplicate_feedback", dispatch_classification_shards, ["classify_shard"]
+            )
+            workflow.add_edge("classify_shard", "merge_classified_shards")
+            classified_node = "merge_classified_shards"
+        else:
+            workflow.add_edge("deduplicate_feedback", "classify_comments")
+            classified_node = "classify_comments"
+    
+    if settings.HIVE_INCREMENTAL:
+        workflow.add_edge(classified_node, "merge_with_feedback_store")
+        workflow.add_edge("merge_with_feedback_store", "export_classified_results")
+    else:
+        workflow.add_edge(classified_node, "export_classified_results")
+    workflow.add_edge("export_classified_results", "aggregate_feedback")
+    workflow.add_edge("aggregate_feedback", "create_report")
     workflow.add_edge("create_report", END)
     
     # Compile the workflow
-    return workflow.compile()
+    return workflow.compile(checkpointer=checkpointer)
 
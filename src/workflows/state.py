@@ -1,16 +1,25 @@
 """Workflow state definition."""
-from typing import List
+from typing import Dict, List, Union
 from typing_extensions import TypedDict, Annotated
 import operator
 
-from src.models import FeedbackItem
+from src.models import FeedbackItem, FeedbackRecord
+
+
+# Nodes only use attribute access, so both row types are interchangeable
+Feedback = Union[FeedbackItem, FeedbackRecord]
 
 
 class MessagesState(TypedDict):
     """State for batch processing feedback."""
+    run_id: str
     current_date: str
-    feedback_items: List[FeedbackItem]
-    classified_results: Annotated[List[FeedbackItem], operator.add]
+    analysis_month: str
+    feedback_items: List[Feedback]
+    classified_results: Annotated[List[Feedback], operator.add]
+    classified_shards: Annotated[List[dict], operator.add]  # Results of parallel classify_shard branches
+    exported_files: List[str]
+    insight_stats: Dict[str, List[dict]]
     final_report: str
     node_calls: int
 